@@ -0,0 +1,94 @@
+"""Benchmark BusinessList on 100k-record batches
+
+Compares the slotted Business records and the columnar
+BusinessList.dataframe() with the former plain dataclass records and
+asdict + json_normalize conversion: time to build a DataFrame, time to
+write the CSV rows, and memory held by the records.
+
+Usage: python benchmark_business_list.py [--records 100000] [--repeat 3]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import tracemalloc
+from dataclasses import asdict, make_dataclass
+
+import pandas as pd
+
+from main import Business, BusinessList
+
+# The record layout before Business was slotted
+LegacyBusiness = make_dataclass("LegacyBusiness", [(name, object, None) for name in Business.__slots__])
+
+def legacy_dataframe(records):
+    return pd.json_normalize((asdict(record) for record in records), sep="_")
+
+def make_records(record_class, count):
+    return [
+        record_class(
+            name=f"Business {i}",
+            address=f"{i} Market Road, Sector {i % 100}, New Delhi, Delhi 1100{i % 100:02d}",
+            website=f"business{i}.example.com" if i % 3 else "",
+            phone_number=f"+9198{i:08d}",
+            reviews_count=i % 5000,
+            reviews_average=round(1 + (i % 40) / 10, 1),
+            search_query="restaurants delhi",
+            place_url=f"https://www.google.com/maps/place/Business+{i}/data=!1s0x{i:x}:0x1",
+        )
+        for i in range(count)
+    ]
+
+def records_memory_mb(record_class, count):
+    """Peak traced memory of building count records"""
+    tracemalloc.start()
+    records = make_records(record_class, count)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del records
+    return peak / (1024 * 1024)
+
+def best_of(repeat, function):
+    """Fastest of repeat runs of function(), in seconds"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--records", type=int, default=100000, help="Records per batch (default: 100000)")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per measurement; the fastest counts (default: 3)")
+    args = parser.parse_args()
+
+    legacy_records = make_records(LegacyBusiness, args.records)
+    business_list = BusinessList(make_records(Business, args.records))
+
+    # Both paths must produce the same table
+    pd.testing.assert_frame_equal(legacy_dataframe(legacy_records), business_list.dataframe())
+
+    legacy_seconds = best_of(args.repeat, lambda: legacy_dataframe(legacy_records))
+    columnar_seconds = best_of(args.repeat, business_list.dataframe)
+
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "contacts.csv")
+        legacy_csv_seconds = best_of(args.repeat, lambda: legacy_dataframe(legacy_records).to_csv(csv_path, index=False))
+        columnar_csv_seconds = best_of(args.repeat, lambda: business_list.dataframe().to_csv(csv_path, index=False))
+
+    legacy_mb = records_memory_mb(LegacyBusiness, args.records)
+    slotted_mb = records_memory_mb(Business, args.records)
+
+    print(f"=== BusinessList benchmark: {args.records} records, best of {args.repeat} ===")
+    print(f"DataFrame  asdict + json_normalize: {legacy_seconds:.3f}s   columnar: {columnar_seconds:.3f}s   "
+          f"({legacy_seconds / columnar_seconds:.1f}x)")
+    print(f"CSV rows   asdict + json_normalize: {legacy_csv_seconds:.3f}s   columnar: {columnar_csv_seconds:.3f}s   "
+          f"({legacy_csv_seconds / columnar_csv_seconds:.1f}x)")
+    print(f"Records    dataclass: {legacy_mb:.1f} MB   slotted: {slotted_mb:.1f} MB   "
+          f"({(1 - slotted_mb / legacy_mb) * 100:.0f}% less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,10 +6,14 @@ User-friendly menu interface for all scraper features
 
 import os
 import sys
+import argparse
 import json
+import signal
 import subprocess
 from pathlib import Path
 import time
+import math
+import bisect
 from datetime import datetime, timedelta
 from dataclasses import dataclass, asdict
 from typing import List, Dict, Optional
@@ -31,6 +35,590 @@ class Schedule:
     estimated_duration_minutes: int = 15
     auto_sequence: bool = False
     currently_running: bool = False
+    prioritize_terms: bool = True
+
+MINUTES_PER_DAY = 24 * 60
+
+def time_to_minutes(time_str):
+    """Convert HH:MM to minutes since midnight"""
+    hours, minutes = time_str.strip().split(":")
+    hours, minutes = int(hours), int(minutes)
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Invalid time: {time_str}")
+    return hours * 60 + minutes
+
+def minutes_to_time(minutes):
+    """Convert minutes since midnight (any value, wraps at 24h) to HH:MM"""
+    minutes = int(minutes) % MINUTES_PER_DAY
+    return f"{minutes // 60:02d}:{minutes % 60:02d}"
+
+def load_query_normalizer(progress_file="search_progress.json", alias_file="query_aliases.json"):
+    """QueryNormalizer from main.py, or None if the scraper dependencies are missing"""
+    try:
+        from main import QueryNormalizer
+    except ImportError:
+        return None
+    known_queries = []
+    if os.path.exists(progress_file):
+        try:
+            with open(progress_file, 'r') as f:
+                known_queries = list(json.load(f).keys())
+        except:
+            pass
+    return QueryNormalizer(alias_file, known_queries=known_queries)
+
+class ScheduleIntervalIndex:
+    """Interval index of daily execution windows
+
+    Every schedule occupies [start, start + estimated duration) on a 24h
+    clock. Windows that cross midnight are split into two segments, so
+    22:30 + 120 min is stored as 22:30-24:00 and 00:00-00:30. Segments are
+    kept sorted by start with a subtree max-end (implicit interval tree),
+    which makes overlap queries O(log n + k). Free gaps are merged once and
+    searched with bisect for slot suggestions.
+    """
+
+    def __init__(self, schedules=()):
+        self._segments = []  # (start, end, schedule) sorted by start
+        self._max_end = []
+        self._gaps = None
+        self._gap_ends = []
+        for schedule in schedules:
+            try:
+                start = time_to_minutes(schedule.start_time)
+            except (ValueError, AttributeError):
+                continue
+            for seg_start, seg_end in self.window_segments(start, schedule.estimated_duration_minutes):
+                self._segments.append((seg_start, seg_end, schedule))
+        self._segments.sort(key=lambda segment: (segment[0], segment[1]))
+        self._max_end = [0] * len(self._segments)
+        self._build(0, len(self._segments))
+
+    def __len__(self):
+        return len({id(segment[2]) for segment in self._segments})
+
+    @staticmethod
+    def window_segments(start_minute, duration_minutes):
+        """Split a daily window into non-wrapping [start, end) segments"""
+        duration = max(1, int(duration_minutes or 0))  # zero-length windows still own their start minute
+        if duration >= MINUTES_PER_DAY:
+            return [(0, MINUTES_PER_DAY)]
+        start = start_minute % MINUTES_PER_DAY
+        end = start + duration
+        if end <= MINUTES_PER_DAY:
+            return [(start, end)]
+        return [(start, MINUTES_PER_DAY), (0, end - MINUTES_PER_DAY)]
+
+    @classmethod
+    def windows_overlap(cls, start1, duration1, start2, duration2):
+        """Check if two daily windows overlap, including across midnight"""
+        for a_start, a_end in cls.window_segments(start1, duration1):
+            for b_start, b_end in cls.window_segments(start2, duration2):
+                if a_start < b_end and b_start < a_end:
+                    return True
+        return False
+
+    def _build(self, lo, hi):
+        """Fill subtree max-end values for the implicit tree over [lo, hi)"""
+        if lo >= hi:
+            return 0
+        mid = (lo + hi) // 2
+        self._max_end[mid] = max(
+            self._segments[mid][1],
+            self._build(lo, mid),
+            self._build(mid + 1, hi),
+        )
+        return self._max_end[mid]
+
+    def _collect(self, query_start, query_end, found):
+        """Append schedules of all segments intersecting [query_start, query_end)"""
+        stack = [(0, len(self._segments))]
+        while stack:
+            lo, hi = stack.pop()
+            if lo >= hi:
+                continue
+            mid = (lo + hi) // 2
+            if self._max_end[mid] <= query_start:
+                continue  # nothing in this subtree reaches the query
+            stack.append((lo, mid))
+            seg_start, seg_end, schedule = self._segments[mid]
+            if seg_start < query_end:
+                if seg_end > query_start:
+                    found.append(schedule)
+                stack.append((mid + 1, hi))
+
+    def overlapping(self, start_minute, duration_minutes, exclude_id=None):
+        """Return schedules whose windows overlap the given window"""
+        found = []
+        for seg_start, seg_end in self.window_segments(start_minute, duration_minutes):
+            self._collect(seg_start, seg_end, found)
+        unique = {}
+        for schedule in found:
+            if schedule.id != exclude_id:
+                unique.setdefault(schedule.id, schedule)
+        return list(unique.values())
+
+    def _free_gaps(self):
+        """Merge busy segments into free gaps laid out over two days
+
+        Gaps are (start, end) minutes sorted by start on a line unrolled over
+        several days, so a gap running through midnight is a single entry and
+        a search starting late in the evening continues into the next
+        morning. Returns None when the whole day is free.
+        """
+        if self._gaps is not None or not self._segments:
+            return self._gaps
+        day_gaps = []
+        cursor = 0
+        for seg_start, seg_end, _ in self._segments:
+            if seg_start > cursor:
+                day_gaps.append((cursor, seg_start))
+            cursor = max(cursor, seg_end)
+        if cursor < MINUTES_PER_DAY:
+            day_gaps.append((cursor, MINUTES_PER_DAY))
+
+        line = []
+        for shift in (-MINUTES_PER_DAY, 0, MINUTES_PER_DAY, 2 * MINUTES_PER_DAY):
+            for gap_start, gap_end in day_gaps:
+                gap_start, gap_end = gap_start + shift, gap_end + shift
+                if line and line[-1][1] == gap_start:
+                    line[-1] = (line[-1][0], gap_end)  # join across midnight
+                else:
+                    line.append((gap_start, gap_end))
+        self._gaps = line
+        self._gap_ends = [gap[1] for gap in line]
+        return self._gaps
+
+    def find_free_slots(self, duration_minutes, after_minute=0, latest_start=None,
+                        buffer_minutes=0, step_minutes=30, limit=8):
+        """Find step-aligned start times whose whole window is free
+
+        Gaps are walked in clock order from after_minute, wrapping past
+        midnight. buffer_minutes is kept clear on both sides of the window
+        and latest_start (minutes after after_minute) bounds the search.
+        """
+        duration = max(1, int(duration_minutes or 0))
+        after = after_minute % MINUTES_PER_DAY
+        horizon = MINUTES_PER_DAY - 1 if latest_start is None else min(latest_start, MINUTES_PER_DAY - 1)
+        first_candidate = -(-after // step_minutes) * step_minutes
+
+        gaps = self._free_gaps()
+        if gaps is None:
+            return [
+                minutes_to_time(candidate)
+                for candidate in range(first_candidate, after + horizon + 1, step_minutes)
+            ][:limit]
+
+        slots = []
+        index = bisect.bisect_right(self._gap_ends, after)
+        while index < len(gaps) and len(slots) < limit:
+            gap_start, gap_end = gaps[index]
+            if gap_start > after + horizon:
+                break
+            lowest = max(after, gap_start + buffer_minutes)
+            candidate = max(first_candidate, -(-lowest // step_minutes) * step_minutes)
+            while candidate + duration + buffer_minutes <= gap_end and candidate <= after + horizon:
+                slot = minutes_to_time(candidate)
+                if slot not in slots:
+                    slots.append(slot)
+                    if len(slots) >= limit:
+                        break
+                candidate += step_minutes
+            index += 1
+        return slots
+
+class ExecutionTimeEstimator:
+    """Predicts schedule duration and per-term yield from past runs
+
+    main.py appends one record per search to search_stats.json (duration,
+    listings examined, new contacts, limit); the scheduler attaches the
+    wall-clock time of the whole main.py process, which includes browser
+    startup. Terms with history are predicted from their own runs, unseen
+    terms from the pooled per-contact rate of all terms, and without any
+    history the old fixed rate is used. Bounds are ~90% prediction intervals.
+    Runs are keyed by canonical query when a QueryNormalizer is available.
+    """
+
+    DEFAULT_MINUTES_PER_CONTACT = 0.1  # 6 seconds per contact average
+    Z_SCORE = 1.645
+    FALLBACK_RELATIVE_SPREAD = 0.5  # +-50% when a term has a single sample
+
+    def __init__(self, stats_file="search_stats.json", normalizer=None):
+        self.stats_file = stats_file
+        self.normalizer = normalizer
+        self.terms = {}
+        self.probes = {}
+        self.reload()
+
+    def term_key(self, search_term):
+        """Key under which main.py records runs of this term"""
+        if self.normalizer is not None:
+            return self.normalizer.canonical(search_term, learn=False)
+        return search_term.strip()
+
+    def runs_for(self, search_term):
+        """Recorded runs of a search term (and its spelling variants)"""
+        return self.terms.get(self.term_key(search_term), [])
+
+    def probe_for(self, search_term):
+        """Latest main.py --probe estimate of a search term, or None"""
+        return self.probes.get(self.term_key(search_term))
+
+    def reload(self):
+        """Re-read run statistics from file"""
+        self.terms = {}
+        self.probes = {}
+        if os.path.exists(self.stats_file):
+            try:
+                with open(self.stats_file, 'r') as f:
+                    data = json.load(f)
+                self.terms = data.get("terms", {})
+                self.probes = data.get("probes", {})
+            except:
+                self.terms = {}
+
+    def attach_wall_time(self, search_term, started_at, wall_seconds):
+        """Store process wall time on the run main.py recorded for this term"""
+        try:
+            from main import update_json_file
+        except ImportError:
+            return
+        key = self.term_key(search_term)
+
+        def modify(data):
+            runs = data.setdefault("terms", {}).get(key)
+            if runs and runs[-1].get("finished_at", 0) >= started_at:
+                runs[-1]["wall_seconds"] = round(wall_seconds, 1)
+            # otherwise main.py did not record this run (crashed or no results)
+
+        if not os.path.exists(self.stats_file):
+            return
+        try:
+            update_json_file(self.stats_file, modify, {"terms": {}})
+        except Exception as e:
+            print(f"Could not save run statistics: {e}")
+        self.reload()
+
+    def _startup_overhead_minutes(self):
+        """Average minutes spent outside the search itself (browser launch etc.)"""
+        overheads = [
+            (run["wall_seconds"] - run.get("duration_seconds", 0)) / 60
+            for runs in self.terms.values() for run in runs if "wall_seconds" in run
+        ]
+        return max(0.0, sum(overheads) / len(overheads)) if overheads else 0.0
+
+    def _run_samples(self, runs, limit, overhead):
+        """(minutes, new contacts) of each run, scaled to the requested limit"""
+        samples = []
+        for run in runs:
+            run_limit = max(1, run.get("limit") or limit)
+            scale = limit / run_limit
+            if "wall_seconds" in run:
+                minutes = run["wall_seconds"] / 60
+            else:
+                minutes = run.get("duration_seconds", 0) / 60 + overhead
+            contacts = min(limit, run.get("new_contacts", 0) * scale)
+            samples.append((minutes * scale, contacts))
+        return samples
+
+    @staticmethod
+    def _mean_and_spread(values, relative_spread):
+        """Mean and standard deviation, falling back to a relative spread"""
+        mean = sum(values) / len(values)
+        if len(values) > 1:
+            variance = sum((v - mean) ** 2 for v in values) / (len(values) - 1)
+            return mean, math.sqrt(variance)
+        return mean, abs(mean) * relative_spread
+
+    def predict_term(self, search_term, limit):
+        """Predict minutes and new contacts for one search term"""
+        overhead = self._startup_overhead_minutes()
+        runs = self.runs_for(search_term)
+        source = "history"
+        if not runs:
+            runs = [run for term_runs in self.terms.values() for run in term_runs]
+            source = "pooled"
+        if not runs:
+            minutes = limit * self.DEFAULT_MINUTES_PER_CONTACT
+            return {
+                "source": "default", "samples": 0,
+                "minutes": minutes, "minutes_sd": minutes * self.FALLBACK_RELATIVE_SPREAD,
+                "contacts": float(limit), "contacts_sd": limit * self.FALLBACK_RELATIVE_SPREAD,
+            }
+
+        samples = self._run_samples(runs, limit, overhead)
+        minutes, minutes_sd = self._mean_and_spread([m for m, _ in samples], self.FALLBACK_RELATIVE_SPREAD)
+        contacts, contacts_sd = self._mean_and_spread([c for _, c in samples], self.FALLBACK_RELATIVE_SPREAD)
+        return {
+            "source": source, "samples": len(samples),
+            "minutes": minutes, "minutes_sd": minutes_sd,
+            "contacts": contacts, "contacts_sd": contacts_sd,
+        }
+
+    def estimate_schedule(self, search_terms, limit):
+        """Predict total minutes and new contacts for a schedule run
+
+        Term predictions are treated as independent, so variances add.
+        """
+        predictions = {term: self.predict_term(term, limit) for term in search_terms}
+        minutes = sum(p["minutes"] for p in predictions.values())
+        minutes_sd = math.sqrt(sum(p["minutes_sd"] ** 2 for p in predictions.values()))
+        contacts = sum(p["contacts"] for p in predictions.values())
+        contacts_sd = math.sqrt(sum(p["contacts_sd"] ** 2 for p in predictions.values()))
+        return {
+            "minutes": minutes,
+            "minutes_low": max(0.0, minutes - self.Z_SCORE * minutes_sd),
+            "minutes_high": minutes + self.Z_SCORE * minutes_sd,
+            "contacts": contacts,
+            "contacts_low": max(0.0, contacts - self.Z_SCORE * contacts_sd),
+            "contacts_high": contacts + self.Z_SCORE * contacts_sd,
+            "learned_terms": sum(1 for p in predictions.values() if p["source"] == "history"),
+            "terms": predictions,
+        }
+
+class TermPrioritizer:
+    """Orders schedule search terms by recent new contacts per minute
+
+    Rates come from the run history in search_stats.json and are averaged
+    with more weight on recent runs. Terms without history run first (they
+    still have to be explored), ordered by their main.py --probe estimate
+    when there is one, the rest by descending rate. A term whose probe
+    expects no new contacts, or whose
+    last run main.py marked saturated, or whose last runs all stayed below
+    min_rate, is deferred until retry_after_hours have passed since its last
+    probe or run, then tried last.
+    """
+
+    def __init__(self, estimator, min_rate=0.2, saturation_runs=2,
+                 retry_after_hours=72, recency_weight=0.5):
+        self.estimator = estimator
+        self.min_rate = min_rate
+        self.saturation_runs = saturation_runs
+        self.retry_after_hours = retry_after_hours
+        self.recency_weight = recency_weight
+
+    @staticmethod
+    def run_rate(run):
+        """New contacts per minute of one recorded run"""
+        seconds = run.get("wall_seconds") or run.get("duration_seconds") or 0
+        return run.get("new_contacts", 0) / max(seconds / 60, 0.1)
+
+    def term_rate(self, search_term):
+        """Recency-weighted new contacts per minute, or None without history"""
+        runs = self.estimator.runs_for(search_term)
+        if not runs:
+            return None
+        rate = self.run_rate(runs[0])
+        for run in runs[1:]:
+            rate = self.recency_weight * self.run_rate(run) + (1 - self.recency_weight) * rate
+        return rate
+
+    def is_saturated(self, search_term):
+        """True if main.py judged the last run drained, or the last few runs
+        of this term found (almost) nothing new"""
+        runs = self.estimator.runs_for(search_term)
+        if runs and runs[-1].get("saturated"):
+            return True
+        recent = runs[-self.saturation_runs:]
+        if len(recent) < self.saturation_runs:
+            return False
+        return all(self.run_rate(run) < self.min_rate for run in recent)
+
+    def is_retry_due(self, search_term, now=None):
+        """Saturated terms get another chance after retry_after_hours"""
+        runs = self.estimator.runs_for(search_term)
+        last_run = runs[-1].get("finished_at", 0) if runs else 0
+        return (now or time.time()) - last_run >= self.retry_after_hours * 3600
+
+    def plan(self, search_terms):
+        """Split terms into (ordered terms to run, deferred saturated terms)"""
+        self.estimator.reload()
+        unexplored, productive, retry, deferred = [], [], [], []
+        for term in search_terms:
+            rate = self.term_rate(term)
+            if rate is None:
+                probe = self.estimator.probe_for(term)
+                if probe is None:
+                    unexplored.append((float("inf"), term))
+                elif probe.get("estimated_new", 0) < 1:
+                    probed_recently = time.time() - probe.get("probed_at", 0) < self.retry_after_hours * 3600
+                    (deferred if probed_recently else retry).append(term)
+                else:
+                    unexplored.append((probe.get("new_per_minute", 0), term))
+            elif self.is_saturated(term):
+                (retry if self.is_retry_due(term) else deferred).append(term)
+            else:
+                productive.append((rate, term))
+        productive.sort(key=lambda item: item[0], reverse=True)  # stable for equal rates
+        unexplored.sort(key=lambda item: item[0], reverse=True)  # unprobed terms first
+        return [term for _, term in unexplored] + [term for _, term in productive] + retry, deferred
+
+class ScraperSupervisor:
+    """Runs main.py under a watchdog and restarts it when it hangs or crashes
+
+    Each run gets its own heartbeat file (main.py --heartbeat-file), in
+    which every worker thread reports its phase. A worker that stays in a
+    phase longer than PHASE_TIMEOUTS allows counts as hung: the whole
+    process group (including Chromium) is killed and the run is restarted
+    with exponential backoff. main.py saves contacts and search progress
+    every checkpoint_every contacts, so a restart resumes from the last
+    checkpoint and only asks for the contacts still missing. Restart, hang
+    and crash counts are kept in metrics_file.
+    """
+
+    PHASE_TIMEOUTS = {"launch": 120, "navigate": 90, "collect": 180, "extract": 120, "save": 120}
+
+    def __init__(self, heartbeat_dir="heartbeats", metrics_file="supervisor_metrics.json",
+                 max_restarts=5, backoff_base=5, backoff_max=300, poll_interval=5, checkpoint_every=10):
+        self.heartbeat_dir = heartbeat_dir
+        self.metrics_file = metrics_file
+        self.max_restarts = max_restarts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.poll_interval = poll_interval
+        self.checkpoint_every = checkpoint_every
+        self.metrics = self.load_metrics()
+
+    def load_metrics(self):
+        try:
+            with open(self.metrics_file, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return {"totals": {}, "terms": {}}
+
+    def save_metrics(self):
+        try:
+            with open(self.metrics_file, 'w') as f:
+                json.dump(self.metrics, f, indent=2)
+        except OSError as e:
+            print(f"❌ Error saving supervisor metrics: {e}")
+
+    def count(self, label, event):
+        """Add one event (runs, restarts, hangs, crashes, gave_up) to the metrics"""
+        for counters in (self.metrics["totals"], self.metrics["terms"].setdefault(label, {})):
+            counters[event] = counters.get(event, 0) + 1
+        self.metrics["updated_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.save_metrics()
+
+    def heartbeat_path(self, label):
+        safe_label = "".join(c if c.isalnum() else "_" for c in label.lower())[:60]
+        return os.path.join(self.heartbeat_dir, f"{safe_label}.json")
+
+    @staticmethod
+    def read_heartbeat(path):
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def hang_reason(self, heartbeat, started_at, now=None):
+        """Why the run looks hung, or None while every worker keeps beating"""
+        now = now or time.time()
+        if heartbeat is None:
+            if now - started_at > self.PHASE_TIMEOUTS["launch"]:
+                return f"no heartbeat {now - started_at:.0f}s after start"
+            return None
+        for worker, state in heartbeat.get("workers", {}).items():
+            timeout = self.PHASE_TIMEOUTS.get(state.get("phase"))
+            silent = now - state.get("updated_at", now)
+            if timeout and silent > timeout:
+                return f"{worker} stuck in '{state['phase']}' for {silent:.0f}s"
+        return None
+
+    @staticmethod
+    def start_process(argv):
+        if os.name == 'nt':
+            return subprocess.Popen(argv, creationflags=subprocess.CREATE_NEW_PROCESS_GROUP)
+        return subprocess.Popen(argv, start_new_session=True)
+
+    @staticmethod
+    def kill_process(process):
+        """Kill the scraper and its browser processes"""
+        if process.poll() is not None:
+            return
+        if os.name == 'nt':
+            subprocess.run(["taskkill", "/PID", str(process.pid), "/T", "/F"], capture_output=True)
+        else:
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                os.killpg(process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            pass
+
+    def backoff_seconds(self, restarts):
+        return min(self.backoff_max, self.backoff_base * 2 ** (restarts - 1))
+
+    def run(self, label, limit, scraper_args=()):
+        """Run main.py for one search until it finishes; True on success
+
+        scraper_args are the main.py arguments other than --limit. On a
+        restart the limit is reduced by the contacts already saved.
+        """
+        os.makedirs(self.heartbeat_dir, exist_ok=True)
+        heartbeat_file = self.heartbeat_path(label)
+        saved_contacts = 0
+        restarts = 0
+        self.count(label, "runs")
+
+        while True:
+            if os.path.exists(heartbeat_file):
+                os.remove(heartbeat_file)
+            argv = [sys.executable, "main.py", *scraper_args,
+                    "--limit", str(max(1, limit - saved_contacts)),
+                    "--heartbeat-file", heartbeat_file,
+                    "--checkpoint-every", str(self.checkpoint_every)]
+            started_at = time.time()
+            process = self.start_process(argv)
+            failure = None
+            try:
+                while process.poll() is None:
+                    time.sleep(self.poll_interval)
+                    reason = self.hang_reason(self.read_heartbeat(heartbeat_file), started_at)
+                    if reason and process.poll() is None:
+                        failure = "hangs"
+                        print(f"🧊 Scraper hung ({reason}). Killing pid {process.pid}")
+                        self.kill_process(process)
+                        break
+            except KeyboardInterrupt:
+                self.kill_process(process)
+                raise
+
+            if failure is None and process.returncode != 0:
+                failure = "crashes"
+                print(f"💥 Scraper exited with code {process.returncode}")
+            heartbeat = self.read_heartbeat(heartbeat_file)
+            if heartbeat:
+                saved_contacts += heartbeat.get("saved_contacts", 0)
+            if failure is None:
+                return True
+
+            self.count(label, failure)
+            if saved_contacts >= limit:
+                print(f"✅ All {limit} contacts were saved before the failure")
+                return True
+            if restarts >= self.max_restarts:
+                print(f"❌ Giving up on '{label}' after {restarts} restarts")
+                self.count(label, "gave_up")
+                return False
+            restarts += 1
+            self.count(label, "restarts")
+            delay = self.backoff_seconds(restarts)
+            print(f"🔄 Restart {restarts}/{self.max_restarts} in {delay}s "
+                  f"(resuming from checkpoint, {saved_contacts} contacts already saved)")
+            time.sleep(delay)
+
+    def summary(self):
+        totals = self.metrics.get("totals", {})
+        return (f"runs {totals.get('runs', 0)}, restarts {totals.get('restarts', 0)}, "
+                f"hangs {totals.get('hangs', 0)}, crashes {totals.get('crashes', 0)}, "
+                f"gave up {totals.get('gave_up', 0)}")
 
 class InteractiveScraper:
     def __init__(self):
@@ -40,11 +628,19 @@ class InteractiveScraper:
         self.cache_file = "fetched_contacts.json"
         self.progress_file = "search_progress.json"
         self.output_file = "output/all_contacts.csv"
+        self.search_stats_file = "search_stats.json"
+        self.query_normalizer = load_query_normalizer(self.progress_file)
+        self.estimator = ExecutionTimeEstimator(self.search_stats_file, self.query_normalizer)
+        self.prioritizer = TermPrioritizer(self.estimator)
+        self.supervisor = ScraperSupervisor()
+        self.supervised = False  # run scheduled searches under the watchdog, without prompts
+        self.job_queue_file = None  # shared job queue, so several hosts can split a schedule
         
         # Scheduling system
         self.schedule_file = "schedule_config.json"
         self.multi_schedules_file = "multi_schedules.json"
         self.schedules: Dict[str, Schedule] = {}
+        self._schedule_index: Optional[ScheduleIntervalIndex] = None
         self.load_schedules()
     
     def clear_screen(self):
@@ -131,9 +727,14 @@ class InteractiveScraper:
         min_delay = self.get_user_input("Minimum delay (seconds)", self.default_min_delay)
         max_delay = self.get_user_input("Maximum delay (seconds)", self.default_max_delay)
         
+        region = self.get_user_input("Split into map tiles over region (e.g. rajasthan, empty to skip)", "")
+        
         command = f'-s "{search_term}" --limit {limit} --min-delay {min_delay} --max-delay {max_delay}'
         if skip_duplicates:
             command += " --skip-duplicates"
+        if region:
+            workers = self.get_user_input("Parallel browser workers", "1")
+            command += f' --region "{region}" --workers {workers}'
         
         self.run_scraper_command(command)
     
@@ -188,10 +789,11 @@ class InteractiveScraper:
             print("2. Clear search progress (start from beginning)")
             print("3. Reset everything (cache + progress)")
             print("4. View cache status")
-            print("5. Back to main menu")
+            print("5. Refresh stale contacts (re-scrape reviews, phones etc. by place URL)")
+            print("6. Back to main menu")
             print()
             
-            choice = self.get_user_input("Select option (1-5)")
+            choice = self.get_user_input("Select option (1-6)")
             
             if choice == "1":
                 confirm = self.get_user_input("Clear contact cache? (y/n)", "n").lower() == 'y'
@@ -208,6 +810,10 @@ class InteractiveScraper:
             elif choice == "4":
                 self.view_cache_status()
             elif choice == "5":
+                days = self.get_user_input("Refresh places scraped more than how many days ago", "30")
+                limit = self.get_user_input("Maximum places to refresh", self.default_limit)
+                self.run_scraper_command(f"--refresh-days {days} --limit {limit}")
+            elif choice == "6":
                 break
     
     def view_cache_status(self):
@@ -286,10 +892,11 @@ class InteractiveScraper:
             print("2. Stealth mode (long delays)")
             print("3. Reset stuck search")
             print("4. Check system requirements")
-            print("5. Back to main menu")
+            print("5. Supervised search (restart on hang/crash)")
+            print("6. Back to main menu")
             print()
             
-            choice = self.get_user_input("Select option (1-5)")
+            choice = self.get_user_input("Select option (1-6)")
             
             if choice == "1":
                 search_term = self.get_user_input("Enter test search term", "test business delhi")
@@ -311,6 +918,16 @@ class InteractiveScraper:
             elif choice == "4":
                 self.check_system()
             elif choice == "5":
+                search_term = self.get_user_input("Enter search term")
+                limit = int(self.get_user_input("Enter limit", "100"))
+                print(f"\n🛡️ Running '{search_term}' under the supervisor...")
+                try:
+                    self.supervisor.run(search_term, limit, ["-s", search_term, "--skip-duplicates"])
+                except KeyboardInterrupt:
+                    print("\n🛑 Supervised search stopped")
+                print(f"Supervisor: {self.supervisor.summary()}")
+                input("\nPress Enter to continue...")
+            elif choice == "6":
                 break
     
     def check_system(self):
@@ -337,6 +954,12 @@ class InteractiveScraper:
         except ImportError:
             print("❌ Pandas not installed")
         
+        try:
+            import psutil
+            print("✅ psutil installed (memory reporting)")
+        except ImportError:
+            print("⚠️ psutil not installed (memory reporting uses /proc on Linux only)")
+        
         # Check output directory
         if os.path.exists("output"):
             print("✅ Output directory exists")
@@ -513,9 +1136,11 @@ class InteractiveScraper:
             except Exception as e:
                 print(f"Error loading schedules: {e}")
                 self.schedules = {}
+        self._schedule_index = None
     
     def save_schedules(self):
         """Save all schedules to file"""
+        self._schedule_index = None  # start times/durations may have changed
         try:
             schedules_list = [asdict(schedule) for schedule in self.schedules.values()]
             with open(self.multi_schedules_file, 'w') as f:
@@ -523,13 +1148,31 @@ class InteractiveScraper:
         except Exception as e:
             print(f"Error saving schedules: {e}")
     
+    def get_schedule_index(self):
+        """Interval index over the windows of all active schedules"""
+        if self._schedule_index is None:
+            self._schedule_index = ScheduleIntervalIndex(
+                s for s in self.schedules.values() if s.is_active
+            )
+        return self._schedule_index
+    
     def estimate_execution_time(self, search_terms, limit_per_run):
-        """Estimate how long the schedule will take to execute"""
-        time_per_contact = 0.1  # 6 seconds per contact average
-        total_contacts = len(search_terms) * limit_per_run
-        estimated_minutes = int(total_contacts * time_per_contact)
-        buffer_minutes = max(5, len(search_terms) * 2)
-        return estimated_minutes + buffer_minutes
+        """Estimate how long the schedule will take to execute
+        
+        Uses the upper confidence bound learned from past runs so that
+        conflict checks reserve a realistic window. Without any history it
+        falls back to a fixed per-contact rate plus a buffer.
+        """
+        self.estimator.reload()
+        if not self.estimator.terms:
+            time_per_contact = ExecutionTimeEstimator.DEFAULT_MINUTES_PER_CONTACT
+            total_contacts = len(search_terms) * limit_per_run
+            estimated_minutes = int(total_contacts * time_per_contact)
+            buffer_minutes = max(5, len(search_terms) * 2)
+            return estimated_minutes + buffer_minutes
+        
+        estimate = self.estimator.estimate_schedule(search_terms, limit_per_run)
+        return max(5, int(math.ceil(estimate["minutes_high"])))
     
     def validate_time_format(self, time_str):
         """Validate time format HH:MM"""
@@ -832,33 +1475,35 @@ class InteractiveScraper:
         """Check for conflicts with existing schedules"""
         conflicts = []
         
-        for existing_id, existing in self.schedules.items():
-            if not existing.is_active:
-                continue
-            
+        try:
+            new_start = time_to_minutes(new_schedule.start_time)
+        except ValueError:
+            return conflicts
+        
+        overlapping = self.get_schedule_index().overlapping(
+            new_start, new_schedule.estimated_duration_minutes, exclude_id=new_schedule.id
+        )
+        overlapping.sort(key=lambda s: ((time_to_minutes(s.start_time) - new_start) % MINUTES_PER_DAY, s.name))
+        
+        for existing in overlapping:
             # Direct time conflict
             if existing.start_time == new_schedule.start_time:
                 conflicts.append(f"Direct time conflict with '{existing.name}' at {existing.start_time}")
             
-            # Execution overlap
-            overlap = self.check_execution_overlap(existing, new_schedule)
-            if overlap:
-                conflicts.append(overlap)
+            # Execution overlap (windows may cross midnight)
+            conflicts.append(f"Execution overlap with '{existing.name}'")
         
         return conflicts
     
     def check_execution_overlap(self, schedule1, schedule2):
         """Check if execution windows overlap"""
         try:
-            time1 = datetime.strptime(schedule1.start_time, "%H:%M")
-            time2 = datetime.strptime(schedule2.start_time, "%H:%M")
-            
-            end1 = time1 + timedelta(minutes=schedule1.estimated_duration_minutes)
-            end2 = time2 + timedelta(minutes=schedule2.estimated_duration_minutes)
-            
-            if (time1 <= time2 < end1) or (time2 <= time1 < end2):
+            if ScheduleIntervalIndex.windows_overlap(
+                time_to_minutes(schedule1.start_time), schedule1.estimated_duration_minutes,
+                time_to_minutes(schedule2.start_time), schedule2.estimated_duration_minutes,
+            ):
                 return f"Execution overlap with '{schedule1.name}'"
-        except:
+        except ValueError:
             pass
         
         return None
@@ -871,11 +1516,14 @@ class InteractiveScraper:
         
         # Get conflicting schedules to understand the conflict better
         conflicting_schedules = []
-        for existing_id, existing in self.schedules.items():
-            if existing.is_active:
-                conflicts = self.check_schedule_conflicts_between(new_schedule, existing)
-                if conflicts:
-                    conflicting_schedules.append(existing)
+        try:
+            conflicting_schedules = self.get_schedule_index().overlapping(
+                time_to_minutes(new_schedule.start_time),
+                new_schedule.estimated_duration_minutes,
+                exclude_id=new_schedule.id,
+            )
+        except ValueError:
+            pass
         
         # Strategy 1: Find slots BEFORE the first conflicting schedule (if there's time)
         before_slots = self.find_slots_before_conflicts(new_schedule, conflicting_schedules, current_time)
@@ -905,172 +1553,99 @@ class InteractiveScraper:
             conflicts.append("Direct time conflict")
         
         # Execution overlap
-        try:
-            time1 = datetime.strptime(schedule1.start_time, "%H:%M")
-            time2 = datetime.strptime(schedule2.start_time, "%H:%M")
-            
-            end1 = time1 + timedelta(minutes=schedule1.estimated_duration_minutes)
-            end2 = time2 + timedelta(minutes=schedule2.estimated_duration_minutes)
-            
-            if (time1 <= time2 < end1) or (time2 <= time1 < end2):
-                conflicts.append("Execution overlap")
-        except:
-            pass
+        if self.check_execution_overlap(schedule1, schedule2):
+            conflicts.append("Execution overlap")
         
         return conflicts
     
+    def _relative_window_bounds(self, new_schedule, schedules):
+        """Start/end of schedules in minutes relative to new_schedule's start
+
+        Windows starting up to 12h before the new start count as earlier,
+        so a 23:30 schedule sits just before a 00:15 one across midnight.
+        """
+        new_start = time_to_minutes(new_schedule.start_time)
+        bounds = []
+        for schedule in schedules:
+            try:
+                offset = (time_to_minutes(schedule.start_time) - new_start) % MINUTES_PER_DAY
+            except ValueError:
+                continue
+            if offset > MINUTES_PER_DAY // 2:
+                offset -= MINUTES_PER_DAY
+            bounds.append((new_start + offset, new_start + offset + schedule.estimated_duration_minutes))
+        return bounds
+    
     def find_slots_before_conflicts(self, new_schedule, conflicting_schedules, current_time):
         """Find safe slots before conflicting schedules"""
-        before_slots = []
-        
         if not conflicting_schedules:
-            return before_slots
+            return []
         
-        # Find the earliest conflicting schedule
-        earliest_conflict = None
-        for conflict_schedule in conflicting_schedules:
-            try:
-                conflict_time = datetime.strptime(conflict_schedule.start_time, "%H:%M")
-                if earliest_conflict is None or conflict_time < earliest_conflict:
-                    earliest_conflict = conflict_time
-            except:
-                continue
+        bounds = self._relative_window_bounds(new_schedule, conflicting_schedules)
+        if not bounds:
+            return []
+        earliest_conflict = min(start for start, _ in bounds)
         
-        if earliest_conflict is None:
-            return before_slots
-        
-        # Calculate when new schedule needs to finish to avoid conflict
+        # Only suggest times that are after current time (5-minute buffer from now)
+        now_minute = current_time.hour * 60 + current_time.minute + 5
         buffer_minutes = 10  # 10-minute buffer
-        latest_start = earliest_conflict - timedelta(minutes=new_schedule.estimated_duration_minutes + buffer_minutes)
-        
-        # Only suggest times that are after current time
-        current_plus_buffer = current_time + timedelta(minutes=5)  # 5-minute buffer from now
-        
-        if latest_start > current_plus_buffer:
-            # We have time before the conflict - suggest slots
-            start_checking = max(current_plus_buffer, current_time.replace(minute=0, second=0))
-            
-            # Generate 30-minute slots between now and latest_start
-            checking_time = start_checking
-            while checking_time <= latest_start and len(before_slots) < 4:
-                time_str = checking_time.strftime("%H:%M")
-                
-                # Round to nearest 30-minute mark
-                minute = checking_time.minute
-                if minute < 15:
-                    rounded_minute = 0
-                elif minute < 45:
-                    rounded_minute = 30
-                else:
-                    rounded_minute = 0
-                    checking_time += timedelta(hours=1)
-                
-                rounded_time = checking_time.replace(minute=rounded_minute, second=0)
-                time_str = rounded_time.strftime("%H:%M")
-                
-                # Check if this time is actually safe
-                if self.is_time_slot_safe(time_str, new_schedule):
-                    before_slots.append(time_str)
-                
-                checking_time += timedelta(minutes=30)
-        
-        return before_slots
+        latest_start = (earliest_conflict - now_minute) % MINUTES_PER_DAY
+        
+        return self.get_schedule_index().find_free_slots(
+            new_schedule.estimated_duration_minutes,
+            after_minute=now_minute,
+            latest_start=latest_start,
+            buffer_minutes=buffer_minutes,
+            limit=4,
+        )
     
     def find_slots_after_conflicts(self, new_schedule, conflicting_schedules):
         """Find safe slots after conflicting schedules complete"""
-        after_slots = []
-        
         if not conflicting_schedules:
-            return after_slots
-        
-        # Find the latest ending conflicting schedule
-        latest_end = None
-        for conflict_schedule in conflicting_schedules:
-            try:
-                conflict_start = datetime.strptime(conflict_schedule.start_time, "%H:%M")
-                conflict_end = conflict_start + timedelta(minutes=conflict_schedule.estimated_duration_minutes)
-                
-                if latest_end is None or conflict_end > latest_end:
-                    latest_end = conflict_end
-            except:
-                continue
-        
-        if latest_end is None:
-            return after_slots
-        
-        # Add buffer and suggest times after conflicts
-        buffer_minutes = 10
-        earliest_after = latest_end + timedelta(minutes=buffer_minutes)
-        
-        # Generate slots after conflicts (up to 4 suggestions)
-        checking_time = earliest_after
-        end_of_day = datetime.now().replace(hour=22, minute=0, second=0)  # Until 10 PM
-        
-        while checking_time <= end_of_day and len(after_slots) < 4:
-            # Round to nearest 30-minute mark
-            minute = checking_time.minute
-            if minute < 15:
-                rounded_minute = 0
-            elif minute < 45:
-                rounded_minute = 30
-            else:
-                rounded_minute = 0
-                checking_time += timedelta(hours=1)
-                continue
-            
-            rounded_time = checking_time.replace(minute=rounded_minute, second=0)
-            time_str = rounded_time.strftime("%H:%M")
-            
-            # Check if this time is actually safe
-            if self.is_time_slot_safe(time_str, new_schedule):
-                after_slots.append(time_str)
-            
-            checking_time += timedelta(minutes=30)
-        
-        return after_slots
+            return []
+        
+        bounds = self._relative_window_bounds(new_schedule, conflicting_schedules)
+        if not bounds:
+            return []
+        latest_end = max(end for _, end in bounds)
+        
+        # Add buffer and suggest times after conflicts (up to 4 suggestions)
+        return self.get_schedule_index().find_free_slots(
+            new_schedule.estimated_duration_minutes,
+            after_minute=latest_end,
+            buffer_minutes=10,
+            limit=4,
+        )
     
     def find_fallback_slots(self, new_schedule, current_time):
         """Find reasonable fallback slots if no good options found"""
         fallback_slots = []
         
-        # Suggest some reasonable times around current time
-        base_times = [
-            current_time + timedelta(hours=1),
-            current_time + timedelta(hours=2),
-            current_time + timedelta(hours=3),
-            current_time - timedelta(hours=1) if current_time.hour > 7 else current_time + timedelta(hours=4),
-        ]
-        
-        for base_time in base_times:
-            if 6 <= base_time.hour <= 22:  # Reasonable hours
-                # Round to 30-minute marks
-                minute = 0 if base_time.minute < 30 else 30
-                rounded_time = base_time.replace(minute=minute, second=0)
-                time_str = rounded_time.strftime("%H:%M")
-                
-                if self.is_time_slot_safe(time_str, new_schedule):
-                    fallback_slots.append(time_str)
+        # Suggest the nearest free slots within reasonable hours
+        candidates = self.get_schedule_index().find_free_slots(
+            new_schedule.estimated_duration_minutes,
+            after_minute=current_time.hour * 60 + current_time.minute + 60,
+            limit=16,
+        )
+        for time_str in candidates:
+            if 6 <= int(time_str[:2]) <= 22:  # Reasonable hours
+                fallback_slots.append(time_str)
+            if len(fallback_slots) >= 4:
+                break
         
         return fallback_slots
     
     def is_time_slot_safe(self, test_time, new_schedule):
         """Check if a specific time slot is safe for the new schedule"""
-        # Create temporary schedule to test
-        temp_schedule = Schedule(
-            id="temp",
-            name="temp",
-            search_terms=new_schedule.search_terms,
-            start_time=test_time,
-            duration_minutes=new_schedule.duration_minutes,
-            limit_per_run=new_schedule.limit_per_run,
-            skip_duplicates=new_schedule.skip_duplicates,
-            is_recurring=new_schedule.is_recurring,
-            is_active=True,
-            estimated_duration_minutes=new_schedule.estimated_duration_minutes
-        )
+        try:
+            start = time_to_minutes(test_time)
+        except ValueError:
+            return False
         
-        # Check for conflicts
-        conflicts = self.check_schedule_conflicts(temp_schedule)
+        # Any overlapping window (which includes an identical start) is a conflict
+        conflicts = self.get_schedule_index().overlapping(
+            start, new_schedule.estimated_duration_minutes, exclude_id=new_schedule.id
+        )
         return len(conflicts) == 0
     
     def sort_by_time_proximity(self, time_list, current_time_str):
@@ -1097,33 +1672,31 @@ class InteractiveScraper:
     
     def calculate_sequential_time(self, new_schedule):
         """Calculate the best time to run after conflicting schedules"""
-        latest_end_time = None
-        
-        # Find the latest end time of all conflicting schedules
-        for existing_id, existing in self.schedules.items():
-            if not existing.is_active:
-                continue
-            
-            try:
-                existing_start = datetime.strptime(existing.start_time, "%H:%M")
-                existing_end = existing_start + timedelta(minutes=existing.estimated_duration_minutes)
-                
-                if latest_end_time is None or existing_end > latest_end_time:
-                    latest_end_time = existing_end
-            except:
-                continue
+        try:
+            new_start = time_to_minutes(new_schedule.start_time)
+        except ValueError:
+            return None
         
-        if latest_end_time:
-            # Add 10-minute buffer after the latest schedule
-            sequential_time = latest_end_time + timedelta(minutes=10)
-            
-            # If it goes past midnight, schedule for next day
-            if sequential_time.hour >= 23:
-                sequential_time = sequential_time.replace(hour=8, minute=0) + timedelta(days=1)
-            
-            return sequential_time.strftime("%H:%M")
+        index = self.get_schedule_index()
+        conflicting = index.overlapping(
+            new_start, new_schedule.estimated_duration_minutes, exclude_id=new_schedule.id
+        )
+        if not conflicting:
+            return new_schedule.start_time
+        
+        # Find the latest end time of all conflicting schedules (may be past midnight)
+        latest_end_time = max(end for _, end in self._relative_window_bounds(new_schedule, conflicting))
+        
+        # First free slot after a 10-minute buffer following the latest schedule
+        slots = index.find_free_slots(
+            new_schedule.estimated_duration_minutes,
+            after_minute=latest_end_time,
+            buffer_minutes=10,
+            step_minutes=5,
+            limit=1,
+        )
         
-        return None
+        return slots[0] if slots else None
     
     def schedules_would_conflict_now(self, schedule1, schedule2):
         """Check if two schedules would conflict if run simultaneously"""
@@ -1131,21 +1704,8 @@ class InteractiveScraper:
         if schedule2.currently_running:
             return True
         
-        # Check execution overlap potential
-        try:
-            time1 = datetime.strptime(schedule1.start_time, "%H:%M")
-            time2 = datetime.strptime(schedule2.start_time, "%H:%M")
-            
-            end1 = time1 + timedelta(minutes=schedule1.estimated_duration_minutes)
-            end2 = time2 + timedelta(minutes=schedule2.estimated_duration_minutes)
-            
-            # If execution windows would overlap
-            if (time1 <= time2 < end1) or (time2 <= time1 < end2):
-                return True
-        except:
-            pass
-        
-        return False
+        # Check execution overlap potential (windows may cross midnight)
+        return self.check_execution_overlap(schedule1, schedule2) is not None
     
     def start_scheduler(self):
         """Start the scheduling system"""
@@ -1153,10 +1713,12 @@ class InteractiveScraper:
         
         if not active_schedules:
             print("❌ No active schedules! Create a schedule first.")
-            input("Press Enter to continue...")
+            if not self.supervised:
+                input("Press Enter to continue...")
             return
         
-        self.clear_screen()
+        if not self.supervised:
+            self.clear_screen()
         self.print_header()
         print("🚀 STARTING SCHEDULER")
         print("=" * 25)
@@ -1164,6 +1726,8 @@ class InteractiveScraper:
         for schedule in active_schedules:
             print(f"   - {schedule.name} at {schedule.start_time}")
         
+        if self.supervised:
+            print(f"🛡️ Supervised: hung or crashed searches restart (up to {self.supervisor.max_restarts} times)")
         print(f"\n⏰ Current time: {datetime.now().strftime('%H:%M:%S')}")
         print("\n💡 Press Ctrl+C to stop the scheduler")
         print("=" * 40)
@@ -1231,7 +1795,39 @@ class InteractiveScraper:
         except KeyboardInterrupt:
             print(f"\n\n🛑 SCHEDULER STOPPED")
             print("All schedules remain saved for next time.")
-            input("Press Enter to continue...")
+            if not self.supervised:
+                input("Press Enter to continue...")
+    
+    def next_start(self, schedule, after):
+        """When a schedule next starts after the given time (None if it won't)"""
+        if schedule.is_recurring and schedule.last_run:
+            try:
+                last_run_time = datetime.strptime(schedule.last_run, "%Y-%m-%d %H:%M:%S")
+                return max(after, last_run_time + timedelta(minutes=schedule.duration_minutes))
+            except ValueError:
+                pass
+        if schedule.total_runs > 0 and not schedule.is_recurring:
+            return None
+        start = after.replace(second=0, microsecond=0)
+        offset = (time_to_minutes(schedule.start_time) - (start.hour * 60 + start.minute)) % MINUTES_PER_DAY
+        return start + timedelta(minutes=offset or MINUTES_PER_DAY)
+    
+    def schedule_window_end(self, schedule, started):
+        """When a run of this schedule has to be finished
+        
+        That is its own next recurrence or the next start of another active
+        schedule, whichever comes first. None if nothing follows it.
+        """
+        window_ends = []
+        if schedule.is_recurring and schedule.duration_minutes > 0:
+            window_ends.append(started + timedelta(minutes=schedule.duration_minutes))
+        for other in self.schedules.values():
+            if other.id == schedule.id or not other.is_active or other.currently_running:
+                continue
+            other_start = self.next_start(other, started)
+            if other_start is not None:
+                window_ends.append(other_start)
+        return min(window_ends) if window_ends else None
     
     def execute_schedule(self, schedule):
         """Execute a specific schedule with sequential execution support"""
@@ -1250,19 +1846,76 @@ class InteractiveScraper:
         
         success_count = 0
         start_time = datetime.now()
+        window_end = self.schedule_window_end(schedule, start_time)
+        if window_end:
+            print(f"⏰ Window ends at {window_end.strftime('%H:%M')}; searches stop and checkpoint by then")
+        
+        self.estimator.reload()
+        prediction = self.estimator.estimate_schedule(schedule.search_terms, schedule.limit_per_run)
+        print(f"📈 Predicted: {prediction['minutes']:.0f} min "
+              f"({prediction['minutes_low']:.0f}-{prediction['minutes_high']:.0f}), "
+              f"~{prediction['contacts']:.0f} new contacts "
+              f"({prediction['learned_terms']}/{len(schedule.search_terms)} terms learned)")
+        
+        # Spelling variants share progress, so only run one of them
+        search_terms = self.collapse_query_variants(schedule.search_terms)
+        
+        # Put browser time where new contacts come from
+        if schedule.prioritize_terms:
+            search_terms, deferred_terms = self.prioritizer.plan(search_terms)
+            if deferred_terms:
+                print(f"💤 Deferred {len(deferred_terms)} saturated term(s): {', '.join(deferred_terms)}")
+            for term in search_terms[:5]:
+                rate = self.prioritizer.term_rate(term)
+                probe = self.estimator.probe_for(term)
+                if rate is not None:
+                    rate_text = f"{rate:.2f} new/min"
+                elif probe:
+                    rate_text = f"probe: ~{probe['new_per_minute']:.2f} new/min"
+                else:
+                    rate_text = "new term"
+                print(f"   ▶ {term} ({rate_text})")
         
         try:
-            for i, search_term in enumerate(schedule.search_terms, 1):
-                print(f"\n--- Search {i}/{len(schedule.search_terms)}: {search_term} ---")
+            for i, search_term in enumerate(search_terms, 1):
+                print(f"\n--- Search {i}/{len(search_terms)}: {search_term} ---")
+                
+                deadline_args = []
+                if window_end:
+                    # Split what is left of the window evenly over the remaining terms
+                    term_seconds = (window_end - datetime.now()).total_seconds() / (len(search_terms) - i + 1)
+                    if term_seconds < 60:
+                        print(f"⏰ Window used up; {len(search_terms) - i + 1} search(es) left for the next run")
+                        break
+                    term_deadline = datetime.now() + timedelta(seconds=term_seconds)
+                    deadline_args = ["--deadline", term_deadline.strftime("%Y-%m-%dT%H:%M:%S")]
                 
                 command = f'-s "{search_term}" --limit {schedule.limit_per_run}'
                 if schedule.skip_duplicates:
                     command += " --skip-duplicates"
+                if deadline_args:
+                    command += " " + " ".join(deadline_args)
+                queue_args = []
+                if self.job_queue_file:
+                    # Each host queues the term and works on whichever jobs are still unclaimed
+                    queue_args = ["--job-queue", self.job_queue_file, "--queue-name", schedule.id,
+                                  "--requeue-after-minutes", str(max(1, schedule.duration_minutes // 2))]
+                    command += " " + " ".join(f'"{arg}"' for arg in queue_args)
                 
                 try:
                     print(f"🚀 Running: python main.py {command}")
-                    result = subprocess.run(f"python main.py {command}", shell=True, capture_output=False)
-                    if result.returncode == 0:
+                    term_started = time.time()
+                    if self.supervised:
+                        scraper_args = ["-s", search_term]
+                        if schedule.skip_duplicates:
+                            scraper_args.append("--skip-duplicates")
+                        scraper_args.extend(queue_args + deadline_args)
+                        succeeded = self.supervisor.run(search_term, schedule.limit_per_run, scraper_args)
+                    else:
+                        result = subprocess.run(f"python main.py {command}", shell=True, capture_output=False)
+                        succeeded = result.returncode == 0
+                    self.estimator.attach_wall_time(search_term, term_started, time.time() - term_started)
+                    if succeeded:
                         success_count += 1
                         print(f"✅ Search completed successfully")
                     else:
@@ -1282,16 +1935,24 @@ class InteractiveScraper:
             if hasattr(schedule, 'auto_sequence'):
                 schedule.auto_sequence = False
             
+            # Re-learn the execution window from this run's statistics
+            schedule.estimated_duration_minutes = self.estimate_execution_time(
+                schedule.search_terms, schedule.limit_per_run
+            )
+            
             self.save_schedules()
         
         end_time = datetime.now()
         actual_duration = int((end_time - start_time).total_seconds() / 60)
         
         print(f"\n✅ SCHEDULE COMPLETED")
-        print(f"   Successful searches: {success_count}/{len(schedule.search_terms)}")
+        print(f"   Successful searches: {success_count}/{len(search_terms)}")
         print(f"   Total runs: {schedule.total_runs}")
         print(f"   Actual duration: {actual_duration} minutes")
-        print(f"   Estimated duration: {schedule.estimated_duration_minutes} minutes")
+        print(f"   Predicted duration: {prediction['minutes']:.0f} minutes")
+        print(f"   Updated estimate (upper bound): {schedule.estimated_duration_minutes} minutes")
+        if self.supervised:
+            print(f"   Supervisor: {self.supervisor.summary()}")
         
         if schedule.is_recurring:
             next_run = datetime.now() + timedelta(minutes=schedule.duration_minutes)
@@ -1306,6 +1967,20 @@ class InteractiveScraper:
             for queued in queued_schedules:
                 print(f"   - {queued.name} (was waiting for this schedule)")
     
+    def collapse_query_variants(self, search_terms):
+        """Drop terms that are spelling variants of an earlier term"""
+        if self.query_normalizer is None:
+            return list(search_terms)
+        
+        unique_terms = {}
+        for term in search_terms:
+            key = self.query_normalizer.canonical(term, learn=False)
+            if key in unique_terms:
+                print(f"🔁 Skipping '{term}' (same query as '{unique_terms[key]}')")
+                continue
+            unique_terms[key] = term
+        return list(unique_terms.values())
+    
     def manual_schedule_run(self):
         """Run a schedule immediately"""
         if not self.schedules:
@@ -1406,6 +2081,12 @@ class InteractiveScraper:
                 if self.validate_time_format(new_time):
                     schedule.start_time = new_time
                 
+                # Edit term prioritization
+                current = "y" if schedule.prioritize_terms else "n"
+                schedule.prioritize_terms = self.get_user_input(
+                    "Prioritize terms by recent yield? (y/n)", current
+                ).lower() == 'y'
+                
                 self.save_schedules()
                 print("✅ Schedule updated!")
             else:
@@ -1544,9 +2225,23 @@ class InteractiveScraper:
         print(f"Checking {len(active_schedules)} active schedules for conflicts...\n")
         
         conflicts_found = False
+        index = self.get_schedule_index()
+        position = {s.id: i for i, s in enumerate(active_schedules)}
         
         for i, schedule1 in enumerate(active_schedules):
-            for j, schedule2 in enumerate(active_schedules[i+1:], i+1):
+            try:
+                overlapping = index.overlapping(
+                    time_to_minutes(schedule1.start_time),
+                    schedule1.estimated_duration_minutes,
+                    exclude_id=schedule1.id,
+                )
+            except ValueError:
+                continue
+            
+            # Report each pair once, in list order
+            for schedule2 in sorted(overlapping, key=lambda s: position.get(s.id, -1)):
+                if position.get(schedule2.id, -1) <= i:
+                    continue
                 conflicts = []
                 
                 # Direct time conflict
@@ -1554,9 +2249,7 @@ class InteractiveScraper:
                     conflicts.append(f"Same start time: {schedule1.start_time}")
                 
                 # Execution overlap
-                overlap = self.check_execution_overlap(schedule1, schedule2)
-                if overlap:
-                    conflicts.append("Execution windows overlap")
+                conflicts.append("Execution windows overlap")
                 
                 if conflicts:
                     conflicts_found = True
@@ -1609,7 +2302,13 @@ class InteractiveScraper:
         print("\n💾 FILES CREATED:")
         print("   - multi_schedules.json: All your schedules")
         print("   - output/all_contacts.csv: Scraped data")
-        print("   - fetched_contacts.json: Duplicate prevention")
+        print("   - scraper_state.db: Shared duplicate/progress store (safe for parallel runs)")
+        print("   - fetched_contacts.json: Duplicate prevention (snapshot of scraper_state.db)")
+        print("   - search_stats.json: Run history for duration/yield estimates")
+        print("   - selector_stats.json: Selector hit rates and markup-change alerts")
+        print("   - place_archive/: Raw place pages (main.py --archive-pages); re-extract with main.py --replay")
+        print("   - supervisor_metrics.json: Restart/hang/crash counts (python interactive_scraper.py --supervise)")
+        print("   - query_aliases.json: Optional spelling aliases, e.g. {\"bussiness\": \"business\"}")
         
         input("\nPress Enter to continue...")
         
@@ -1650,9 +2349,20 @@ class InteractiveScraper:
 
 def main():
     """Entry point for the interactive scraper"""
+    parser = argparse.ArgumentParser(description="Interactive Google Maps Scraper")
+    parser.add_argument("--supervise", action="store_true",
+                        help="Run the active schedules unattended, restarting hung or crashed searches")
+    parser.add_argument("--job-queue", type=str,
+                        help="SQLite job queue shared with other hosts running the same schedules")
+    args = parser.parse_args()
     try:
         scraper = InteractiveScraper()
-        scraper.run()
+        scraper.job_queue_file = args.job_queue
+        if args.supervise:
+            scraper.supervised = True
+            scraper.start_scheduler()
+        else:
+            scraper.run()
     except KeyboardInterrupt:
         print("\n\n👋 Goodbye!")
     except Exception as e:
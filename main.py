@@ -2,24 +2,50 @@ from playwright.sync_api import sync_playwright
 from dataclasses import dataclass, asdict, field
 import pandas as pd
 import argparse
+import gzip
 import os
 import sys
 import json
 import time
 import random
+import re
+import math
+import shutil
+import socket
+import sqlite3
+import threading
+import traceback
+from collections import deque
+from operator import attrgetter
+from contextlib import contextmanager
 from pathlib import Path
+from datetime import datetime, timedelta
+from urllib.parse import quote_plus
 
-@dataclass
 class Business:
-    """holds business data"""
-
-    name: str = None
-    address: str = None
-    website: str = None
-    phone_number: str = None
-    reviews_count: int = None
-    reviews_average: float = None
-    search_query: str = None
+    """holds business data
+    
+    Slotted (no per-instance __dict__), since a run can hold many
+    thousands of these; __slots__ also fixes the CSV column order.
+    """
+    
+    __slots__ = ("name", "address", "website", "phone_number", "reviews_count",
+                 "reviews_average", "search_query", "place_url")
+    
+    def __init__(self, name=None, address=None, website=None, phone_number=None, reviews_count=None,
+                 reviews_average=None, search_query=None, place_url=None):
+        self.name = name
+        self.address = address
+        self.website = website
+        self.phone_number = phone_number
+        self.reviews_count = reviews_count
+        self.reviews_average = reviews_average
+        self.search_query = search_query
+        self.place_url = place_url
+    
+    def __repr__(self):
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"Business({fields})"
     
     def get_unique_id(self):
         """Generate a unique identifier for the business"""
@@ -63,15 +89,20 @@ class BusinessList:
     business_list: list[Business] = field(default_factory=list)
     save_at = 'output'
     centralized_csv = 'output/all_contacts.csv'
+    refresh_fields = ("name", "address", "website", "phone_number", "reviews_count", "reviews_average")
+
+    def columns(self):
+        """business_list as {field: [values]}, gathered in one pass over the records"""
+        rows = map(attrgetter(*Business.__slots__), self.business_list)
+        values = zip(*rows) if self.business_list else ([] for _ in Business.__slots__)
+        return dict(zip(Business.__slots__, map(list, values)))
 
     def dataframe(self):
         """transform business_list to pandas dataframe
 
         Returns: pandas dataframe
         """
-        return pd.json_normalize(
-            (asdict(business) for business in self.business_list), sep="_"
-        )
+        return pd.DataFrame(self.columns(), columns=list(Business.__slots__))
 
     def append_to_centralized_csv(self):
         """Append new data to centralized CSV file without overwriting"""
@@ -85,6 +116,9 @@ class BusinessList:
             
         new_df = self.dataframe()
         
+        if self.append_rows(new_df):
+            return
+        
         # Check if centralized CSV exists
         if os.path.exists(self.centralized_csv):
             # Read existing data
@@ -107,6 +141,103 @@ class BusinessList:
         print(f"✅ Saved to: {self.centralized_csv}")
         print(f"📊 Total contacts in database: {len(combined_df)}")
         
+    def append_rows(self, new_df):
+        """Append rows to the centralized CSV without rewriting it
+        
+        Only possible when the file's header matches the current columns;
+        returns False otherwise (e.g. a file from before a column was added).
+        """
+        if not os.path.exists(self.centralized_csv):
+            return False
+        try:
+            existing_columns = list(pd.read_csv(self.centralized_csv, nrows=0).columns)
+        except Exception:
+            return False
+        if existing_columns != list(new_df.columns):
+            return False
+        
+        existing_count = len(pd.read_csv(self.centralized_csv, usecols=[0]))
+        with open(self.centralized_csv, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")  # hand-edited file without a final newline
+        new_df.to_csv(self.centralized_csv, mode="a", header=False, index=False)
+        print(f"Appending {len(new_df)} new contacts to existing {existing_count} contacts")
+        print(f"✅ Saved to: {self.centralized_csv}")
+        print(f"📊 Total contacts in database: {existing_count + len(new_df)}")
+        return True
+
+    def update_centralized_csv(self, only_blank=False):
+        """Update rows of the centralized CSV in place from re-scraped businesses
+        
+        Rows are matched by place_url. Values are compared after
+        normalising (see comparable), so a phone number stored without its
+        "+" or a count stored as "36.0" does not count as a change. Fields
+        that could not be read (empty) keep their old value; with
+        only_blank, only fields that are blank in the CSV (missing, 0 or
+        "Name not found") are filled. Returns {field: number of rows changed}.
+        """
+        changes = {}
+        if len(self.business_list) == 0 or not os.path.exists(self.centralized_csv):
+            return changes
+        
+        # Read as text so untouched values (phone numbers, ratings) are written back unchanged
+        df = pd.read_csv(self.centralized_csv, dtype=str)
+        if "place_url" not in df.columns:
+            print("The centralized CSV has no place_url column; nothing to refresh.")
+            return changes
+        
+        for business in self.business_list:
+            rows = df["place_url"] == business.place_url
+            if not rows.any():
+                continue
+            for column in self.refresh_fields:
+                value = getattr(business, column)
+                if value in (None, "", 0) or (column == "name" and value == "Name not found"):
+                    continue
+                target = self.comparable(column, value)
+                old_values = df.loc[rows, column]
+                changed = old_values.index[[self.comparable(column, old) != target for old in old_values]]
+                if only_blank:
+                    changed = [row for row in changed
+                               if self.comparable(column, df.at[row, column]) in (None, "", 0, "Name not found")]
+                if len(changed):
+                    df.loc[changed, column] = str(value)
+                    changes[column] = changes.get(column, 0) + len(changed)
+        
+        if changes:
+            tmp_path = f"{self.centralized_csv}.tmp"
+            df.to_csv(tmp_path, index=False)
+            os.replace(tmp_path, self.centralized_csv)
+        return changes
+        
+    @staticmethod
+    def comparable(column, value):
+        """A CSV or extracted value normalised for comparison (None when missing)"""
+        if value is None or (isinstance(value, float) and math.isnan(value)):
+            return None
+        if column == "phone_number":
+            return Business().format_indian_phone(value)
+        if column in ("reviews_count", "reviews_average"):
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                return str(value).strip()
+            return int(number) if column == "reviews_count" else round(number, 1)
+        return str(value).strip()
+        
+    def known_place_urls(self):
+        """place_url values already in the centralized CSV"""
+        if not os.path.exists(self.centralized_csv):
+            return set()
+        try:
+            df = pd.read_csv(self.centralized_csv, dtype=str)
+        except Exception:
+            return set()
+        if "place_url" not in df.columns:
+            return set()
+        return set(df["place_url"].dropna())
+        
     def save_to_excel(self, filename):
         """saves pandas dataframe to excel (xlsx) file (legacy method)"""
         if not os.path.exists(self.save_at):
@@ -121,14 +252,326 @@ class BusinessList:
 
 # Removed coordinate extraction - not needed for this use case
 
+def edit_distance(a, b, max_distance=2):
+    """Damerau-Levenshtein (optimal string alignment) distance, capped
+    
+    Returns max_distance + 1 as soon as the distance is known to exceed it.
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return max_distance + 1
+    previous_previous = None
+    previous = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = 0 if a[i - 1] == b[j - 1] else 1
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return max_distance + 1
+        previous_previous, previous = previous, current
+    return min(previous[-1], max_distance + 1)
+
+class QueryNormalizer:
+    """Maps spelling variants of a search query to one canonical key
+    
+    Tokens are lower-cased, stop words dropped, then resolved through the
+    alias table (built-in defaults extended by query_aliases.json, a flat
+    {"variant": "canonical"} object). Only aliases fold tokens: a small edit
+    distance also joins different searches ("hotel"/"hostel",
+    "dental"/"rental"), so near matches against known tokens are only
+    offered as suggestions for the alias table. Tokens are sorted, so
+    "Delhi Business" and "Bussiness Delhi" share a key.
+    """
+    
+    DEFAULT_ALIASES = {
+        "bussiness": "business",
+        "buisness": "business",
+        "jweller": "jewellery",
+        "jwellery": "jewellery",
+        "jeweller": "jewellery",
+        "jewellers": "jewellery",
+        "maharastra": "maharashtra",
+        "mharastra": "maharashtra",
+        "maharshtra": "maharashtra",
+        "rajesthan": "rajasthan",
+        "gujrat": "gujarat",
+        "collage": "college",
+        "corprate": "corporate",
+        "restraunt": "restaurant",
+        "noth": "north",
+    }
+    STOP_WORDS = {"in", "near", "at", "the", "of"}
+    
+    def __init__(self, alias_file="query_aliases.json", known_queries=()):
+        self.alias_file = alias_file
+        self.aliases = dict(self.DEFAULT_ALIASES)
+        self.aliases.update(self.load_aliases())
+        self.vocabulary = set(self.aliases.values())
+        for query in known_queries:
+            self.canonical(query.partition(" @")[0], learn=True)  # without a map tile key
+    
+    def load_aliases(self):
+        """Load the user alias table from file"""
+        if os.path.exists(self.alias_file):
+            try:
+                with open(self.alias_file, 'r') as f:
+                    return {k.lower().strip(): v.lower().strip() for k, v in json.load(f).items()}
+            except:
+                print(f"Could not read alias table: {self.alias_file}")
+        return {}
+    
+    @staticmethod
+    def max_distance_for(token):
+        """Typo distance worth suggesting: none for short tokens, more for long ones"""
+        if len(token) < 5:
+            return 0
+        return 1 if len(token) < 8 else 2
+    
+    def tokens(self, query):
+        tokens = "".join(c if c.isalnum() else " " for c in query.lower()).split()
+        return [t for t in tokens if t not in self.STOP_WORDS] or tokens
+    
+    def canonical_token(self, token, learn=False):
+        """Resolve one token through the alias table; learn it (not numbers) for suggestions"""
+        token = self.aliases.get(token, token)
+        if learn and not token.isdigit():
+            self.vocabulary.add(token)
+        return token
+    
+    def canonical(self, query, learn=True):
+        """Canonical key of a search query"""
+        return " ".join(sorted(self.canonical_token(t, learn) for t in self.tokens(query)))
+    
+    def suggestions(self, query):
+        """{token: known token} for tokens that look like typos of a known one
+        
+        Only a hint for the alias table; canonical() never applies it.
+        """
+        found = {}
+        for token in self.tokens(query):
+            token = self.aliases.get(token, token)
+            max_distance = self.max_distance_for(token)
+            if token in self.vocabulary or token.isdigit() or not max_distance:
+                continue
+            best, best_distance = None, max_distance + 1
+            for known in sorted(self.vocabulary):
+                distance = edit_distance(token, known, max_distance)
+                if distance < best_distance:
+                    best, best_distance = known, distance
+            if best:
+                found[token] = best
+        return found
+
+class ContactStore:
+    """SQLite (WAL mode) store for fetched contact IDs and search positions
+    
+    Several main.py processes can use the same database at once: marks are
+    committed immediately and are visible to every other process on its
+    next lookup, and claiming an ID is atomic, so two scrapers never both
+    keep the same place. On first use the legacy JSON cache and progress
+    files are imported.
+    """
+    
+    def __init__(self, db_file="scraper_state.db"):
+        self.db_file = db_file
+        self.local = threading.local()
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS fetched (business_id TEXT PRIMARY KEY, fetched_at REAL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS progress (search_key TEXT PRIMARY KEY, position INTEGER, updated_at REAL)")
+        conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        self._create_retries(conn)
+        conn.execute("CREATE TABLE IF NOT EXISTS places (place_url TEXT PRIMARY KEY, business_id TEXT, scraped_at REAL)")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS result_sets (search_key TEXT PRIMARY KEY, cached_at REAL, "
+            "complete INTEGER, places TEXT)"
+        )
+    
+    RETRIES_SCHEMA = (
+        "CREATE TABLE IF NOT EXISTS retries (href TEXT, search_key TEXT, label TEXT, attempts INTEGER, "
+        "next_retry_at REAL, last_error TEXT, PRIMARY KEY (search_key, href))"
+    )
+    
+    def _create_retries(self, conn):
+        """Create the retries table, keyed by (search_key, href)
+        
+        Databases from before overlapping searches could queue the same
+        place were keyed by href alone; their rows are moved over.
+        """
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            key_columns = [row[1] for row in conn.execute("PRAGMA table_info(retries)") if row[5]]
+            if key_columns == ["href"]:
+                conn.execute("ALTER TABLE retries RENAME TO retries_old")
+                conn.execute(self.RETRIES_SCHEMA)
+                conn.execute("INSERT INTO retries SELECT * FROM retries_old")
+                conn.execute("DROP TABLE retries_old")
+            else:
+                conn.execute(self.RETRIES_SCHEMA)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def connection(self):
+        """This thread's connection (sqlite3 connections are per thread)"""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self.local.conn = conn
+        return conn
+    
+    def import_legacy(self, fetched_ids, progress):
+        """Import JSON-era data once; returns False if it was already imported"""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM meta WHERE key = 'legacy_imported'").fetchone():
+                conn.execute("ROLLBACK")
+                return False
+            now = time.time()
+            conn.executemany("INSERT OR IGNORE INTO fetched VALUES (?, ?)", ((i, now) for i in fetched_ids))
+            conn.executemany(
+                "INSERT OR REPLACE INTO progress VALUES (?, ?, ?)",
+                ((key, position, now) for key, position in progress.items()),
+            )
+            conn.execute("INSERT INTO meta VALUES ('legacy_imported', ?)", (str(now),))
+            conn.execute("COMMIT")
+            return True
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+    
+    def is_fetched(self, business_id):
+        return self.connection().execute(
+            "SELECT 1 FROM fetched WHERE business_id = ?", (business_id,)
+        ).fetchone() is not None
+    
+    def contains_fragment(self, fragment):
+        """Whether any fetched ID contains the fragment (full scan)"""
+        return self.connection().execute(
+            "SELECT 1 FROM fetched WHERE instr(business_id, ?) > 0 LIMIT 1", (fragment,)
+        ).fetchone() is not None
+    
+    def claim(self, business_id):
+        """Mark an ID as fetched; True only for the caller that marked it first"""
+        cursor = self.connection().execute(
+            "INSERT OR IGNORE INTO fetched VALUES (?, ?)", (business_id, time.time())
+        )
+        return cursor.rowcount == 1
+    
+    def fetched_ids(self):
+        return [row[0] for row in self.connection().execute("SELECT business_id FROM fetched")]
+    
+    def fetched_count(self):
+        return self.connection().execute("SELECT COUNT(*) FROM fetched").fetchone()[0]
+    
+    def get_position(self, search_key):
+        row = self.connection().execute(
+            "SELECT position FROM progress WHERE search_key = ?", (search_key,)
+        ).fetchone()
+        return row[0] if row else 0
+    
+    def set_position(self, search_key, position):
+        """Store a position; a concurrent run that got further keeps its position"""
+        self.connection().execute(
+            "INSERT INTO progress VALUES (?, ?, ?) ON CONFLICT(search_key) DO UPDATE SET "
+            "position = MAX(position, excluded.position), updated_at = excluded.updated_at",
+            (search_key, position, time.time()),
+        )
+    
+    def positions(self):
+        return dict(self.connection().execute("SELECT search_key, position FROM progress"))
+    
+    def add_retry(self, search_key, href, label, attempts, next_retry_at, error):
+        self.connection().execute(
+            "INSERT OR REPLACE INTO retries VALUES (?, ?, ?, ?, ?, ?)",
+            (href, search_key, label, attempts, next_retry_at, error),
+        )
+    
+    def claim_retries(self, search_key, now):
+        """Take (href, label, attempts) of the search's due retries out of the store"""
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            rows = conn.execute(
+                "SELECT href, label, attempts FROM retries WHERE search_key = ? AND next_retry_at <= ? "
+                "ORDER BY next_retry_at", (search_key, now),
+            ).fetchall()
+            conn.executemany(
+                "DELETE FROM retries WHERE search_key = ? AND href = ?", ((search_key, row[0]) for row in rows)
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        return rows
+    
+    def next_retry_at(self, search_key):
+        """When the search's next queued retry is due, or None"""
+        return self.connection().execute(
+            "SELECT MIN(next_retry_at) FROM retries WHERE search_key = ?", (search_key,)
+        ).fetchone()[0]
+    
+    def record_place(self, place_url, business_id, scraped_at):
+        self.connection().execute(
+            "INSERT OR REPLACE INTO places VALUES (?, ?, ?)", (place_url, business_id, scraped_at)
+        )
+    
+    def stale_places(self, scraped_before, limit):
+        """(place_url, business_id) of places last scraped before the given time, oldest first"""
+        return self.connection().execute(
+            "SELECT place_url, business_id FROM places WHERE scraped_at < ? ORDER BY scraped_at LIMIT ?",
+            (scraped_before, limit),
+        ).fetchall()
+    
+    def get_result_set(self, search_key):
+        """(cached_at, complete, [[place_id, name], ...]) of a search, or None"""
+        row = self.connection().execute(
+            "SELECT cached_at, complete, places FROM result_sets WHERE search_key = ?", (search_key,)
+        ).fetchone()
+        return (row[0], bool(row[1]), json.loads(row[2])) if row else None
+    
+    def set_result_set(self, search_key, cached_at, complete, places):
+        self.connection().execute(
+            "INSERT OR REPLACE INTO result_sets VALUES (?, ?, ?, ?)",
+            (search_key, cached_at, int(complete), json.dumps(places)),
+        )
+    
+    def clear_fetched(self):
+        self.connection().execute("DELETE FROM fetched")
+        self.connection().execute("DELETE FROM result_sets")
+    
+    def clear_progress(self):
+        self.connection().execute("DELETE FROM progress")
+        self.connection().execute("DELETE FROM result_sets")
+
 class ContactManager:
-    """Manages fetched contacts and prevents duplicates"""
+    """Manages fetched contacts and prevents duplicates
+    
+    Fetched IDs and search positions live in a shared ContactStore, so
+    parallel main.py processes see each other's marks right away. The
+    JSON cache and progress files are kept as snapshots for the
+    interactive menu and are imported into the store on first use.
     
-    def __init__(self, cache_file="fetched_contacts.json", search_progress_file="search_progress.json"):
+    Search progress is keyed by canonical query (see QueryNormalizer), so
+    spelling variants of the same search resume from the same position and
+    share the set of names already seen in this session.
+    """
+    
+    def __init__(self, cache_file="fetched_contacts.json", search_progress_file="search_progress.json",
+                 alias_file="query_aliases.json", db_file="scraper_state.db"):
         self.cache_file = cache_file
         self.search_progress_file = search_progress_file
-        self.fetched_contacts = self.load_cache()
-        self.search_progress = self.load_search_progress()
+        self.store = ContactStore(db_file)
+        raw_progress = self.load_search_progress()
+        self.normalizer = QueryNormalizer(alias_file, known_queries=raw_progress.keys())
+        if self.store.import_legacy(self.load_cache(), self.fold_search_progress(raw_progress)):
+            print(f"Imported {self.cache_file} and {self.search_progress_file} into {db_file}")
+        self.seen_names = {}
     
     def load_cache(self):
         """Load previously fetched contacts from cache file"""
@@ -150,41 +593,960 @@ class ContactManager:
                 return {}
         return {}
     
+    def fold_search_progress(self, progress):
+        """Merge progress entries of spelling variants (furthest position wins)"""
+        folded = {}
+        for search_query, position in progress.items():
+            search_query, _, tile = search_query.partition(" @")
+            key = self.progress_key(search_query, f"@{tile}" if tile else None)
+            folded[key] = max(folded.get(key, 0), position)
+        return folded
+    
+    def progress_key(self, search_query, scope=None):
+        """Progress key: canonical query, plus a map tile when given"""
+        key = self.canonical_query(search_query)
+        return f"{key} {scope}" if scope else key
+    
+    def canonical_query(self, search_query):
+        """Canonical key shared by spelling variants of a query"""
+        return self.normalizer.canonical(search_query)
+    
+    def spelling_suggestions(self, search_query):
+        """Known tokens this query's unknown tokens may be typos of (checked before learning it)"""
+        return self.normalizer.suggestions(search_query)
+    
+    @staticmethod
+    def write_snapshot(path, data):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    
     def save_cache(self):
-        """Save fetched contacts to cache file"""
-        with open(self.cache_file, 'w') as f:
-            json.dump(list(self.fetched_contacts), f)
+        """Write a snapshot of the fetched contacts to the cache file"""
+        self.write_snapshot(self.cache_file, self.store.fetched_ids())
     
     def save_search_progress(self):
-        """Save search progress to file"""
-        with open(self.search_progress_file, 'w') as f:
-            json.dump(self.search_progress, f)
+        """Write a snapshot of the search progress to the progress file"""
+        self.write_snapshot(self.search_progress_file, self.store.positions())
+    
+    def clear_cache(self):
+        """Forget all fetched contacts"""
+        self.store.clear_fetched()
+        self.save_cache()
+    
+    def clear_search_progress(self):
+        """Start every search from the beginning"""
+        self.store.clear_progress()
+        if os.path.exists(self.search_progress_file):
+            os.remove(self.search_progress_file)
     
     def is_already_fetched(self, business_id):
         """Check if business was already fetched"""
-        return business_id in self.fetched_contacts
+        return self.store.is_fetched(business_id)
+    
+    def is_likely_fetched(self, name_id):
+        """Quick check whether a fetched ID contains this listing's name"""
+        return self.store.contains_fragment(name_id)
     
     def mark_as_fetched(self, business_id):
-        """Mark business as fetched"""
-        self.fetched_contacts.add(business_id)
+        """Mark business as fetched; False if it was already marked (by any process)"""
+        return self.store.claim(business_id)
     
-    def get_last_position(self, search_query):
+    def get_last_position(self, search_query, scope=None):
         """Get the last scroll position for a search query"""
-        return self.search_progress.get(search_query, 0)
+        return self.store.get_position(self.progress_key(search_query, scope))
     
-    def update_search_position(self, search_query, position):
+    def update_search_position(self, search_query, position, scope=None):
         """Update the last successful position for a search query"""
-        self.search_progress[search_query] = position
+        self.store.set_position(self.progress_key(search_query, scope), position)
+    
+    def queue_retry(self, search_query, item, attempts, error, backoff_seconds, scope=None):
+        """Keep a listing that failed extraction for a retry by place URL after backoff"""
+        next_retry_at = time.time() + backoff_seconds * 2 ** (attempts - 1)
+        self.store.add_retry(self.progress_key(search_query, scope), item.href, item.label,
+                             attempts, next_retry_at, str(error)[:200])
+    
+    def claim_retries(self, search_query, scope=None):
+        """Due retries of a search as (FeedItem, failed attempts) pairs, removed from the store"""
+        rows = self.store.claim_retries(self.progress_key(search_query, scope), time.time())
+        return [(FeedItem(href, -1, None, label), attempts) for href, label, attempts in rows]
+    
+    def next_retry_at(self, search_query, scope=None):
+        return self.store.next_retry_at(self.progress_key(search_query, scope))
+    
+    def record_place(self, business):
+        """Remember when a place was scraped, for refresh runs"""
+        if business.place_url:
+            self.store.record_place(business.place_url, business.get_unique_id(), time.time())
+    
+    def stale_places(self, max_age_days, limit):
+        """(place_url, business_id) of up to limit places scraped more than max_age_days ago"""
+        return self.store.stale_places(time.time() - max_age_days * 86400, limit)
+    
+    def get_result_set(self, search_query, scope=None, max_age_hours=0):
+        """A search's cached result set if younger than max_age_hours, else None
+        
+        Returns {"cached_at", "complete", "places": [[place_id, name], ...]}
+        with places in feed order.
+        """
+        if max_age_hours <= 0:
+            return None
+        cached = self.store.get_result_set(self.progress_key(search_query, scope))
+        if cached is None or time.time() - cached[0] > max_age_hours * 3600:
+            return None
+        cached_at, complete, places = cached
+        return {"cached_at": cached_at, "complete": complete, "places": places}
+    
+    def save_result_set(self, search_query, places, complete, cached_at=None, scope=None):
+        """Store a search's result set; cached_at (default now) is when the feed was last fully read"""
+        self.store.set_result_set(self.progress_key(search_query, scope), cached_at or time.time(), complete, places)
+    
+    def get_seen_names(self, search_query):
+        """Names already seen this session for a query and its variants"""
+        return self.seen_names.setdefault(self.canonical_query(search_query), set())
     
     def get_stats(self):
         """Get statistics about fetched contacts"""
-        return len(self.fetched_contacts)
+        return self.store.fetched_count()
+
+@contextmanager
+def file_lock(path):
+    """Hold an exclusive OS lock on path + ".lock" (across processes and threads)"""
+    with open(f"{path}.lock", 'a+') as f:
+        if os.name == 'nt':
+            import msvcrt
+            while True:
+                try:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass  # LK_LOCK gives up after 10 seconds; keep waiting
+        else:
+            import fcntl
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == 'nt':
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+def update_json_file(path, modify, default):
+    """Read-modify-write a JSON file under file_lock, replacing it atomically
+    
+    modify(data) changes the loaded data (default when there is no file)
+    in place. A file that exists but cannot be parsed is left alone, so a
+    damaged file is never overwritten with nearly empty data; returns
+    False in that case.
+    """
+    with file_lock(path):
+        data = default
+        if os.path.exists(path):
+            try:
+                with open(path, 'r') as f:
+                    data = json.load(f)
+            except (OSError, ValueError) as e:
+                print(f"Not saving {path}: the file could not be read ({e})")
+                return False
+        modify(data)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+    return True
+
+class SearchStats:
+    """Persists per-search run statistics (read by the scheduler's estimator)
+
+    Format: {"terms": {canonical_query: [run, ...]}, "profiles": {...},
+    "probes": {canonical_query: probe}} where each run holds
+    duration_seconds, listings_examined, new_contacts, limit and finished_at,
+    profiles holds peak RSS per browser launch profile and probes the latest
+    --probe estimate per query.
+    Only the most recent runs per search query are kept. Writers from
+    parallel workers and processes go through update_json_file, so none
+    of them loses another's update or reads a half-written file.
+    """
+    
+    def __init__(self, stats_file="search_stats.json", max_runs_per_term=20):
+        self.stats_file = stats_file
+        self.max_runs_per_term = max_runs_per_term
+    
+    def load(self):
+        """Load statistics from file"""
+        if os.path.exists(self.stats_file):
+            try:
+                with open(self.stats_file, 'r') as f:
+                    data = json.load(f)
+                data.setdefault("terms", {})
+                return data
+            except:
+                pass
+        return {"terms": {}}
+    
+    def update(self, modify):
+        """Apply modify(data) to the stats file (see update_json_file)"""
+        def modify_stats(data):
+            data.setdefault("terms", {})
+            modify(data)
+        try:
+            update_json_file(self.stats_file, modify_stats, {"terms": {}})
+        except Exception as e:
+            print(f"Could not save search stats: {e}")
+    
+    def record_profile_peak(self, profile, workers, peak_rss_mb):
+        """Keep peak RSS per launch profile, per worker, for capacity planning"""
+        def modify(data):
+            entry = data.setdefault("profiles", {}).setdefault(profile, {"runs": 0, "max_peak_mb_per_worker": 0})
+            per_worker = peak_rss_mb / max(1, workers)
+            entry["runs"] += 1
+            entry["last_peak_mb"] = round(peak_rss_mb, 1)
+            entry["last_workers"] = workers
+            entry["max_peak_mb_per_worker"] = round(max(entry["max_peak_mb_per_worker"], per_worker), 1)
+        self.update(modify)
+    
+    def record_launch(self, mode, cold_start_seconds, startup_mb, total_mb):
+        """Keep running averages of cold-start cost per profile mode (fresh/persistent)"""
+        def modify(data):
+            entry = data.setdefault("launches", {}).setdefault(
+                mode, {"runs": 0, "avg_cold_start_seconds": 0.0, "avg_startup_mb": 0.0}
+            )
+            entry["runs"] += 1
+            runs = entry["runs"]
+            entry["avg_cold_start_seconds"] = round(entry["avg_cold_start_seconds"] + (cold_start_seconds - entry["avg_cold_start_seconds"]) / runs, 2)
+            entry["avg_startup_mb"] = round(entry["avg_startup_mb"] + (startup_mb - entry["avg_startup_mb"]) / runs, 2)
+            if total_mb is not None:
+                entry["last_total_mb"] = round(total_mb, 2)
+        self.update(modify)
+    
+    def seconds_per_listing(self, search_query):
+        """Average search seconds per listing examined in recorded runs (None without history)"""
+        runs = self.load()["terms"].get(search_query, [])
+        listings = sum(run.get("listings_examined", 0) for run in runs)
+        if not listings:
+            return None
+        return sum(run.get("duration_seconds", 0) for run in runs) / listings
+    
+    def record_probe(self, search_query, probe):
+        """Keep the latest probe of a search query (read by the scheduler's prioritizer)"""
+        def modify(data):
+            data.setdefault("probes", {})[search_query] = dict(probe, probed_at=time.time())
+        self.update(modify)
+    
+    def record_run(self, search_query, duration_seconds, listings_examined, new_contacts, limit,
+                   saturated=False, stop_reason=None):
+        """Append one search run and save (re-reads the file to keep other writers' runs)"""
+        def modify(data):
+            runs = data["terms"].setdefault(search_query, [])
+            runs.append({
+                "finished_at": time.time(),
+                "duration_seconds": round(duration_seconds, 1),
+                "listings_examined": listings_examined,
+                "new_contacts": new_contacts,
+                "limit": limit,
+                "saturated": saturated,
+                "stop_reason": stop_reason,
+            })
+            del runs[:-self.max_runs_per_term]
+        self.update(modify)
+
+class SelectorStats:
+    """Per-selector hit rates for place-pane fields, persisted between runs
+    
+    Each selector keeps decayed hit/try counts (recent results weigh more),
+    and candidates are tried best first, so a selector that stopped
+    matching after a markup change sinks below the one that still works.
+    A selector is only charged a miss on places where another selector
+    found the field; fields such as website or phone are often simply
+    absent. Each field also keeps a long-term and a recent hit rate. For
+    fields found on at least min_field_rate of places, an alert is printed
+    once per run and stored in the file when the recent rate drops below
+    alert_ratio of the long-term rate, as early warning that Google changed
+    its markup.
+    """
+    
+    def __init__(self, stats_file="selector_stats.json", decay=0.9, alert_ratio=0.3, min_tries=20,
+                 min_field_rate=0.3):
+        self.stats_file = stats_file
+        self.decay = decay
+        self.alert_ratio = alert_ratio
+        self.min_tries = min_tries
+        self.min_field_rate = min_field_rate
+        self.lock = threading.Lock()
+        self.alerted = set()
+        self.data = self.load()
+    
+    def load(self):
+        if os.path.exists(self.stats_file):
+            try:
+                with open(self.stats_file, 'r') as f:
+                    data = json.load(f)
+                data.setdefault("fields", {})
+                data.setdefault("alerts", [])
+                return data
+            except:
+                pass
+        return {"fields": {}, "alerts": []}
+    
+    def save(self):
+        with self.lock:
+            try:
+                tmp_path = f"{self.stats_file}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.data, f, indent=2)
+                os.replace(tmp_path, self.stats_file)
+            except Exception as e:
+                print(f"Could not save selector stats: {e}")
+    
+    def _field(self, field):
+        return self.data["fields"].setdefault(field, {
+            "hits": 0, "tries": 0, "recent_hits": 0.0, "recent_tries": 0.0, "selectors": {},
+        })
+    
+    def score(self, field, selector):
+        """Recent hit rate with a Laplace prior, so untried selectors start at 0.5"""
+        entry = self.data["fields"].get(field, {}).get("selectors", {}).get(selector)
+        if not entry:
+            return 0.5
+        return (entry["recent_hits"] + 1) / (entry["recent_tries"] + 2)
+    
+    def ordered(self, field, candidates):
+        """Candidates best first; ties keep the default order"""
+        with self.lock:
+            return sorted(candidates, key=lambda selector: -self.score(field, selector))
+    
+    def record(self, field, selector, hit):
+        with self.lock:
+            entry = self._field(field)["selectors"].setdefault(
+                selector, {"hits": 0, "tries": 0, "recent_hits": 0.0, "recent_tries": 0.0}
+            )
+            self._count(entry, hit)
+    
+    def _count(self, entry, hit):
+        entry["hits"] += int(hit)
+        entry["tries"] += 1
+        entry["recent_hits"] = entry["recent_hits"] * self.decay + int(hit)
+        entry["recent_tries"] = entry["recent_tries"] * self.decay + 1
+    
+    def record_field(self, field, hit):
+        """Count whether any selector found the field; alert when it stops being found"""
+        with self.lock:
+            entry = self._field(field)
+            self._count(entry, hit)
+            if hit or field in self.alerted or entry["tries"] < self.min_tries:
+                return
+            long_term = entry["hits"] / entry["tries"]
+            recent = entry["recent_hits"] / entry["recent_tries"]
+            if long_term < self.min_field_rate or recent >= long_term * self.alert_ratio:
+                return
+            self.alerted.add(field)
+            alert = {
+                "field": field,
+                "at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                "recent_hit_rate": round(recent, 3),
+                "long_term_hit_rate": round(long_term, 3),
+            }
+            self.data["alerts"] = (self.data["alerts"] + [alert])[-50:]
+        print(f"🚨 SELECTOR ALERT: '{field}' is found on {recent:.0%} of recent places "
+              f"(usually {long_term:.0%}). Google Maps markup may have changed; check FIELD_SELECTORS.")
+
+class SaturationDetector:
+    """Decides when a query's feed has stopped producing new listings
+    
+    Keeps a rolling window of listing outcomes (new vs duplicate). With a
+    uniform prior, the new-listing rate p has a Beta(k+1, n-k+1) posterior;
+    the query is saturated once P(p < min_new_rate) reaches the configured
+    confidence. When the feed itself has nearly stopped growing, the point
+    estimate of p is enough, since only a few cards are left to load.
+    A confidence of 0 disables the rule.
+    """
+    
+    def __init__(self, confidence=0.95, window=60, min_new_rate=0.05,
+                 min_feed_growth=3, growth_scrolls=3):
+        self.confidence = confidence
+        self.min_new_rate = min_new_rate
+        self.min_feed_growth = min_feed_growth
+        self.growth_scrolls = growth_scrolls
+        self.outcomes = deque(maxlen=window)
+        self.feed_sizes = []
+        self.reason = None
+    
+    def observe_listing(self, is_new):
+        """Record whether the latest examined listing was new"""
+        self.outcomes.append(1 if is_new else 0)
+    
+    def observe_feed(self, feed_size):
+        """Record the number of cards in the feed after a scroll"""
+        self.feed_sizes.append(feed_size)
+    
+    def prob_rate_below(self, threshold):
+        """Posterior probability that the new-listing rate is below threshold
+        
+        For integer Beta parameters the CDF equals a binomial tail:
+        I_x(a, b) = P(Binomial(a + b - 1, x) >= a).
+        """
+        n = len(self.outcomes)
+        k = sum(self.outcomes)
+        a, trials = k + 1, n + 1
+        return sum(
+            math.comb(trials, j) * threshold ** j * (1 - threshold) ** (trials - j)
+            for j in range(a, trials + 1)
+        )
+    
+    def feed_growth(self):
+        """Average number of cards added per scroll over the last few scrolls"""
+        recent = self.feed_sizes[-(self.growth_scrolls + 1):]
+        if len(recent) < 2:
+            return None
+        return (recent[-1] - recent[0]) / (len(recent) - 1)
+    
+    @property
+    def saturated(self):
+        return self.reason is not None
+    
+    def check(self):
+        """Return True (and set reason) if further scrolling is unlikely to pay off"""
+        if self.confidence <= 0 or not self.outcomes:
+            return False
+        if self.saturated:
+            return True
+        
+        probability = self.prob_rate_below(self.min_new_rate)
+        if probability >= self.confidence:
+            self.reason = (f"P(new rate < {self.min_new_rate:.0%}) = {probability:.2f} "
+                           f"over last {len(self.outcomes)} listings")
+            return True
+        
+        growth = self.feed_growth()
+        new_rate = sum(self.outcomes) / len(self.outcomes)
+        if growth is not None and growth < self.min_feed_growth and new_rate < self.min_new_rate:
+            self.reason = (f"feed growing {growth:.1f} cards/scroll with "
+                           f"{new_rate:.0%} new in last {len(self.outcomes)} listings")
+            return True
+        return False
+
+# Chromium launch profiles: "headed" is the original visible browser for
+# debugging; "headless" drops the display; "minimal" also trims caches,
+# background services and images to fit more workers on one host.
+LAUNCH_PROFILES = {
+    "headed": {
+        "headless": False,
+        "args": [],
+        "viewport": None,
+    },
+    "headless": {
+        "headless": True,
+        "args": ["--disable-gpu", "--disable-extensions"],
+        "viewport": {"width": 1280, "height": 800},
+    },
+    "minimal": {
+        "headless": True,
+        "args": [
+            "--disable-gpu",
+            "--disable-extensions",
+            "--disable-dev-shm-usage",
+            "--disk-cache-size=33554432",
+            "--media-cache-size=1",
+            "--renderer-process-limit=2",
+            "--disable-background-networking",
+            "--disable-component-update",
+            "--disable-default-apps",
+            "--disable-sync",
+            "--mute-audio",
+            "--no-first-run",
+            "--blink-settings=imagesEnabled=false",
+        ],
+        "viewport": {"width": 1024, "height": 768},
+    },
+}
+
+def launch_browser(playwright, profile_name):
+    """Launch Chromium with the given launch profile"""
+    profile = LAUNCH_PROFILES[profile_name]
+    return playwright.chromium.launch(headless=profile["headless"], args=profile["args"])
+
+def new_profile_page(browser, profile_name):
+    """Open a page with the profile's viewport (window size when None)"""
+    viewport = LAUNCH_PROFILES[profile_name]["viewport"]
+    return browser.new_page(viewport=viewport) if viewport else browser.new_page()
+
+def process_tree_rss(pid=None):
+    """Resident memory in bytes of a process and all its descendants
+    
+    Covers the Playwright driver and every Chromium process it spawned.
+    Uses psutil when installed, /proc on Linux otherwise; None if neither.
+    """
+    pid = pid or os.getpid()
+    try:
+        import psutil
+        root = psutil.Process(pid)
+        total = 0
+        for process in [root] + root.children(recursive=True):
+            try:
+                total += process.memory_info().rss
+            except psutil.Error:
+                pass
+        return total
+    except ImportError:
+        pass
+    
+    if not os.path.isdir("/proc"):
+        return None
+    children = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", 'r') as f:
+                parent = int(f.read().rsplit(")", 1)[1].split()[1])
+            children.setdefault(parent, []).append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total, stack = 0, [pid]
+    while stack:
+        current = stack.pop()
+        stack.extend(children.get(current, []))
+        try:
+            with open(f"/proc/{current}/statm", 'r') as f:
+                total += int(f.read().split()[1]) * page_size
+        except (OSError, IndexError, ValueError):
+            continue
+    return total
+
+class MemoryMonitor:
+    """Samples the scraper's process-tree RSS in the background and keeps the peak"""
+    
+    def __init__(self, interval=2.0):
+        self.interval = interval
+        self.peak_rss = 0
+        self.supported = process_tree_rss() is not None
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="memory-monitor", daemon=True)
+    
+    def _run(self):
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+    
+    def sample(self):
+        rss = process_tree_rss()
+        if rss:
+            self.peak_rss = max(self.peak_rss, rss)
+        return rss
+    
+    def start(self):
+        if self.supported:
+            self._thread.start()
+        return self
+    
+    def stop(self):
+        self._stop.set()
+        if self._thread.is_alive():
+            self._thread.join()
+        return self.peak_rss
+
+class Heartbeat:
+    """Writes each worker thread's current phase to a JSON file for a supervisor
+
+    The file holds {"pid", "updated_at", "saved_contacts", "workers":
+    {thread: {"phase", "query", "updated_at"}}}. A supervisor that sees a worker stuck in one
+    phase for longer than that phase's timeout treats the process as hung.
+    Writes go through a temp file and os.replace, and repeated beats in the
+    same phase are throttled to one write per min_interval seconds.
+    Without a path every beat is a no-op.
+    """
+
+    def __init__(self, path=None, min_interval=2.0):
+        self.path = path
+        self.min_interval = min_interval
+        self.workers = {}
+        self.saved_contacts = 0  # contacts already written to the CSV
+        self.listeners = []  # called with the phase on every beat (e.g. lease renewal)
+        self.written_at = 0
+        self.lock = threading.Lock()
+
+    def beat(self, phase, query=None):
+        """Report that the calling worker thread is alive and in the given phase"""
+        for listener in self.listeners:
+            listener(phase)
+        if not self.path:
+            return
+        now = time.time()
+        name = threading.current_thread().name
+        with self.lock:
+            previous = self.workers.get(name)
+            self.workers[name] = {"phase": phase, "query": query, "updated_at": now}
+            if previous and previous["phase"] == phase and now - self.written_at < self.min_interval:
+                return
+            self.written_at = now
+            state = {"pid": os.getpid(), "updated_at": now,
+                     "saved_contacts": self.saved_contacts, "workers": self.workers}
+            tmp_path = f"{self.path}.tmp"
+            try:
+                with open(tmp_path, 'w') as f:
+                    json.dump(state, f)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"Error writing heartbeat: {e}")
+
+class BrowserProfileManager:
+    """Hands out persistent Chromium profile directories, one per worker
+    
+    Each directory (browser_profiles/worker-N) keeps the HTTP cache, cookies
+    and consent state between runs. A worker holds an OS lock (flock, or
+    msvcrt.locking on Windows) on the directory's lock file while it uses
+    the directory; the OS drops the lock when the process dies, so a
+    crashed run's profile is free again without any stale-lock handling.
+    Cleanup (at most once a day) deletes unlocked profiles that were
+    unused for max_age_days and empties caches above max_cache_mb.
+    """
+    
+    CACHE_DIRS = ("Default/Cache", "Default/Code Cache", "Default/GPUCache", "Default/Service Worker/CacheStorage")
+    
+    def __init__(self, root="browser_profiles", max_age_days=7, max_cache_mb=500):
+        self.root = root
+        self.max_age_days = max_age_days
+        self.max_cache_mb = max_cache_mb
+        self.lock = threading.Lock()
+        self.held = {}  # profile_dir -> open lock file
+        os.makedirs(self.root, exist_ok=True)
+    
+    @staticmethod
+    def _os_lock(f):
+        """Take a non-blocking exclusive OS lock on an open file; False if another holder has it"""
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            return False
+        return True
+    
+    @staticmethod
+    def _os_unlock(f):
+        try:
+            if os.name == 'nt':
+                import msvcrt
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                import fcntl
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+        except OSError:
+            pass
+    
+    def _lock_path(self, profile_dir):
+        return f"{profile_dir}.lock"
+    
+    def _is_locked(self, profile_dir):
+        if profile_dir in self.held:
+            return True
+        try:
+            f = open(self._lock_path(profile_dir), 'r')
+        except OSError:
+            return False  # never locked
+        try:
+            if not self._os_lock(f):
+                return True
+            self._os_unlock(f)
+            return False
+        finally:
+            f.close()
+    
+    def _try_lock(self, profile_dir):
+        # The lock file is never deleted: removing it would let a process that
+        # opened the old file and one that creates a new file both get a lock
+        try:
+            f = open(self._lock_path(profile_dir), 'a+')
+        except OSError:
+            return False
+        if not self._os_lock(f):
+            f.close()
+            return False
+        f.seek(0)
+        f.truncate()
+        f.write(f"{os.getpid()}:{threading.get_ident()}")  # for humans; the OS lock is what counts
+        f.flush()
+        self.held[profile_dir] = f
+        return True
+    
+    def acquire(self):
+        """Lock and return the first free profile directory"""
+        with self.lock:
+            self.cleanup()
+            slot = 1
+            while True:
+                profile_dir = os.path.join(self.root, f"worker-{slot}")
+                if self._try_lock(profile_dir):
+                    os.makedirs(profile_dir, exist_ok=True)
+                    os.utime(profile_dir)
+                    return profile_dir
+                slot += 1
+    
+    def release(self, profile_dir):
+        """Unlock a profile directory"""
+        with self.lock:
+            f = self.held.pop(profile_dir, None)
+        if f is None:
+            return
+        self._os_unlock(f)
+        f.close()
+    
+    @staticmethod
+    def _dir_size(path):
+        total = 0
+        for dirpath, _, filenames in os.walk(path):
+            for filename in filenames:
+                try:
+                    total += os.path.getsize(os.path.join(dirpath, filename))
+                except OSError:
+                    pass
+        return total
+    
+    def cleanup(self, force=False):
+        """Delete stale profiles and trim oversized caches (daily unless forced)"""
+        marker = os.path.join(self.root, ".last_cleanup")
+        if not force and os.path.exists(marker) and time.time() - os.path.getmtime(marker) < 24 * 3600:
+            return
+        for name in os.listdir(self.root):
+            profile_dir = os.path.join(self.root, name)
+            if not os.path.isdir(profile_dir) or self._is_locked(profile_dir):
+                continue
+            if time.time() - os.path.getmtime(profile_dir) > self.max_age_days * 24 * 3600:
+                shutil.rmtree(profile_dir, ignore_errors=True)
+                print(f"Removed unused browser profile: {profile_dir}")
+                continue
+            cache_dirs = [os.path.join(profile_dir, d) for d in self.CACHE_DIRS]
+            cache_bytes = sum(self._dir_size(d) for d in cache_dirs if os.path.isdir(d))
+            if cache_bytes > self.max_cache_mb * 1024 * 1024:
+                for cache_dir in cache_dirs:
+                    shutil.rmtree(cache_dir, ignore_errors=True)
+                print(f"Trimmed browser cache of {profile_dir} ({cache_bytes / (1024 * 1024):.0f} MB)")
+        with open(marker, 'w') as f:
+            f.write(str(time.time()))
+
+class TransferMeter:
+    """Counts bytes received by a page via the Chrome DevTools protocol"""
+    
+    def __init__(self, page):
+        self.bytes_received = 0
+        try:
+            self.cdp = page.context.new_cdp_session(page)
+            self.cdp.on("Network.loadingFinished", self._on_loading_finished)
+            self.cdp.send("Network.enable")
+            self.supported = True
+        except Exception:
+            self.supported = False
+    
+    def _on_loading_finished(self, event):
+        self.bytes_received += event.get("encodedDataLength", 0)
 
 def add_random_delay(min_delay=2, max_delay=5):
     """Add random delay to avoid being detected as bot"""
     delay = random.uniform(min_delay, max_delay)
     time.sleep(delay)
 
+class SharedRateLimiter:
+    """Host-wide token bucket shared by every scraper process and worker
+    
+    The bucket lives in a small SQLite file. Each acquire takes the write
+    lock (BEGIN IMMEDIATE), refills the bucket at rate_per_minute up to
+    burst tokens and takes one, so the combined pace of all processes
+    on this machine never exceeds the ceiling. A block seen by one process
+    can pause all of them through pause().
+    """
+    
+    def __init__(self, db_file="rate_limit.db", rate_per_minute=40, burst=5, name="google_maps"):
+        self.db_file = db_file
+        self.rate_per_second = rate_per_minute / 60.0
+        self.burst = burst
+        self.name = name
+        self.waited_seconds = 0.0
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS buckets (name TEXT PRIMARY KEY, tokens REAL, "
+                "updated_at REAL, paused_until REAL DEFAULT 0)"
+            )
+        finally:
+            conn.close()
+    
+    def _connect(self):
+        return sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+    
+    def _take(self, paused_until=None):
+        """Take a token if one is available; seconds to wait otherwise"""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            row = conn.execute(
+                "SELECT tokens, updated_at, paused_until FROM buckets WHERE name = ?", (self.name,)
+            ).fetchone()
+            now = time.time()
+            tokens, updated_at, shared_pause = row if row else (self.burst, now, 0)
+            if paused_until is not None:
+                shared_pause = max(shared_pause, paused_until)
+            tokens = min(self.burst, tokens + max(0.0, now - updated_at) * self.rate_per_second)
+            wait = 0.0
+            if paused_until is None:
+                if shared_pause > now:
+                    wait = shared_pause - now
+                elif tokens >= 1:
+                    tokens -= 1
+                else:
+                    wait = (1 - tokens) / self.rate_per_second
+            conn.execute(
+                "INSERT OR REPLACE INTO buckets (name, tokens, updated_at, paused_until) VALUES (?, ?, ?, ?)",
+                (self.name, tokens, now, shared_pause),
+            )
+            conn.execute("COMMIT")
+            return wait
+        finally:
+            conn.close()
+    
+    def acquire(self, on_wait=None):
+        """Block until this caller may send a request"""
+        while True:
+            wait = self._take()
+            if wait <= 0:
+                return
+            if on_wait:
+                on_wait(wait)
+            self.waited_seconds += wait
+            time.sleep(wait)
+    
+    def pause(self, until):
+        """Hold back every process sharing the bucket until the given time"""
+        self._take(paused_until=until)
+
+class RateGovernor:
+    """Adapts request delays to how Google responds (AIMD)
+    
+    Delays are drawn from [min_delay, max_delay] scaled by scale. Every
+    clean response lowers scale by step, so the request rate creeps up.
+    Signs of throttling multiply scale by backoff. A block also pauses all
+    workers for block_pause seconds, doubling with each consecutive block
+    up to max_pause. scale stays within [floor, ceiling], and a delay
+    never goes below min_delay whatever the scale. With a shared
+    limiter every paced action also takes a token from the host-wide
+    bucket, and block pauses apply to all processes.
+    """
+    
+    def __init__(self, floor=1.0, ceiling=8.0, step=0.02, backoff=2.0,
+                 block_pause=60, max_pause=900, heartbeat=None, limiter=None):
+        self.floor = floor
+        self.ceiling = ceiling
+        self.step = step
+        self.backoff = backoff
+        self.block_pause = block_pause
+        self.max_pause = max_pause
+        self.heartbeat = heartbeat or Heartbeat()
+        self.limiter = limiter
+        self.scale = min(max(1.0, floor), ceiling)
+        self.blocks = 0
+        self.consecutive_blocks = 0
+        self.pause_until = 0
+        self.lock = threading.Lock()
+    
+    def wait(self):
+        """Sleep out a pause started by a block, then take a shared token"""
+        remaining = self.pause_until - time.time()
+        while remaining > 0:
+            self.heartbeat.beat("paused")
+            time.sleep(min(remaining, 30))
+            remaining = self.pause_until - time.time()
+        if self.limiter:
+            self.limiter.acquire(on_wait=self._on_limit_wait)
+    
+    def _on_limit_wait(self, seconds):
+        if seconds > 5:
+            self.heartbeat.beat("paused")
+    
+    def delay(self, min_delay, max_delay):
+        """Governed replacement for add_random_delay"""
+        self.wait()
+        time.sleep(max(min_delay, random.uniform(min_delay, max_delay) * self.scale))
+    
+    def success(self):
+        """A clean response: speed up a little"""
+        with self.lock:
+            self.consecutive_blocks = 0
+            self.scale = max(self.floor, self.scale - self.step)
+    
+    def slow_down(self, reason):
+        """A soft sign of throttling (e.g. an empty feed): back off without pausing"""
+        with self.lock:
+            self.scale = min(self.ceiling, self.scale * self.backoff)
+        print(f"🐢 Slowing down ({reason}). Delays now x{self.scale:.2f}")
+    
+    def blocked(self, reason):
+        """A block or CAPTCHA page: back off and pause all workers"""
+        with self.lock:
+            self.blocks += 1
+            self.consecutive_blocks += 1
+            self.scale = min(self.ceiling, self.scale * self.backoff)
+            pause = min(self.max_pause, self.block_pause * 2 ** (self.consecutive_blocks - 1))
+            self.pause_until = max(self.pause_until, time.time() + pause)
+        if self.limiter:
+            self.limiter.pause(self.pause_until)
+        print(f"🚫 Blocked ({reason}). Pausing {pause:.0f}s, delays now x{self.scale:.2f}")
+
+class ScraperBlocked(Exception):
+    """Google answered with a block, CAPTCHA or interstitial instead of results"""
+
+def detect_block(page):
+    """Reason the page shows a block, CAPTCHA or consent wall instead of Maps, or None"""
+    try:
+        url = page.url
+        if "/sorry/" in url:
+            return "unusual traffic page"
+        if url.startswith("https://consent.google."):
+            return "consent wall"
+        if page.locator('iframe[src*="recaptcha"], form#captcha-form').count():
+            return "captcha"
+        if page.get_by_text("unusual traffic from your computer network").count():
+            return "unusual traffic page"
+    except Exception:
+        return None
+    return None
+
+def dismiss_consent(page):
+    """Answer the Google consent wall; True once the page is past it"""
+    selectors = [
+        '//button[.//span[contains(text(), "Reject all")]]',
+        '//button[.//span[contains(text(), "Accept all")]]',
+        '//form[contains(@action, "consent")]//button',
+    ]
+    for selector in selectors:
+        try:
+            button = page.locator(selector).first
+            if button.count():
+                button.click()
+                page.wait_for_load_state("domcontentloaded", timeout=15000)
+                return not page.url.startswith("https://consent.google.")
+        except Exception:
+            continue
+    return False
+
+def check_for_block(page, governor):
+    """Raise ScraperBlocked if the page is blocked (consent walls are dismissed first)"""
+    reason = detect_block(page)
+    if reason == "consent wall" and dismiss_consent(page):
+        print("Dismissed the consent wall")
+        reason = detect_block(page)
+    if reason:
+        governor.blocked(reason)
+        raise ScraperBlocked(reason)
+
 def fix_character_encoding(text):
     """Fix common character encoding issues"""
     if not text:
@@ -295,14 +1657,1936 @@ def is_valid_business_name(name):
     
     return True
 
-def main():
+@dataclass
+class MapTile:
+    """Rectangular map viewport covered by one search job"""
     
-    ########
-    # input 
-    ########
+    south: float
+    west: float
+    north: float
+    east: float
+    depth: int = 0
+    viewport_width: int = 1024
+    viewport_height: int = 768
     
-    # read search from arguments
-    parser = argparse.ArgumentParser()
+    @property
+    def center(self):
+        return (self.south + self.north) / 2, (self.west + self.east) / 2
+    
+    @property
+    def zoom(self):
+        """Largest Maps zoom level at which the whole tile fits the viewport"""
+        lat, _ = self.center
+        lng_span = max(self.east - self.west, 1e-6)
+        lat_span = max(self.north - self.south, 1e-6)
+        zoom_lng = math.log2(self.viewport_width * 360 / (256 * lng_span))
+        zoom_lat = math.log2(self.viewport_height * 360 * math.cos(math.radians(lat)) / (256 * lat_span))
+        return max(3, min(21, int(math.floor(min(zoom_lng, zoom_lat)))))
+    
+    @property
+    def key(self):
+        """Maps viewport suffix, e.g. @26.91240,75.78730,11z"""
+        lat, lng = self.center
+        return f"@{lat:.5f},{lng:.5f},{self.zoom}z"
+    
+    def search_url(self, search_query):
+        """Maps search URL restricted to this viewport"""
+        return f"{maps_search_url(search_query)}{self.key}"
+    
+    def subdivide(self):
+        """Split into four quadrant tiles one zoom level deeper"""
+        lat, lng = self.center
+        return [
+            MapTile(south, west, north, east, self.depth + 1, self.viewport_width, self.viewport_height)
+            for south, north in ((self.south, lat), (lat, self.north))
+            for west, east in ((self.west, lng), (lng, self.east))
+        ]
+
+class TilePlanner:
+    """Splits a region into a grid of viewport tiles
+    
+    A region is either a known name (see REGIONS) or an explicit bounding
+    box "south,west,north,east". density is the number of tiles per side.
+    """
+    
+    REGIONS = {
+        "delhi": (28.40, 76.84, 28.88, 77.35),
+        "rajasthan": (23.03, 69.48, 30.20, 78.27),
+        "gujarat": (20.12, 68.16, 24.71, 74.48),
+        "maharashtra": (15.60, 72.64, 22.03, 80.90),
+    }
+    
+    def __init__(self, density=4, viewport_width=1024, viewport_height=768):
+        self.density = max(1, density)
+        self.viewport_width = viewport_width
+        self.viewport_height = viewport_height
+    
+    def parse_region(self, region):
+        """Return (south, west, north, east) for a region name or bounding box"""
+        name = region.strip().lower()
+        if name in self.REGIONS:
+            return self.REGIONS[name]
+        try:
+            south, west, north, east = (float(part) for part in name.split(","))
+        except ValueError:
+            known = ", ".join(sorted(self.REGIONS))
+            raise ValueError(f"Unknown region '{region}'. Use one of: {known}, or 'south,west,north,east'")
+        if south >= north or west >= east:
+            raise ValueError(f"Invalid bounding box '{region}'")
+        return south, west, north, east
+    
+    def plan(self, region):
+        """Tiles covering the region, row by row from the south-west corner"""
+        south, west, north, east = self.parse_region(region)
+        lat_step = (north - south) / self.density
+        lng_step = (east - west) / self.density
+        return [
+            MapTile(
+                south + row * lat_step, west + col * lng_step,
+                south + (row + 1) * lat_step, west + (col + 1) * lng_step,
+                0, self.viewport_width, self.viewport_height,
+            )
+            for row in range(self.density)
+            for col in range(self.density)
+        ]
+
+@dataclass
+class SearchJob:
+    """One unit of scraping work: a query, optionally limited to a map tile"""
+    
+    search_query: str
+    tile: MapTile = None
+    
+    def progress_scope(self):
+        """Tiles keep their own scroll position next to the query's"""
+        return self.tile.key if self.tile else None
+    
+    def label(self):
+        return f"{self.search_query} {self.tile.key}" if self.tile else self.search_query
+
+class SearchJobQueue:
+    """Thread-safe queue of search jobs shared by scraper workers
+    
+    Workers may add follow-up jobs (subdivided tiles) when they finish one,
+    so get() waits while other workers are still busy instead of returning
+    None as soon as the queue is momentarily empty. A failed job goes to
+    the back of the queue until it has failed max_attempts times.
+    """
+    
+    def __init__(self, jobs, max_attempts=3):
+        self.pending = deque(jobs)
+        self.max_attempts = max_attempts
+        self.attempts = {}  # job label -> failed attempts
+        self.failed = []  # labels of jobs given up on
+        self.active = 0
+        self.issued = 0
+        self.closed = False
+        self.condition = threading.Condition()
+        self.local = threading.local()  # job handed to the calling worker
+    
+    def get(self):
+        """Next (index, job), or None when all work is done or the queue is closed"""
+        with self.condition:
+            while not self.pending and self.active and not self.closed:
+                self.condition.wait()
+            if self.closed or not self.pending:
+                return None
+            self.active += 1
+            self.issued += 1
+            self.local.job = self.pending.popleft()
+            return self.issued - 1, self.local.job
+    
+    def task_done(self, follow_ups=(), front=False, failed=False):
+        """Mark the current job finished and queue its follow-up jobs
+        
+        A failed job is queued again at the back until it has failed
+        max_attempts times; front puts the follow-ups (e.g. the job itself
+        after a recycle) ahead of the pending jobs.
+        """
+        job, self.local.job = self.local.job, None
+        with self.condition:
+            if failed:
+                label = job.label()
+                self.attempts[label] = self.attempts.get(label, 0) + 1
+                if self.attempts[label] < self.max_attempts:
+                    print(f"Queued '{label}' again after a failure ({self.attempts[label]}/{self.max_attempts})")
+                    self.pending.append(job)
+                else:
+                    print(f"❌ Giving up on '{label}' after {self.attempts[label]} failed attempts")
+                    self.failed.append(label)
+            elif front:
+                self.pending.extendleft(reversed(list(follow_ups)))
+            else:
+                self.pending.extend(follow_ups)
+            self.active -= 1
+            self.condition.notify_all()
+    
+    def remaining(self):
+        """Jobs not finished yet: queued plus in progress"""
+        with self.condition:
+            return len(self.pending) + self.active
+    
+    def workers(self, local_workers):
+        """Workers sharing the remaining jobs (only this process's)"""
+        return local_workers
+    
+    def close(self):
+        """Stop handing out jobs (e.g. once the contact limit is reached)"""
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+
+class SQLiteJobStore:
+    """Search jobs with leases in a SQLite file, shared by any number of workers
+    
+    A job is pending, leased (to one worker until lease_until), done or
+    failed. A lease that is not renewed expires and the job becomes
+    claimable again, so a crashed worker's job is reclaimed by the next
+    claim; after max_attempts claims it is marked failed. Jobs are unique
+    per queue by label, so several hosts can enqueue the same searches.
+    LeasedJobQueue only uses add/claim/renew/finish/release/counts, so a
+    store on a shared database can replace this one.
+    """
+    
+    def __init__(self, db_file="jobs.db", queue_name="default"):
+        self.db_file = db_file
+        self.queue_name = queue_name
+        self.local = threading.local()
+        conn = self.connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs (id INTEGER PRIMARY KEY, queue TEXT, job_key TEXT, payload TEXT, "
+            "state TEXT DEFAULT 'pending', worker TEXT, lease_until REAL DEFAULT 0, attempts INTEGER DEFAULT 0, "
+            "priority INTEGER DEFAULT 0, updated_at REAL, UNIQUE(queue, job_key))"
+        )
+    
+    def connection(self):
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_file, timeout=30, isolation_level=None)
+            self.local.conn = conn
+        return conn
+    
+    @contextmanager
+    def transaction(self):
+        conn = self.connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    @staticmethod
+    def encode(job):
+        tile = asdict(job.tile) if job.tile else None
+        return json.dumps({"search_query": job.search_query, "tile": tile})
+    
+    @staticmethod
+    def decode(payload):
+        data = json.loads(payload)
+        return SearchJob(data["search_query"], MapTile(**data["tile"]) if data["tile"] else None)
+    
+    def _insert(self, conn, jobs, priority=0):
+        added = 0
+        for job in jobs:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO jobs (queue, job_key, payload, priority, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (self.queue_name, job.label(), self.encode(job), priority, time.time()),
+            )
+            added += cursor.rowcount
+        return added
+    
+    def add(self, jobs, requeue_finished_before=None):
+        """Queue jobs not already in the queue; returns how many were added
+        
+        With requeue_finished_before, done and failed jobs that finished
+        before that time (a previous run) are queued again.
+        """
+        with self.transaction() as conn:
+            if requeue_finished_before is not None:
+                keys = [job.label() for job in jobs]
+                conn.executemany(
+                    "UPDATE jobs SET state = 'pending', attempts = 0, priority = 0 "
+                    "WHERE queue = ? AND job_key = ? AND state IN ('done', 'failed') AND updated_at < ?",
+                    ((self.queue_name, key, requeue_finished_before) for key in keys),
+                )
+            return self._insert(conn, jobs)
+    
+    def claim(self, worker, lease_seconds, max_attempts):
+        """Lease the next claimable job to worker: (job_id, job) or None"""
+        with self.transaction() as conn:
+            while True:
+                now = time.time()
+                row = conn.execute(
+                    "SELECT id, payload, attempts FROM jobs WHERE queue = ? AND "
+                    "(state = 'pending' OR (state = 'leased' AND lease_until < ?)) "
+                    "ORDER BY priority DESC, id LIMIT 1",
+                    (self.queue_name, now),
+                ).fetchone()
+                if row is None:
+                    return None
+                job_id, payload, attempts = row
+                if attempts >= max_attempts:
+                    conn.execute("UPDATE jobs SET state = 'failed', updated_at = ? WHERE id = ?", (now, job_id))
+                    print(f"Giving up on job {job_id} after {attempts} attempts")
+                    continue
+                conn.execute(
+                    "UPDATE jobs SET state = 'leased', worker = ?, lease_until = ?, attempts = attempts + 1, "
+                    "updated_at = ? WHERE id = ?",
+                    (worker, now + lease_seconds, now, job_id),
+                )
+                return job_id, self.decode(payload)
+    
+    def renew(self, job_id, worker, lease_seconds):
+        """Extend a lease; False if the worker no longer holds it"""
+        now = time.time()
+        cursor = self.connection().execute(
+            "UPDATE jobs SET lease_until = ?, updated_at = ? WHERE id = ? AND worker = ? AND state = 'leased'",
+            (now + lease_seconds, now, job_id, worker),
+        )
+        return cursor.rowcount == 1
+    
+    def finish(self, job_id, worker, follow_ups=()):
+        """Mark a leased job done and queue its follow-up jobs"""
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET state = 'done', lease_until = 0, updated_at = ? WHERE id = ? AND worker = ?",
+                (time.time(), job_id, worker),
+            )
+            self._insert(conn, follow_ups)
+    
+    def release(self, job_id, worker, front=False, count_attempt=True):
+        """Give a leased job back to the queue, at the front if asked"""
+        with self.transaction() as conn:
+            priority = 0
+            if front:
+                priority = conn.execute(
+                    "SELECT COALESCE(MAX(priority), 0) + 1 FROM jobs WHERE queue = ?", (self.queue_name,)
+                ).fetchone()[0]
+            conn.execute(
+                "UPDATE jobs SET state = 'pending', lease_until = 0, priority = ?, updated_at = ?, "
+                "attempts = attempts - ? WHERE id = ? AND worker = ?",
+                (priority, time.time(), 0 if count_attempt else 1, job_id, worker),
+            )
+    
+    def active_workers(self):
+        """Number of workers (on any host) holding an unexpired lease"""
+        return self.connection().execute(
+            "SELECT COUNT(DISTINCT worker) FROM jobs WHERE queue = ? AND state = 'leased' AND lease_until > ?",
+            (self.queue_name, time.time()),
+        ).fetchone()[0]
+    
+    def counts(self):
+        """Number of jobs per state ('leased' includes expired leases)"""
+        rows = self.connection().execute(
+            "SELECT state, COUNT(*) FROM jobs WHERE queue = ? GROUP BY state", (self.queue_name,)
+        )
+        return dict(rows)
+
+class LeasedJobQueue:
+    """SearchJobQueue interface over a SQLiteJobStore shared across processes and hosts
+    
+    Leases are renewed from the worker's own heartbeats, so a worker that
+    hangs stops renewing and its job is reclaimed once the lease expires.
+    get() waits while other workers still hold leases, because their jobs
+    may produce follow-ups or come back after a crash.
+    """
+    
+    def __init__(self, store, lease_seconds=600, max_attempts=3, heartbeat=None, poll_interval=5):
+        self.store = store
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.poll_interval = poll_interval
+        self.heartbeat = heartbeat or Heartbeat()
+        self.heartbeat.listeners.append(self.renew_lease)
+        self.issued = 0
+        self.closed = False
+        self.lock = threading.Lock()
+        self.local = threading.local()
+    
+    @staticmethod
+    def worker_id():
+        return f"{socket.gethostname()}:{os.getpid()}:{threading.current_thread().name}"
+    
+    def get(self):
+        """Next (index, job), or None when all work is done or the queue is closed"""
+        while not self.closed:
+            claimed = self.store.claim(self.worker_id(), self.lease_seconds, self.max_attempts)
+            if claimed:
+                self.local.job_id, job = claimed
+                self.local.renewed_at = time.time()
+                with self.lock:
+                    self.issued += 1
+                    return self.issued - 1, job
+            if not self.store.counts().get("leased"):
+                return None
+            self.heartbeat.beat("idle")
+            time.sleep(self.poll_interval)
+        return None
+    
+    def renew_lease(self, phase):
+        """Heartbeat listener: keep the calling worker's lease alive"""
+        job_id = getattr(self.local, "job_id", None)
+        if job_id is None or time.time() - self.local.renewed_at < self.lease_seconds / 3:
+            return
+        self.local.renewed_at = time.time()
+        if not self.store.renew(job_id, self.worker_id(), self.lease_seconds):
+            print(f"⚠️ Lost the lease on job {job_id}; another worker may have taken it over")
+    
+    def task_done(self, follow_ups=(), front=False, failed=False):
+        """Finish, requeue (front) or release a failed job for another attempt"""
+        job_id, self.local.job_id = self.local.job_id, None
+        if failed:
+            self.store.release(job_id, self.worker_id())
+        elif front:
+            self.store.release(job_id, self.worker_id(), front=True, count_attempt=False)
+        else:
+            self.store.finish(job_id, self.worker_id(), follow_ups)
+    
+    def remaining(self):
+        """Jobs not finished yet: pending plus leased, across all workers of the queue"""
+        counts = self.store.counts()
+        return counts.get("pending", 0) + counts.get("leased", 0)
+    
+    def workers(self, local_workers):
+        """Workers sharing the remaining jobs: every lease holder on any host, at least our own"""
+        return max(local_workers, self.store.active_workers())
+    
+    def close(self):
+        """Stop claiming jobs in this process"""
+        self.closed = True
+
+class ScrapeSession:
+    """State shared by all searches of one main.py run
+    
+    Worker threads share the contact cache and the overall limit; lock
+    guards the cache, the counters and all file writes.
+    """
+    
+    def __init__(self, args, contact_manager, search_stats):
+        self.args = args
+        self.contact_manager = contact_manager
+        self.search_stats = search_stats
+        self.limit = args.limit
+        self.total_new_contacts = 0
+        self.lock = threading.RLock()
+        self.profile_manager = None
+        if args.persistent_profile:
+            self.profile_manager = BrowserProfileManager(
+                args.profile_dir, args.profile_max_age_days, args.profile_max_cache_mb
+            )
+        self.cold_starts = []  # (seconds to first results, bytes by then) per worker
+        self.bytes_transferred = 0
+        self.transfer_measured = False
+        self.recycles = 0
+        self.retries_attempted = 0
+        self.retries_recovered = 0
+        self.job_failures = 0
+        self.probes = []  # (label, probe) per probed search
+        self.recycle_policy = RecyclePolicy(
+            args.recycle_after_listings, args.recycle_after_minutes, args.recycle_rss_mb,
+            args.recycle_level, max(1, args.workers),
+        )
+        self.worker = threading.local()  # per-thread browser state
+        self.started_at = time.time()
+        self.deadline = run_deadline(args, self.started_at)
+        self.heartbeat = Heartbeat(args.heartbeat_file)
+        self.selector_stats = SelectorStats()
+        self.archive = PlaceArchive(args.archive_dir) if args.archive_pages else None
+        floor, ceiling = (1.0, 1.0) if args.fixed_delays else (args.governor_floor, args.governor_ceiling)
+        limiter = None
+        if args.global_rate > 0:
+            limiter = SharedRateLimiter(args.rate_limit_db, args.global_rate, args.global_burst)
+        self.governor = RateGovernor(
+            floor, ceiling, block_pause=args.block_pause, heartbeat=self.heartbeat, limiter=limiter
+        )
+    
+    def start_worker(self, launch_seconds, browser_worker):
+        """Register the calling worker thread's browser launch"""
+        self.worker.launch_seconds = launch_seconds
+        self.worker.browser = browser_worker
+        self.worker.cold_start_recorded = False
+    
+    def mark_results_ready(self, seconds):
+        """Record launch-to-first-results time once per worker"""
+        worker = self.worker
+        if getattr(worker, "cold_start_recorded", True):
+            return
+        worker.cold_start_recorded = True
+        with self.lock:
+            self.cold_starts.append((worker.launch_seconds + seconds, worker.browser.total_bytes_received() or 0))
+    
+    def note_listing_processed(self):
+        """Count a processed listing towards the worker's recycle limit"""
+        browser_worker = getattr(self.worker, "browser", None)
+        if browser_worker is not None:
+            browser_worker.listings_processed += 1
+    
+    def recycle_due(self):
+        """Reason the calling worker's browser should be recycled, or None"""
+        browser_worker = getattr(self.worker, "browser", None)
+        if browser_worker is None or not self.recycle_policy.enabled:
+            return None
+        return self.recycle_policy.reason(browser_worker)
+    
+    def record_transfer(self, bytes_received, recycles=0):
+        """Add a worker's total received bytes (None if unmeasured) and recycle count"""
+        with self.lock:
+            self.recycles += recycles
+            if bytes_received is not None:
+                self.bytes_transferred += bytes_received
+                self.transfer_measured = True
+    
+    def time_left(self):
+        """Seconds until the run's deadline (None without a time budget)"""
+        if self.deadline is None:
+            return None
+        return self.deadline - time.time()
+    
+    def job_deadline(self, remaining_jobs, workers=None):
+        """Deadline for the next job: its share of the time left
+        
+        The time left is split evenly over the unfinished jobs, counting
+        the workers that share them (by default this process's), so a job
+        that finishes early leaves its unused time to the jobs after it.
+        """
+        time_left = self.time_left()
+        if time_left is None:
+            return None
+        workers = max(1, workers or self.args.workers)
+        share = time_left * workers / max(1, remaining_jobs)
+        return time.time() + min(time_left, share)
+    
+    def remaining(self):
+        with self.lock:
+            return self.limit - self.total_new_contacts
+    
+    def limit_reached(self):
+        return self.remaining() <= 0
+    
+    def follow_up_jobs(self, job, result):
+        """Subdivide a tile whose feed ended at the Maps result cap"""
+        if job.tile is None or not result:
+            return []
+        if result.get("stop_reason") != "end_of_feed" or result["feed_size"] < self.args.tile_cap:
+            return []
+        if job.tile.depth >= self.args.max_tile_depth:
+            print(f"Tile {job.tile.key} hit the result cap at max depth {self.args.max_tile_depth}")
+            return []
+        print(f"Tile {job.tile.key} hit the result cap ({result['feed_size']}). Subdividing into 4 tiles.")
+        return [SearchJob(job.search_query, child) for child in job.tile.subdivide()]
+
+PLACE_LINK_XPATH = '//a[contains(@href, "https://www.google.com/maps/place")]'
+
+# Candidate selectors per field, in their default order (SelectorStats reorders them)
+FIELD_SELECTORS = {
+    "name": [
+        '//h1[contains(@class, "DUwDvf")]',
+        '//h1[@data-attrid="title"]',
+        '//div[contains(@class, "lMbq3e")]//div[contains(@class, "fontHeadlineSmall")]',
+        '//div[contains(@class, "x3AX1-LfntMc-header-title")]//span',
+        '//h1[contains(@class, "fontHeadlineLarge")]',
+        '//div[@role="main"]//h1',
+        '//div[contains(@class, "SPZz6b")]//h1'
+    ],
+    "address": ['//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]'],
+    "website": ['//a[@data-item-id="authority"]//div[contains(@class, "fontBodyMedium")]'],
+    "phone_number": ['//button[contains(@data-item-id, "phone:tel:")]//div[contains(@class, "fontBodyMedium")]'],
+    "reviews_count": [
+        '//button[@jsaction="pane.reviewChart.moreReviews"]//span',
+        # Alternative selector if the primary one fails
+        '//div[contains(@class, "F7nice")]//span[contains(@aria-label, "reviews")]',
+    ],
+    "reviews_average": ['//div[@jsaction="pane.reviewChart.moreReviews"]//div[@role="img"]'],
+}
+
+class PlaceArchive:
+    """Compressed archive of raw place-pane HTML, for re-extraction without browsing
+    
+    Every extracted place pane is appended as one gzip-compressed JSON line
+    (place_url, search_query, card_label, captured_at, html). Each process
+    writes its own file per day, so parallel scrapers never share a file,
+    and a file cut short by a kill stays readable up to the last whole
+    record. replay_archive() runs the current extractors over it.
+    """
+    
+    PANE_SELECTOR = '//div[@role="main"][.//h1]'
+    
+    def __init__(self, directory="place_archive"):
+        self.directory = directory
+        self.lock = threading.Lock()
+        self.captured = 0
+    
+    def path(self):
+        return os.path.join(self.directory, f"places-{datetime.now():%Y-%m-%d}-{os.getpid()}.jsonl.gz")
+    
+    def capture(self, page, place_url, search_query, card_label=None):
+        """Archive the place pane currently open on the page"""
+        try:
+            html = page.locator(self.PANE_SELECTOR).last.evaluate("el => el.outerHTML")
+        except Exception as e:
+            print(f"Could not archive place pane: {e}")
+            return
+        record = {
+            "place_url": place_url,
+            "search_query": search_query,
+            "card_label": card_label,
+            "captured_at": time.time(),
+            "html": html,
+        }
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with self.lock:
+            os.makedirs(self.directory, exist_ok=True)
+            with gzip.open(self.path(), "ab") as f:
+                f.write(line)
+            self.captured += 1
+    
+    def _read(self):
+        """All archived records in file order"""
+        for path in sorted(Path(self.directory).glob("places-*.jsonl.gz")):
+            try:
+                with gzip.open(path, "rt", encoding="utf-8") as f:
+                    for line in f:
+                        yield json.loads(line)
+            except (OSError, EOFError, ValueError) as e:
+                print(f"Stopped reading damaged archive file {path}: {e}")
+    
+    def latest_records(self):
+        """The most recent capture of every archived place
+        
+        Reads the archive twice (first for capture times, then for the
+        records), so only one page of HTML is held in memory at a time.
+        """
+        latest = {}
+        for record in self._read():
+            key = record["place_url"] or record["html"][:200]
+            latest[key] = max(latest.get(key, 0), record["captured_at"])
+        for record in self._read():
+            key = record["place_url"] or record["html"][:200]
+            if latest.get(key) == record["captured_at"]:
+                del latest[key]
+                yield record
+
+def parse_name(text):
+    """Validated, encoding-fixed business name, or None"""
+    validation_result = is_valid_business_name(text)
+    if not validation_result:
+        return None
+    # If validation returns a cleaned name, use it
+    if isinstance(validation_result, str):
+        return fix_character_encoding(validation_result)
+    return fix_character_encoding(text)
+
+def parse_reviews_count(text):
+    # Text like "1,234 reviews" or "(1,234)"
+    review_number = ''.join(filter(str.isdigit, text.split()[0] if text.split() else ""))
+    return int(review_number) if review_number else None
+
+def parse_reviews_average(aria_label):
+    # Rating from aria-label like "4.5 stars"
+    if not aria_label:
+        return None
+    return float(aria_label.split()[0].replace(',', '.'))
+
+def read_field(page, field, parse=None, attribute=None, selector_stats=None):
+    """Value of a place-pane field from the first selector that yields one
+    
+    Selectors are tried in the order SelectorStats ranks them. When one
+    yields the value it is recorded as a hit and the ones tried before it
+    as misses; when none does, the field may just be absent from the
+    place, so no selector is charged. Returns None when every selector
+    misses.
+    """
+    candidates = FIELD_SELECTORS[field]
+    if selector_stats:
+        candidates = selector_stats.ordered(field, candidates)
+    value = None
+    missed = []
+    for selector in candidates:
+        try:
+            locator = page.locator(selector)
+            if locator.count() > 0:
+                if attribute:
+                    text = locator.first.get_attribute(attribute)
+                else:
+                    text = locator.first.inner_text().strip()
+                value = parse(text) if parse else (text or None)
+        except Exception:
+            value = None
+        if value is not None:
+            if selector_stats:
+                for missed_selector in missed:
+                    selector_stats.record(field, missed_selector, False)
+                selector_stats.record(field, selector, True)
+            break
+        missed.append(selector)
+    if selector_stats:
+        selector_stats.record_field(field, value is not None)
+    return value
+
+def extract_business(page, search_query, card_label=None, selector_stats=None, place_url=None, archive=None):
+    """Read a Business from the place pane currently open on the page
+    
+    card_label is the result card's aria-label, used as the name when no
+    name selector matches. place_url is kept so refresh runs can revisit
+    the place. With a PlaceArchive, the pane's HTML is archived first.
+    """
+    if archive:
+        archive.capture(page, place_url, search_query, card_label)
+    business = Business()
+    
+    # Set the search query for tracking
+    business.search_query = search_query
+    business.place_url = place_url
+    
+    # Extract business name with multiple fallback options and validation
+    business.name = read_field(page, "name", parse_name, selector_stats=selector_stats)
+    
+    # If no valid name found from page selectors, try aria-label
+    if not business.name and card_label:
+        business.name = parse_name(card_label)
+    
+    # Final fallback
+    if not business.name:
+        business.name = "Name not found"
+    
+    business.address = read_field(page, "address", selector_stats=selector_stats) or ""
+    business.website = read_field(page, "website", selector_stats=selector_stats) or ""
+    
+    # Extract and format phone number
+    raw_phone = read_field(page, "phone_number", selector_stats=selector_stats)
+    business.phone_number = business.format_indian_phone(raw_phone) if raw_phone else ""
+    
+    business.reviews_count = read_field(page, "reviews_count", parse_reviews_count, selector_stats=selector_stats) or 0
+    business.reviews_average = read_field(
+        page, "reviews_average", parse_reviews_average, attribute='aria-label', selector_stats=selector_stats
+    ) or 0.0
+    
+    return business
+
+def place_id(href):
+    """Stable ID of a place link: its feature ID (0x...:0x...) if present, else the URL path"""
+    match = re.search(r"!1s(0x[0-9a-f]+:0x[0-9a-f]+)", href)
+    return match.group(1) if match else href.split("?")[0]
+
+@dataclass
+class FeedItem:
+    """A place found in the results feed, waiting for detail extraction"""
+    
+    href: str
+    position: int  # feed index, for checkpoints
+    name_id: str = None
+    label: str = None
+
+class FeedReader:
+    """Producer half of the scrape pipeline: queues unseen places from the results feed
+    
+    read() takes the cards loaded since the last call, skips names seen
+    before (and, with --skip-duplicates, names already in the store) and
+    queues the rest by href, so queued places survive feed re-renders.
+    Once all loaded cards are taken it scrolls the feed without waiting;
+    the next batch loads while the consumer extracts details. The feed has
+    ended when it has not grown SETTLE_SECONDS after a scroll.
+    
+    With a cached result set (see ContactManager.get_result_set) the feed
+    is read from the top, so places new since the cache are found even if
+    they pushed the rest down, and cached places are passed over without
+    any lookups. If the cache covered the whole feed, SYNC_RUN cached
+    places in a row put the reader in sync: it skips ahead to the last
+    SYNC_RUN places of the cached list and reads from there to the end of
+    the feed, so places added at the end are found too. The middle of the
+    feed is assumed unchanged until the cache expires.
+    """
+    
+    SETTLE_SECONDS = 3
+    SYNC_RUN = 10
+    
+    def __init__(self, page, session, search_query, start_position, target, result_cache=None):
+        args = session.args
+        self.page = page
+        self.session = session
+        self.skip_duplicates = args.skip_duplicates
+        self.position = start_position
+        self.target = target
+        self.max_attempts = target * 3  # Maximum listings to examine (3x the target)
+        self.checked_names = session.contact_manager.get_seen_names(search_query)  # Shared with spelling variants
+        # Stop early once the feed only returns duplicates
+        self.saturation = SaturationDetector(
+            confidence=args.saturation_confidence,
+            window=args.saturation_window,
+            min_new_rate=args.saturation_min_rate,
+        )
+        self.emitted = 0
+        self.total_seen = 0
+        self.duplicates_skipped = 0
+        self.consecutive_duplicates = 0
+        self.feed_size = 0
+        self.previously_counted = 0
+        self.scrolled_at = None
+        self.finished = False
+        self.stop_reason = None
+        self.result_cache = result_cache
+        self.cached_ids = {place for place, _ in result_cache["places"]} if result_cache else set()
+        self.cached_hits = 0
+        self.cached_run = 0
+        self.tail_start = None  # feed position the tail check reads from, once in sync
+        self.observed = []  # [place_id, name] of every card read, in feed order
+    
+    def in_sync(self):
+        """Whether the feed has matched a complete cached result set long enough to stop"""
+        return bool(
+            self.result_cache and self.result_cache["complete"]
+            and self.tail_start is None and self.cached_run >= self.SYNC_RUN
+        )
+    
+    def check_tail(self):
+        """Skip the cached middle of the feed; read on from the last SYNC_RUN cached places"""
+        self.tail_start = max(self.position, len(self.result_cache["places"]) - self.SYNC_RUN)
+        print(f"Feed matches the cached result set ({self.cached_hits} known places). "
+              f"Checking the end of the feed for new places")
+    
+    def result_set(self, unfinished=()):
+        """(places, complete) to cache after this run
+        
+        Places still unfinished (not extracted) are left out so the next
+        run offers them again; cached places this run did not reach are
+        kept after the ones it read.
+        """
+        unfinished_ids = {place_id(item.href) for item in unfinished}
+        places = [entry for entry in self.observed if entry[0] not in unfinished_ids]
+        complete = self.stop_reason == "end_of_feed"
+        if self.result_cache:
+            read = {place for place, _ in places} | unfinished_ids
+            places += [entry for entry in self.result_cache["places"] if entry[0] not in read]
+            complete = complete or (self.stop_reason == "cache_in_sync")
+        return places, complete
+    
+    def finish(self, stop_reason, message):
+        self.finished = True
+        self.stop_reason = stop_reason
+        print(message)
+    
+    def read(self, queue, capacity):
+        """Queue unseen places until the queue holds capacity items, then scroll"""
+        cards = self.page.locator(PLACE_LINK_XPATH).all()
+        self.feed_size = len(cards)
+        self.saturation.observe_feed(self.feed_size)
+        
+        for card in cards[self.position:]:
+            if len(queue) >= capacity or self.emitted >= self.target or self.saturation.check() or self.in_sync():
+                break
+            if self.total_seen >= self.max_attempts:
+                self.finish("max_attempts", f"\nReached maximum attempts ({self.max_attempts}). Stopping collection.")
+                return
+            self.position += 1
+            self.inspect(card, queue)
+        
+        if self.in_sync():
+            self.check_tail()
+        if self.tail_start is not None and self.position < self.tail_start:
+            self.position = min(self.tail_start, self.feed_size)  # cached places; scrolled past unread
+        
+        if self.saturation.check():
+            self.finish("saturated", f"\nQuery saturated ({self.saturation.reason}). Stopping collection.")
+        elif self.emitted >= self.target:
+            self.finish(None, f"Collected {self.emitted} listings, enough for the limit")
+        elif self.position < self.feed_size:
+            return  # queue is full; loaded cards are still waiting
+        elif self.scrolled_at is None or self.feed_size > self.previously_counted:
+            self.previously_counted = self.feed_size
+            self.page.mouse.wheel(0, 10000)
+            self.scrolled_at = time.time()
+        elif time.time() - self.scrolled_at >= self.SETTLE_SECONDS:
+            if self.tail_start is not None:
+                self.finish("cache_in_sync", f"End of the feed matches the cached result set. Collected: {self.emitted}")
+            else:
+                self.finish("end_of_feed", f"Arrived at all available listings. Collected: {self.emitted}")
+    
+    def inspect(self, card, queue):
+        """Queue one result card unless it is a duplicate"""
+        # Quick duplicate check using business name from aria-label
+        try:
+            business_name = card.get_attribute('aria-label')
+            href = card.get_attribute('href')
+        except Exception:
+            return
+        if not business_name or not href:
+            return
+        
+        place = place_id(href)
+        self.observed.append([place, business_name])
+        if place in self.cached_ids:
+            self.cached_hits += 1
+            self.cached_run += 1
+            return
+        self.cached_run = 0
+        self.total_seen += 1
+        
+        # Create a simple ID for quick duplicate detection
+        simple_id = business_name.lower().strip().replace(" ", "_")
+        if simple_id in self.checked_names:
+            self.duplicates_skipped += 1
+            self.consecutive_duplicates += 1
+            self.saturation.observe_listing(False)
+            return
+        
+        # If skip-duplicates is enabled, also check cache
+        if self.skip_duplicates:
+            with self.session.lock:
+                is_likely_duplicate = self.session.contact_manager.is_likely_fetched(simple_id)
+            if is_likely_duplicate:
+                print(f"Skipping cached duplicate: {business_name[:50]}...")
+                self.duplicates_skipped += 1
+                self.consecutive_duplicates += 1
+                self.saturation.observe_listing(False)
+                
+                # If we've found too many consecutive duplicates, consider stopping
+                if self.consecutive_duplicates == 20:
+                    print(f"\nFound {self.consecutive_duplicates} consecutive duplicates. Area might be fully scraped.")
+                    print("Consider trying a different search term or location.")
+                return
+        
+        self.checked_names.add(simple_id)
+        queue.append(FeedItem(href, self.position - 1, simple_id, business_name))
+        self.emitted += 1
+        self.saturation.observe_listing(True)
+        self.consecutive_duplicates = 0  # Reset counter when we find a new listing
+        efficiency = (self.emitted / self.total_seen) * 100 if self.total_seen > 0 else 0
+        print(f"Collected: {self.emitted}/{self.target} (Efficiency: {efficiency:.1f}%) - {business_name[:50]}...")
+
+class PlacePagePool:
+    """Extracts details by opening place URLs in a few extra tabs at once
+    
+    submit() starts loading a place URL in a free tab and returns as soon
+    as the response starts, so several places load in parallel while the
+    worker thread moves on. next_result() waits for the oldest one and
+    extracts it with extract_business; a failed URL is loaded again up to
+    max_attempts times. The feed tab is never touched, so its scroll state
+    does not matter. Requests are paced by the rate governor, with each
+    tab getting 1/size of the usual delay.
+    """
+    
+    READY_SELECTOR = '//div[@role="main"]//h1'
+    
+    def __init__(self, context, session, size=3, max_attempts=2, load_timeout=20000):
+        self.context = context
+        self.session = session
+        self.args = session.args
+        self.size = max(1, size)
+        self.max_attempts = max_attempts
+        self.load_timeout = load_timeout
+        self.pages = []
+        self.idle_pages = []
+        self.in_flight = deque()  # (page, item, attempts)
+    
+    def has_room(self):
+        return len(self.in_flight) < self.size
+    
+    def busy(self):
+        return bool(self.in_flight)
+    
+    def items(self):
+        return [item for _, item, _ in self.in_flight]
+    
+    def _free_page(self):
+        if self.idle_pages:
+            return self.idle_pages.pop()
+        page = self.context.new_page()
+        self.pages.append(page)
+        return page
+    
+    def submit(self, item, attempts=0, page=None):
+        """Start loading a place URL"""
+        page = page or self._free_page()
+        self.session.governor.delay(self.args.min_delay / self.size, self.args.max_delay / self.size)
+        try:
+            page.goto(item.href, wait_until="commit", timeout=30000)
+        except Exception as e:
+            print(f"Could not open {item.label or item.href}: {e}")  # retried by next_result
+        self.in_flight.append((page, item, attempts + 1))
+    
+    def next_result(self, search_query):
+        """(item, business, error) for the oldest place; both None while the URL is retried
+        
+        Raises ScraperBlocked (keeping the place in the pool) when the tab
+        shows a block page.
+        """
+        page, item, attempts = self.in_flight.popleft()
+        try:
+            page.wait_for_selector(self.READY_SELECTOR, timeout=self.load_timeout)
+            business = extract_business(
+                page, search_query, item.label, self.session.selector_stats, item.href, self.session.archive
+            )
+        except Exception as e:
+            try:
+                check_for_block(page, self.session.governor)
+            except ScraperBlocked:
+                self.in_flight.appendleft((page, item, attempts - 1))
+                raise
+            if attempts < self.max_attempts:
+                print(f"Retrying {item.label or item.href} ({attempts}/{self.max_attempts}): {e}")
+                self.submit(item, attempts, page)
+                return item, None, None
+            self.idle_pages.append(page)
+            return item, None, e
+        self.idle_pages.append(page)
+        return item, business, None
+    
+    def drain(self):
+        """Take back the places still loading"""
+        items = self.items()
+        self.idle_pages.extend(page for page, _, _ in self.in_flight)
+        self.in_flight.clear()
+        return items
+    
+    def close(self):
+        for page in self.pages:
+            try:
+                page.close()
+            except Exception:
+                pass
+        self.pages = []
+        self.idle_pages = []
+
+DEADLINE_MARGIN_SECONDS = 15  # kept back from a deadline for the final saves
+
+def parse_deadline(value, now=None):
+    """Epoch seconds for a deadline given as HH:MM (next occurrence) or an ISO date-time"""
+    now = now or datetime.now()
+    try:
+        clock = datetime.strptime(value, "%H:%M")
+    except ValueError:
+        return datetime.fromisoformat(value).timestamp()
+    deadline = now.replace(hour=clock.hour, minute=clock.minute, second=0, microsecond=0)
+    if deadline <= now:
+        deadline += timedelta(days=1)
+    return deadline.timestamp()
+
+def deadline_arg(value):
+    """argparse type for --deadline: keeps the text, rejects what parse_deadline cannot read"""
+    try:
+        parse_deadline(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid deadline '{value}' (use HH:MM or YYYY-MM-DDTHH:MM)")
+    return value
+
+def run_deadline(args, started_at):
+    """The run's deadline from --time-budget and --deadline (earliest wins), or None"""
+    deadlines = []
+    if args.time_budget:
+        deadlines.append(started_at + args.time_budget * 60)
+    if args.deadline:
+        deadlines.append(parse_deadline(args.deadline, datetime.fromtimestamp(started_at)))
+    if not deadlines:
+        return None
+    return min(deadlines) - DEADLINE_MARGIN_SECONDS
+
+RETRY_MAX_WAIT_SECONDS = 120  # longer backoffs are left for a later run of the search
+
+def maps_search_url(search_query):
+    """Google Maps search URL for a query"""
+    return f"https://www.google.com/maps/search/{quote_plus(search_query)}/"
+
+def is_place_page(page):
+    """Whether the page shows a single place rather than a results feed"""
+    if "/maps/place/" in page.url:
+        return True
+    return page.locator('//div[@role="feed"]').count() == 0 and page.locator(PLACE_LINK_XPATH).count() == 0
+
+def open_search_results(page, job, session):
+    """Bring up the results for a job: "feed", "place" or None if the search has no results
+    
+    In "url" navigation mode (and always for map tiles) the search URL is
+    opened directly and only the first result card is awaited, so each query
+    is independent of the previous page state. "searchbox" mode types the
+    query into the search box of the already open Maps page. A query that
+    matches one place (e.g. a business name) goes straight to its place
+    page: that is "place", not an empty search. Raises ScraperBlocked when
+    Google answers with a block page.
+    """
+    args = session.args
+    governor = session.governor
+    governor.wait()
+    if job.tile or args.navigation == "url":
+        url = job.tile.search_url(job.search_query) if job.tile else maps_search_url(job.search_query)
+        page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        check_for_block(page, governor)
+        try:
+            page.wait_for_selector(f'{PLACE_LINK_XPATH} | {PlacePagePool.READY_SELECTOR}', timeout=30000)
+            if is_place_page(page):
+                governor.success()
+                return "place"
+            page.wait_for_selector(PLACE_LINK_XPATH, timeout=30000)
+        except Exception:
+            check_for_block(page, governor)
+            governor.slow_down("empty feed")
+            return None
+        governor.success()
+        return "feed"
+    
+    page.locator('//input[@id="searchboxinput"]').fill(job.search_query)
+    governor.delay(args.min_delay, args.max_delay)
+
+    page.keyboard.press("Enter")
+    governor.delay(args.min_delay, args.max_delay)
+    check_for_block(page, governor)
+    return "place" if is_place_page(page) else "feed"
+
+def scrape_search(page, job, session, job_index=0, deadline=None):
+    """Scrape one search job on the given page
+    
+    A FeedReader queues unseen listings from the results feed while their
+    details are extracted (up to --pipeline-depth places ahead), either by
+    clicking the cards or, in "url" detail mode, through a PlacePagePool; then
+    contacts, cache, progress and run statistics are saved. At the deadline
+    (epoch seconds) the search stops and checkpoints. Returns a result
+    dict (new_contacts, listings_examined, feed_size, saturated, stop_reason,
+    results_ready_seconds), or None if the overall limit was already reached.
+    """
+    args = session.args
+    contact_manager = session.contact_manager
+    search_stats = session.search_stats
+    limit = session.limit
+    
+    search_query = job.search_query.strip()
+    suggestions = contact_manager.spelling_suggestions(search_query)
+    query_key = contact_manager.canonical_query(search_query)
+    scope = job.progress_scope()
+    stats_key = f"{query_key} {scope}" if scope else query_key
+    print(f"-----\n{job_index} - {job.label()}")
+    for token, known in suggestions.items():
+        print(f"💡 '{token}' looks like '{known}'. If it is a typo, add \"{token}\": \"{known}\" "
+              f"to {contact_manager.normalizer.alias_file} to share progress with that search")
+    if query_key != search_query.lower():
+        print(f"Canonical query: '{query_key}' (progress shared with spelling variants)")
+    search_started = time.time()
+    
+    remaining_limit = session.remaining()
+    
+    if remaining_limit <= 0:
+        print(f"Reached overall limit of {limit} contacts. Stopping.")
+        return None
+    
+    # Check if we have previous progress for this search
+    last_position = contact_manager.get_last_position(search_query, scope)
+    result_cache = contact_manager.get_result_set(search_query, scope, args.result_cache_hours)
+    if result_cache:
+        age_hours = (time.time() - result_cache["cached_at"]) / 3600
+        print(f"Using cached result set ({len(result_cache['places'])} places, {age_hours:.1f}h old); "
+              f"only places not in it are extracted")
+        last_position = 0  # read from the top to catch places that moved in ahead of known ones
+    elif last_position > 0:
+        print(f"Resuming from position {last_position} (skipping first {last_position} results)")
+    
+    session.heartbeat.beat("navigate", job.label())
+    try:
+        found_results = open_search_results(page, job, session)
+    except ScraperBlocked as e:
+        print(f"Search '{job.label()}' was blocked ({e}). It will be retried after the pause.")
+        return {"new_contacts": 0, "listings_examined": 0, "feed_size": 0,
+                "saturated": False, "stop_reason": "blocked", "results_ready_seconds": None}
+    if not found_results:
+        print(f"No results for '{job.label()}'")
+        return {"new_contacts": 0, "listings_examined": 0, "feed_size": 0,
+                "saturated": False, "stop_reason": "no_results", "results_ready_seconds": None}
+    results_ready_seconds = time.time() - search_started
+    session.mark_results_ready(results_ready_seconds)
+
+    # scrolling
+    if found_results == "feed":
+        page.hover(PLACE_LINK_XPATH)
+    
+    print(f"Remaining contacts to fetch: {remaining_limit}")
+    
+    # Pipeline: the feed reader queues unseen places while details are extracted,
+    # so the feed loads during the detail waits instead of before all of them
+    reader = FeedReader(page, session, search_query, last_position, remaining_limit, result_cache)
+    pending = deque()
+    pipeline_depth = max(1, args.pipeline_depth)
+    place_pool = None
+    if args.detail_mode == "url":
+        place_pool = PlacePagePool(page.context, session, args.detail_pages)
+        pipeline_depth = max(pipeline_depth, place_pool.size)
+    
+    business_list = BusinessList()
+    new_contacts_this_search = 0
+    skipped_duplicates = 0
+    skipped_no_phone = 0
+    extracted = 0
+    retries_queued = 0
+    retries_attempted = 0
+    retries_recovered = 0
+    stop_reason = None
+    
+    def checkpoint_position():
+        """Feed position of the first place not yet extracted"""
+        unfinished = list(pending) + (place_pool.items() if place_pool else [])
+        return min(item.position for item in unfinished) if unfinished else reader.position
+    
+    def keep_business(business):
+        """Dedup and keep an extracted business; False once the overall limit is reached"""
+        nonlocal new_contacts_this_search, skipped_duplicates, skipped_no_phone
+        
+        # A filled place pane counts as a clean response for the rate governor
+        if business.phone_number or business.address:
+            session.governor.success()
+
+        # Skip businesses without phone numbers
+        if not business.phone_number or business.phone_number.strip() == "":
+            print(f"Skipping {business.name} - No phone number available")
+            skipped_no_phone += 1
+            return True
+        
+        # Check for duplicates
+        business_id = business.get_unique_id()
+        
+        with session.lock:
+            # Mark as fetched; another process may have claimed it first
+            newly_marked = contact_manager.mark_as_fetched(business_id)
+            if args.skip_duplicates and not newly_marked:
+                print(f"Skipping duplicate: {business.name}")
+                skipped_duplicates += 1
+                return True
+            
+            session.total_new_contacts += 1
+            contact_manager.record_place(business)
+        business_list.business_list.append(business)
+        new_contacts_this_search += 1
+        
+        print(f"Processed {extracted}/{reader.emitted}: {business.name} - {business.phone_number}")
+        
+        # Periodic checkpoint, so a killed or crashed run resumes after this listing
+        if args.checkpoint_every and new_contacts_this_search % args.checkpoint_every == 0:
+            session.heartbeat.beat("save", job.label())
+            with session.lock:
+                session.heartbeat.saved_contacts += len(business_list.business_list)
+                business_list.append_to_centralized_csv()
+                business_list.business_list = []
+                contact_manager.save_cache()
+                contact_manager.update_search_position(search_query, checkpoint_position(), scope)
+                contact_manager.save_search_progress()
+        
+        # Check if we've reached our limit
+        if session.limit_reached():
+            print(f"Reached limit of {limit} contacts. Stopping.")
+            return False
+        return True
+    
+    if found_results == "place":
+        # The search opened the only matching place: extract it, there is no feed to read
+        reader.finish("single_place", f"'{job.label()}' matched a single place")
+        reader.total_seen = reader.emitted = extracted = 1
+        session.heartbeat.beat("extract", job.label())
+        try:
+            keep_business(extract_business(
+                page, search_query, None, session.selector_stats, page.url, session.archive
+            ))
+        except Exception as e:
+            print(f'Error occurred while processing the place page: {e}')
+            if args.retry_attempts > 0:
+                with session.lock:
+                    contact_manager.queue_retry(
+                        search_query, FeedItem(page.url, 0), 1, e, args.retry_backoff, scope
+                    )
+                    retries_queued += 1
+    
+    try:
+        while True:
+            if deadline and time.time() >= deadline:
+                print(f"⏰ Time budget for '{job.label()}' used up. Checkpointing at feed position {checkpoint_position() + 1}")
+                stop_reason = "time_budget"
+                break
+            if not reader.finished and len(pending) < pipeline_depth:
+                session.heartbeat.beat("collect", job.label())
+                reader.read(pending, pipeline_depth)
+            if place_pool:
+                # Keep every pool page loading a place
+                while pending and place_pool.has_room():
+                    place_pool.submit(pending.popleft())
+                has_work = place_pool.busy()
+            else:
+                has_work = bool(pending)
+            if not has_work:
+                if reader.finished:
+                    break
+                session.governor.delay(1, 3)  # Shorter delay while the feed loads
+                continue
+            
+            # Recycle the browser mid-search: rewind progress to the first unextracted listing
+            recycle_reason = session.recycle_due()
+            if recycle_reason:
+                print(f"♻️ Recycle due ({recycle_reason}). Checkpointing '{search_query}' at feed position {checkpoint_position() + 1}")
+                stop_reason = "recycle"
+                break
+            session.note_listing_processed()
+            session.heartbeat.beat("extract", job.label())
+            extracted += 1
+            
+            item = None if place_pool else pending.popleft()
+            try:
+                if place_pool:
+                    item, business, error = place_pool.next_result(search_query)
+                    if error:
+                        raise error
+                    if business is None:
+                        continue  # the pool is retrying this URL
+                else:
+                    card = page.locator(f'a[href="{item.href}"]').first
+                    if card.count() == 0:
+                        raise RuntimeError("listing is no longer in the results feed")
+                    card.locator("xpath=..").click()
+                    session.governor.delay(args.min_delay, args.max_delay)
+                    business = extract_business(
+                        page, search_query, item.label, session.selector_stats, item.href, session.archive
+                    )
+                
+                if business.name == "Name not found":
+                    print(f"⚠️ Could not extract valid name for listing {extracted}")
+                if not keep_business(business):
+                    break
+                    
+            except ScraperBlocked as e:
+                # The pool keeps the blocked place; it is resumed after the pause
+                print(f"Checkpointing '{search_query}' at feed position {checkpoint_position() + 1} ({e})")
+                stop_reason = "blocked"
+                break
+            except Exception as e:
+                block_reason = detect_block(page)
+                if block_reason:
+                    # Not a bad listing: stop here and resume this listing after the pause
+                    session.governor.blocked(block_reason)
+                    pending.appendleft(item)
+                    print(f"Checkpointing '{search_query}' at feed position {item.position + 1}")
+                    stop_reason = "blocked"
+                    break
+                print(f'Error occurred while processing listing {extracted}: {e}')
+                if args.retry_attempts > 0:
+                    # Usually a transient timeout: retry by place URL at the end of the search
+                    with session.lock:
+                        contact_manager.queue_retry(search_query, item, 1, e, args.retry_backoff, scope)
+                        retries_queued += 1
+                session.governor.delay(1, 2)  # Brief delay on error
+                # Continue to next listing instead of stopping
+    finally:
+        if place_pool:
+            # Places still loading count as unextracted
+            for item in sorted(place_pool.drain(), key=lambda queued: queued.position, reverse=True):
+                pending.appendleft(item)
+            place_pool.close()
+    
+    # Retry listings that failed mid-extraction (here or in another worker's run
+    # of this search) by place URL, waiting out short backoffs
+    if (args.retry_attempts > 0 and stop_reason not in ("recycle", "blocked", "time_budget")
+            and not session.limit_reached()):
+        retry_pool = PlacePagePool(page.context, session, size=1, max_attempts=1)
+        try:
+            while not session.limit_reached() and not (deadline and time.time() >= deadline):
+                with session.lock:
+                    due = contact_manager.claim_retries(search_query, scope)
+                    next_at = contact_manager.next_retry_at(search_query, scope)
+                if not due:
+                    if next_at is None or next_at - time.time() > RETRY_MAX_WAIT_SECONDS:
+                        break  # left for a later run of this search
+                    if deadline and next_at >= deadline:
+                        break
+                    session.heartbeat.beat("paused", job.label())
+                    time.sleep(max(0, next_at - time.time()))
+                    continue
+                for position, (item, attempts) in enumerate(due):
+                    if deadline and time.time() >= deadline:
+                        with session.lock:
+                            for left_item, left_attempts in due[position:]:
+                                contact_manager.queue_retry(search_query, left_item, left_attempts, "time budget", 0, scope)
+                        break
+                    session.heartbeat.beat("extract", job.label())
+                    retries_attempted += 1
+                    extracted += 1
+                    print(f"🔁 Retrying {item.label or item.href} (attempt {attempts + 1}/{args.retry_attempts + 1})")
+                    try:
+                        retry_pool.submit(item)
+                        item, business, error = retry_pool.next_result(search_query)
+                    except ScraperBlocked:
+                        retry_pool.drain()
+                        with session.lock:
+                            for blocked_item, blocked_attempts in due[position:]:
+                                contact_manager.queue_retry(search_query, blocked_item, blocked_attempts, "blocked", 0, scope)
+                        stop_reason = "blocked"
+                        break
+                    if business is not None:
+                        retries_recovered += 1
+                        if not keep_business(business):
+                            with session.lock:
+                                for left_item, left_attempts in due[position + 1:]:
+                                    contact_manager.queue_retry(search_query, left_item, left_attempts, "limit reached", 0, scope)
+                            break
+                    else:
+                        error = error or "place pane did not load"
+                        if attempts < args.retry_attempts:
+                            with session.lock:
+                                contact_manager.queue_retry(search_query, item, attempts + 1, error, args.retry_backoff, scope)
+                        else:
+                            print(f"❌ Giving up on {item.label or item.href} after {attempts + 1} attempts: {error}")
+                if stop_reason == "blocked":
+                    break
+        finally:
+            retry_pool.close()
+    
+    # Unextracted places are offered again when the search resumes
+    for queued in pending:
+        reader.checked_names.discard(queued.name_id)
+    if stop_reason is None:
+        stop_reason = reader.stop_reason
+    current_position = checkpoint_position()
+    total_seen = reader.total_seen
+    saturation = reader.saturation
+    feed_size = reader.feed_size
+    
+    #########
+    # output
+    #########
+    collection_efficiency = (reader.emitted / total_seen) * 100 if total_seen > 0 else 0
+    if reader.emitted == 0 and stop_reason == "cache_in_sync":
+        print(f"No new places since the cached result set")
+    elif reader.emitted == 0:
+        print(f"⚠️  WARNING: No new contacts found!")
+        print(f"   - All {total_seen} listings examined were duplicates")
+        print(f"   - This area might be fully scraped already")
+        print(f"   - Try a different search term or location")
+        print(f"   - Or use --clear-cache to start fresh")
+    elif reader.emitted < remaining_limit * 0.1:  # Less than 10% of target
+        print(f"⚠️  LOW YIELD: Only found {reader.emitted} new contacts out of {remaining_limit} requested")
+        print(f"   - Consider expanding search area or trying different keywords")
+    if saturation.saturated:
+        print(f"Saturation verdict: drained ({saturation.reason})")
+    
+    print(f"\nSearch '{search_query}' completed:")
+    print(f"  - Listings examined: {total_seen}")
+    print(f"  - Duplicates skipped during collection: {reader.duplicates_skipped}")
+    if result_cache:
+        print(f"  - Known from the cached result set: {reader.cached_hits}")
+    print(f"  - Duplicates skipped during processing: {skipped_duplicates}")
+    print(f"  - Skipped (no phone number): {skipped_no_phone}")
+    print(f"  - New contacts found: {new_contacts_this_search}")
+    print(f"  - Collection efficiency: {collection_efficiency:.1f}%")
+    print(f"  - Total new contacts so far: {session.total_new_contacts}")
+    if retries_queued or retries_attempted:
+        recovery_rate = retries_recovered / retries_attempted * 100 if retries_attempted else 0
+        print(f"  - Failed listings queued for retry: {retries_queued}")
+        print(f"  - Retries recovered: {retries_recovered}/{retries_attempted} ({recovery_rate:.0f}%)")
+    with session.lock:
+        session.retries_attempted += retries_attempted
+        session.retries_recovered += retries_recovered
+    
+    # Save to centralized CSV file
+    session.heartbeat.beat("save", job.label())
+    with session.lock:
+        if len(business_list.business_list) > 0:
+            session.heartbeat.saved_contacts += len(business_list.business_list)
+            business_list.append_to_centralized_csv()
+        elif new_contacts_this_search == 0:
+            print("No new contacts to save for this search.")
+        
+        # Save cache and progress after each search
+        contact_manager.save_cache()
+        contact_manager.update_search_position(search_query, current_position, scope)
+        contact_manager.save_search_progress()
+        if args.result_cache_hours > 0:
+            cached_places, complete = reader.result_set(pending)
+            contact_manager.save_result_set(
+                search_query, cached_places, complete, result_cache["cached_at"] if result_cache else None, scope
+            )
+        search_stats.record_run(
+            stats_key, time.time() - search_started, total_seen, new_contacts_this_search, remaining_limit,
+            saturated=saturation.saturated, stop_reason=stop_reason,
+        )
+        session.selector_stats.save()
+    
+    return {"new_contacts": new_contacts_this_search, "listings_examined": total_seen,
+            "feed_size": feed_size, "saturated": saturation.saturated, "stop_reason": stop_reason,
+            "results_ready_seconds": results_ready_seconds}
+
+PROBE_SECONDS_PER_LISTING = 8  # assumed cost per listing for queries without run history
+
+def probe_search(page, job, session, job_index=0):
+    """Estimate a search's yield from its first page of results
+    
+    Opens the search like scrape_search but only reads the names of the
+    cards loaded initially, without clicking or scrolling, and checks them
+    against the names already seen for the query and the contact store.
+    The share of new cards, applied to the listings a full run would
+    examine, gives the estimated new contacts; the query's recorded seconds
+    per listing (or PROBE_SECONDS_PER_LISTING) gives the estimated time.
+    The probe is stored in search stats. Returns a result dict like
+    scrape_search with the probe under "probe".
+    """
+    args = session.args
+    contact_manager = session.contact_manager
+    search_query = job.search_query.strip()
+    query_key = contact_manager.canonical_query(search_query)
+    scope = job.progress_scope()
+    stats_key = f"{query_key} {scope}" if scope else query_key
+    print(f"-----\n{job_index} - Probing {job.label()}")
+    probe_started = time.time()
+    
+    session.heartbeat.beat("navigate", job.label())
+    try:
+        found_results = open_search_results(page, job, session)
+    except ScraperBlocked as e:
+        print(f"Probe of '{job.label()}' was blocked ({e}). It will be retried after the pause.")
+        return {"new_contacts": 0, "listings_examined": 0, "feed_size": 0,
+                "saturated": False, "stop_reason": "blocked", "results_ready_seconds": None}
+    
+    seen_names = contact_manager.get_seen_names(search_query)
+    cards = page.locator(PLACE_LINK_XPATH).all() if found_results == "feed" else []
+    new_cards = seen = cached = 0
+    session.heartbeat.beat("collect", job.label())
+    for card in cards:
+        try:
+            business_name = card.get_attribute('aria-label')
+        except Exception:
+            continue
+        if not business_name:
+            continue
+        simple_id = business_name.lower().strip().replace(" ", "_")
+        if simple_id in seen_names:
+            seen += 1
+            continue
+        with session.lock:
+            is_likely_duplicate = contact_manager.is_likely_fetched(simple_id)
+        if is_likely_duplicate:
+            cached += 1
+        else:
+            new_cards += 1
+    
+    probed = new_cards + seen + cached
+    new_ratio = new_cards / probed if probed else 0.0
+    # A full run examines up to 3x the limit, within what is left of the feed
+    last_position = contact_manager.get_last_position(search_query, scope)
+    examinable = min(args.limit * 3, max(probed, args.tile_cap - last_position))
+    estimated_new = min(args.limit, new_ratio * examinable)
+    if estimated_new >= 1:
+        listings_needed = estimated_new / new_ratio
+    else:
+        listings_needed = min(examinable, args.saturation_window)  # until saturation stops it
+    seconds_per_listing = session.search_stats.seconds_per_listing(stats_key) or PROBE_SECONDS_PER_LISTING
+    estimated_minutes = listings_needed * seconds_per_listing / 60
+    probe = {
+        "cards": probed,
+        "new": new_cards,
+        "seen": seen,
+        "cached": cached,
+        "new_ratio": round(new_ratio, 3),
+        "estimated_new": round(estimated_new, 1),
+        "estimated_minutes": round(estimated_minutes, 1),
+        "new_per_minute": round(estimated_new / max(estimated_minutes, 0.1), 2),
+        "probe_seconds": round(time.time() - probe_started, 1),
+    }
+    print(f"First page: {probed} listings, {new_cards} new, {seen} seen for this query, {cached} in the contact store")
+    print(f"Estimated: ~{estimated_new:.0f} new contacts in ~{estimated_minutes:.1f} min")
+    
+    with session.lock:
+        session.search_stats.record_probe(stats_key, probe)
+        session.probes.append((job.label(), probe))
+    return {"new_contacts": 0, "listings_examined": probed, "feed_size": len(cards),
+            "saturated": False, "stop_reason": "probe", "results_ready_seconds": None, "probe": probe}
+
+def refresh_places(page, places, session):
+    """Re-scrape known places by URL and update their rows in the centralized CSV
+    
+    No search is opened and the feed is never scrolled: every place is
+    loaded through a PlacePagePool. Changed fields are written in place
+    (see BusinessList.update_centralized_csv) after every --checkpoint-every
+    places and at the end; only then is the place's scrape time renewed,
+    so places that failed or were not saved stay due. Stops at a block
+    page or when the run's time budget is used up. Returns a summary dict.
+    """
+    args = session.args
+    contact_manager = session.contact_manager
+    pending = deque(FeedItem(place_url, position, business_id) for position, (place_url, business_id) in enumerate(places))
+    place_pool = PlacePagePool(page.context, session, args.detail_pages)
+    refreshed = BusinessList()
+    changes = {}
+    summary = {"refreshed": 0, "failed": 0, "rows_changed": 0, "stop_reason": None}
+    
+    def save_refreshed():
+        session.heartbeat.beat("save", "refresh")
+        with session.lock:
+            for column, count in refreshed.update_centralized_csv().items():
+                changes[column] = changes.get(column, 0) + count
+            for business in refreshed.business_list:
+                contact_manager.record_place(business)
+            summary["refreshed"] += len(refreshed.business_list)
+        refreshed.business_list = []
+    
+    try:
+        while pending or place_pool.busy():
+            time_left = session.time_left()
+            if time_left is not None and time_left <= 0:
+                print("⏰ Time budget used up. Remaining places stay due for the next refresh.")
+                summary["stop_reason"] = "time_budget"
+                break
+            while pending and place_pool.has_room():
+                place_pool.submit(pending.popleft())
+            session.heartbeat.beat("extract", "refresh")
+            try:
+                item, business, error = place_pool.next_result("")
+            except ScraperBlocked as e:
+                print(f"Refresh stopped ({e}). Remaining places stay due for the next refresh.")
+                summary["stop_reason"] = "blocked"
+                break
+            if error:
+                print(f"❌ Could not refresh {item.href}: {error}")
+                summary["failed"] += 1
+                continue
+            if business is None:
+                continue  # the pool is retrying this URL
+            session.governor.success()
+            refreshed.business_list.append(business)
+            print(f"Refreshed {item.position + 1}/{len(places)}: {business.name} "
+                  f"({business.reviews_count} reviews, {business.reviews_average})")
+            if args.checkpoint_every and len(refreshed.business_list) >= args.checkpoint_every:
+                save_refreshed()
+    finally:
+        place_pool.drain()
+        place_pool.close()
+    
+    save_refreshed()
+    summary["rows_changed"] = sum(changes.values())
+    print(f"\nRefresh completed: {summary['refreshed']}/{len(places)} places re-scraped, {summary['failed']} failed")
+    if changes:
+        print("Fields updated: " + ", ".join(f"{column} ({count})" for column, count in sorted(changes.items())))
+    else:
+        print("No changes found.")
+    return summary
+
+def run_refresh_worker(places, session):
+    """Refresh places in one browser (see refresh_places)"""
+    launch_started = time.time()
+    with sync_playwright() as p:
+        worker = BrowserWorker(p, session)
+        session.heartbeat.beat("launch")
+        page = worker.launch()
+        session.start_worker(time.time() - launch_started, worker)
+        try:
+            return refresh_places(page, places, session)
+        finally:
+            session.record_transfer(worker.total_bytes_received(), worker.recycles)
+            worker.close()
+            session.heartbeat.beat("done")
+
+REPLAY_BATCH_SIZE = 500
+
+def replay_archive(archive, contact_manager, overwrite=False):
+    """Run the current extractors over archived place panes and fix the centralized CSV
+    
+    Each place's latest capture is loaded into an offline page (all
+    requests are aborted) and extracted as in a live run. Rows already in
+    the CSV get their blank fields filled (with overwrite, every field
+    that differs); places that were left out, e.g. because no phone number
+    was read at the time, are added as new contacts if they now have one.
+    Returns a summary dict.
+    """
+    known_urls = BusinessList().known_place_urls()
+    replayed = BusinessList()
+    new_contacts = BusinessList()
+    changes = {}
+    summary = {"replayed": 0, "failed": 0, "rows_changed": 0, "new_contacts": 0}
+    
+    def flush():
+        for column, count in replayed.update_centralized_csv(only_blank=not overwrite).items():
+            changes[column] = changes.get(column, 0) + count
+        replayed.business_list = []
+        if new_contacts.business_list:
+            new_contacts.append_to_centralized_csv()
+            summary["new_contacts"] += len(new_contacts.business_list)
+            new_contacts.business_list = []
+    
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        context = browser.new_context()
+        context.route("**/*", lambda route: route.abort())  # offline: only the archived HTML
+        page = context.new_page()
+        try:
+            for record in archive.latest_records():
+                try:
+                    page.set_content(record["html"], wait_until="domcontentloaded")
+                    business = extract_business(page, record["search_query"], record["card_label"],
+                                                place_url=record["place_url"])
+                except Exception as e:
+                    print(f"❌ Could not replay {record['place_url']}: {e}")
+                    summary["failed"] += 1
+                    continue
+                summary["replayed"] += 1
+                if record["place_url"] in known_urls:
+                    replayed.business_list.append(business)
+                elif business.phone_number and contact_manager.mark_as_fetched(business.get_unique_id()):
+                    print(f"New from archive: {business.name} - {business.phone_number}")
+                    contact_manager.record_place(business)
+                    new_contacts.business_list.append(business)
+                    known_urls.add(record["place_url"])
+                if len(replayed.business_list) + len(new_contacts.business_list) >= REPLAY_BATCH_SIZE:
+                    flush()
+            flush()
+        finally:
+            browser.close()
+    
+    contact_manager.save_cache()
+    summary["rows_changed"] = sum(changes.values())
+    print(f"\nReplay completed: {summary['replayed']} archived place(s) re-extracted, {summary['failed']} failed")
+    if changes:
+        print("Fields updated: " + ", ".join(f"{column} ({count})" for column, count in sorted(changes.items())))
+    print(f"New contacts from the archive: {summary['new_contacts']}")
+    return summary
+
+class RecyclePolicy:
+    """When a worker should restart its page, context or browser
+    
+    Long runs grow the feed DOM and keep every opened place pane alive, so
+    the browser is recycled after max_listings processed listings,
+    max_minutes of use, or once the worker's share of the process-tree RSS
+    passes max_rss_mb (0 disables a limit). The RSS limit only fires after
+    the worker processed listings and grew above the RSS it had right after
+    its launch; if a fresh browser is already over the limit, the limit is
+    turned off with a warning instead of restarting in a loop. level is the
+    scope of the restart: "page", "context" or "browser".
+    """
+    
+    LEVELS = ("page", "context", "browser")
+    
+    def __init__(self, max_listings=0, max_minutes=0, max_rss_mb=0, level="context", workers=1,
+                 rss_check_interval=10):
+        self.max_listings = max_listings
+        self.max_minutes = max_minutes
+        self.max_rss_mb = max_rss_mb
+        self.level = level
+        self.workers = max(1, workers)
+        self.rss_check_interval = rss_check_interval
+    
+    @property
+    def enabled(self):
+        return bool(self.max_listings or self.max_minutes or self.max_rss_mb)
+    
+    def check_baseline(self, rss):
+        """Turn the RSS limit off if a freshly launched browser is already over it"""
+        if not self.max_rss_mb or not rss or rss / self.workers < self.max_rss_mb * 1024 * 1024:
+            return
+        print(f"⚠️ A fresh browser already uses {rss / self.workers / (1024 * 1024):.0f} MB per worker, "
+              f"above --recycle-rss-mb {self.max_rss_mb}. Turning the RSS limit off.")
+        self.max_rss_mb = 0
+    
+    def reason(self, browser_worker):
+        """Why the worker should be recycled now, or None"""
+        if self.max_listings and browser_worker.listings_processed >= self.max_listings:
+            return f"{browser_worker.listings_processed} listings processed"
+        if self.max_minutes and time.time() - browser_worker.started_at >= self.max_minutes * 60:
+            return f"{self.max_minutes} minutes elapsed"
+        if self.max_rss_mb and time.time() - browser_worker.rss_checked_at >= self.rss_check_interval:
+            browser_worker.rss_checked_at = time.time()
+            if browser_worker.listings_processed == 0:
+                return None  # nothing to win back from a restart yet
+            rss = process_tree_rss()
+            if (rss and rss > (browser_worker.rss_baseline or 0)
+                    and rss / self.workers >= self.max_rss_mb * 1024 * 1024):
+                return f"RSS {rss / self.workers / (1024 * 1024):.0f} MB per worker"
+        return None
+
+class BrowserWorker:
+    """One worker's browser, context and page, with recycling"""
+    
+    def __init__(self, playwright, session, profile_dir=None):
+        self.playwright = playwright
+        self.session = session
+        self.args = session.args
+        self.profile = LAUNCH_PROFILES[self.args.profile]
+        self.profile_dir = profile_dir
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.transfer = None
+        self.bytes_received = 0
+        self.recycles = 0
+    
+    def _reset_counters(self):
+        self.listings_processed = 0
+        self.started_at = time.time()
+        self.rss_checked_at = time.time()
+        self.rss_baseline = None
+        policy = self.session.recycle_policy
+        if policy.max_rss_mb:
+            self.rss_baseline = process_tree_rss()
+            policy.check_baseline(self.rss_baseline)
+    
+    def _new_context(self):
+        options = {}
+        if self.profile["viewport"]:
+            options["viewport"] = self.profile["viewport"]
+        return self.browser.new_context(**options)
+    
+    def _new_page(self):
+        if self.transfer:
+            self.bytes_received += self.transfer.bytes_received
+        if self.context.pages:
+            self.page = self.context.pages[0]
+        else:
+            self.page = self.context.new_page()
+        self.transfer = TransferMeter(self.page)
+        if self.args.navigation == "searchbox":
+            self.page.goto("https://www.google.com/maps", timeout=60000)
+            # wait is added for dev phase. can remove it in production
+            self.page.wait_for_timeout(5000)
+    
+    def launch(self):
+        """Start the browser (persistent profile when a directory was given)"""
+        if self.profile_dir:
+            # Warm start: cache, cookies and consent state survive between runs
+            options = {"headless": self.profile["headless"], "args": self.profile["args"]}
+            if self.profile["viewport"]:
+                options["viewport"] = self.profile["viewport"]
+            self.browser = None
+            self.context = self.playwright.chromium.launch_persistent_context(self.profile_dir, **options)
+        else:
+            self.browser = launch_browser(self.playwright, self.args.profile)
+            self.context = self._new_context()
+        self._new_page()
+        self._reset_counters()
+        return self.page
+    
+    def recycle(self, level):
+        """Restart the page, context or browser and return the new page"""
+        self.recycles += 1
+        if level == "page":
+            old_page = self.page
+            self.page = None
+            self.context.new_page()  # keep the context alive while the old page closes
+            old_page.close()
+            self._new_page()
+            self._reset_counters()
+        elif level == "context" and self.browser is not None:
+            self.context.close()
+            self.context = self._new_context()
+            self._new_page()
+            self._reset_counters()
+        else:
+            # Persistent contexts are the browser, so "context" restarts it too
+            self.close()
+            self.launch()
+        return self.page
+    
+    def total_bytes_received(self):
+        """Bytes received by all pages this worker has used (None if unmeasured)"""
+        if self.transfer is None or not self.transfer.supported:
+            return None
+        return self.bytes_received + self.transfer.bytes_received
+    
+    def close(self):
+        if self.transfer:
+            self.bytes_received += self.transfer.bytes_received
+            self.transfer = None
+        if self.browser is not None:
+            self.browser.close()
+        else:
+            self.context.close()
+
+def run_scrape_worker(job_queue, session):
+    """Run jobs from the queue in one browser until the queue is drained
+    
+    When the recycle policy fires mid-search, scrape_search checkpoints the
+    query's position and the job is queued again at the front, so it
+    resumes on the fresh page where it stopped. A job that raises is
+    logged and handed back to the queue as failed (to be retried or given
+    up on), the browser is restarted and the worker moves on.
+    """
+    profile_dir = session.profile_manager.acquire() if session.profile_manager else None
+    launch_started = time.time()
+    
+    try:
+        with sync_playwright() as p:
+            worker = BrowserWorker(p, session, profile_dir)
+            session.heartbeat.beat("launch")
+            page = worker.launch()
+            session.start_worker(time.time() - launch_started, worker)
+            
+            while True:
+                time_left = session.time_left()
+                if time_left is not None and time_left <= 0:
+                    print("\n⏰ Time budget used up. Remaining searches resume from their checkpoints next run.")
+                    job_queue.close()
+                    break
+                session.heartbeat.beat("idle")  # waiting for a job has no timeout
+                item = job_queue.get()
+                if item is None:
+                    break
+                job_index, job = item
+                follow_ups = []
+                resume_first = False
+                failed = True
+                try:
+                    if session.args.probe:
+                        result = probe_search(worker.page, job, session, job_index)
+                    else:
+                        deadline = session.job_deadline(
+                            job_queue.remaining(), job_queue.workers(max(1, session.args.workers))
+                        )
+                        result = scrape_search(worker.page, job, session, job_index, deadline)
+                    failed = False
+                    if result and result.get("stop_reason") in ("recycle", "blocked"):
+                        follow_ups, resume_first = [job], True
+                    elif session.args.probe:
+                        follow_ups = []
+                    else:
+                        follow_ups = session.follow_up_jobs(job, result)
+                except Exception as e:
+                    # One broken job must not take the worker (and its queue share) down
+                    print(f"❌ Job '{job.label()}' failed: {e!r}")
+                    traceback.print_exc()
+                    result, failed = None, True
+                    with session.lock:
+                        session.job_failures += 1
+                finally:
+                    job_queue.task_done(follow_ups, front=resume_first, failed=failed)
+                
+                # Check if we've reached our limit
+                if session.limit_reached():
+                    print(f"\nReached overall limit of {session.limit} contacts. Stopping all searches.")
+                    job_queue.close()
+                    break
+                
+                if session.governor.consecutive_blocks >= session.args.max_blocks:
+                    print(f"\nBlocked {session.governor.consecutive_blocks} times in a row. Stopping all searches; try again later.")
+                    job_queue.close()
+                    break
+                
+                if failed:
+                    reason = "job failed"
+                elif result and result.get("stop_reason") == "blocked":
+                    reason = "blocked"
+                elif resume_first:
+                    reason = "checkpointed mid-search"
+                else:
+                    reason = session.recycle_due()
+                if reason:
+                    level = "browser" if failed else session.recycle_policy.level  # the page may be unusable
+                    print(f"♻️ Recycling {level} ({reason})")
+                    session.heartbeat.beat("launch")
+                    worker.recycle(level)
+            
+            session.record_transfer(worker.total_bytes_received(), worker.recycles)
+            worker.close()
+            session.heartbeat.beat("done")
+    finally:
+        if profile_dir:
+            session.profile_manager.release(profile_dir)
+
+def main():
+    
+    ########
+    # input 
+    ########
+    
+    # read search from arguments
+    parser = argparse.ArgumentParser()
     parser.add_argument("-s", "--search", type=str, help="Search query for Google Maps")
     parser.add_argument("-l", "--limit", type=int, default=100, help="Number of contacts to fetch (default: 100)")
     parser.add_argument("--skip-duplicates", action="store_true", help="Skip already fetched contacts")
@@ -310,10 +3594,59 @@ def main():
     parser.add_argument("--clear-progress", action="store_true", help="Clear search progress (start from beginning)")
     parser.add_argument("--min-delay", type=float, default=2.0, help="Minimum delay between requests (default: 2.0)")
     parser.add_argument("--max-delay", type=float, default=5.0, help="Maximum delay between requests (default: 5.0)")
+    parser.add_argument("--saturation-confidence", type=float, default=0.95, help="Confidence needed to stop scrolling a drained query (0 disables, default: 0.95)")
+    parser.add_argument("--saturation-window", type=int, default=60, help="Number of recent listings the saturation rule looks at (default: 60)")
+    parser.add_argument("--saturation-min-rate", type=float, default=0.05, help="New-listing rate below which a query counts as drained (default: 0.05)")
+    parser.add_argument("--region", type=str, help="Split each search into map tiles over a region (name or 'south,west,north,east')")
+    parser.add_argument("--tile-density", type=int, default=4, help="Tiles per side when splitting a region (default: 4)")
+    parser.add_argument("--tile-cap", type=int, default=120, help="Feed size at which a tile counts as capped and is subdivided (default: 120)")
+    parser.add_argument("--max-tile-depth", type=int, default=2, help="How many times a capped tile may be subdivided (default: 2)")
+    parser.add_argument("--workers", type=int, default=1, help="Number of parallel browser workers (default: 1)")
+    parser.add_argument("--profile", choices=sorted(LAUNCH_PROFILES), default="headed", help="Browser launch profile: headed (debug), headless or minimal (default: headed)")
+    parser.add_argument("--persistent-profile", action="store_true", help="Reuse a warm browser profile (cache, cookies) per worker between runs")
+    parser.add_argument("--profile-dir", type=str, default="browser_profiles", help="Directory for persistent browser profiles (default: browser_profiles)")
+    parser.add_argument("--profile-max-age-days", type=int, default=7, help="Delete persistent profiles unused for this many days (default: 7)")
+    parser.add_argument("--profile-max-cache-mb", type=int, default=500, help="Empty a profile's cache once it grows past this size (default: 500)")
+    parser.add_argument("--recycle-after-listings", type=int, default=0, help="Restart the browser page/context after this many listings (0 = never)")
+    parser.add_argument("--recycle-after-minutes", type=float, default=0, help="Restart the browser page/context after this many minutes (0 = never)")
+    parser.add_argument("--recycle-rss-mb", type=int, default=0, help="Restart once memory per worker exceeds this many MB (0 = never)")
+    parser.add_argument("--recycle-level", choices=RecyclePolicy.LEVELS, default="context", help="What to restart when recycling: page, context or browser (default: context)")
+    parser.add_argument("--navigation", choices=["url", "searchbox"], default="url", help="Open each search by URL or by typing into the search box (default: url)")
+    parser.add_argument("--detail-mode", choices=["click", "url"], default="click", help="Read details by clicking feed cards or by opening place URLs in extra tabs (default: click)")
+    parser.add_argument("--detail-pages", type=int, default=3, help="Tabs loading place URLs at once in url detail mode (default: 3)")
+    parser.add_argument("--archive-pages", action="store_true", help="Archive the raw HTML of every place page extracted, for --replay")
+    parser.add_argument("--archive-dir", type=str, default="place_archive", help="Directory of the place page archive (default: place_archive)")
+    parser.add_argument("--replay", action="store_true", help="Instead of scraping, run the current extractors over the place page archive and fill blank fields in all_contacts.csv")
+    parser.add_argument("--replay-overwrite", action="store_true", help="With --replay, overwrite every field that differs, not just blank ones")
+    parser.add_argument("--refresh-days", type=float, help="Instead of searching, re-scrape up to --limit known places last scraped more than this many days ago and update all_contacts.csv in place")
+    parser.add_argument("--result-cache-hours", type=float, default=0, help="Reuse a search's cached result list for this many hours and only extract places not in it; places inserted mid-list may be missed until it expires (default: 0 = off)")
+    parser.add_argument("--probe", action="store_true", help="Only read the first page of each search and estimate its new-contact yield and time")
+    parser.add_argument("--time-budget", type=float, help="Minutes this run may take; time is split over the searches and each stops and checkpoints when its share is used")
+    parser.add_argument("--deadline", type=deadline_arg, help="Finish by this time (HH:MM or YYYY-MM-DDTHH:MM); combined with --time-budget, the earlier wins")
+    parser.add_argument("--retry-attempts", type=int, default=2, help="Retries by place URL for listings that fail extraction (0 = drop them, default: 2)")
+    parser.add_argument("--retry-backoff", type=float, default=10, help="Seconds before the first retry, doubled per attempt (default: 10)")
+    parser.add_argument("--pipeline-depth", type=int, default=5, help="Places the feed reader may queue ahead of detail extraction (default: 5)")
+    parser.add_argument("--fixed-delays", action="store_true", help="Keep delays within --min-delay/--max-delay instead of adapting them to throttling")
+    parser.add_argument("--governor-floor", type=float, default=1.0, help="Lowest delay multiplier the rate governor may reach on clean responses; delays never go below --min-delay (default: 1.0)")
+    parser.add_argument("--governor-ceiling", type=float, default=8.0, help="Highest delay multiplier the rate governor may reach when throttled (default: 8.0)")
+    parser.add_argument("--block-pause", type=float, default=60, help="Seconds to pause after a block or CAPTCHA page, doubled per consecutive block (default: 60)")
+    parser.add_argument("--max-blocks", type=int, default=5, help="Stop the run after this many consecutive blocks (default: 5)")
+    parser.add_argument("--global-rate", type=float, default=40, help="Requests per minute shared by all scraper processes on this machine (0 = no shared limit, default: 40)")
+    parser.add_argument("--global-burst", type=int, default=5, help="Requests the shared limit lets through back to back (default: 5)")
+    parser.add_argument("--rate-limit-db", type=str, default="rate_limit.db", help="File holding the shared rate limit (default: rate_limit.db)")
+    parser.add_argument("--job-queue", type=str, help="SQLite file of a job queue shared with other scraper processes/hosts")
+    parser.add_argument("--queue-name", type=str, default="default", help="Name of the shared job queue (default: default)")
+    parser.add_argument("--enqueue-only", action="store_true", help="Add the searches to the job queue and exit without scraping")
+    parser.add_argument("--requeue-after-minutes", type=float, help="Queue finished jobs again if they finished this many minutes ago")
+    parser.add_argument("--lease-seconds", type=int, default=600, help="How long a claimed job stays leased without heartbeats (default: 600)")
+    parser.add_argument("--max-job-attempts", type=int, default=3, help="Attempts before a failing job is given up on (default: 3)")
+    parser.add_argument("--heartbeat-file", type=str, help="Write the current phase of each worker to this file for a supervisor")
+    parser.add_argument("--checkpoint-every", type=int, default=0, help="Save contacts, cache and progress after every N new contacts (0 = only after each search)")
     args = parser.parse_args()
     
     # Initialize contact manager
     contact_manager = ContactManager()
+    search_stats = SearchStats()
     
     # Ensure cache files exist
     if not os.path.exists(contact_manager.cache_file):
@@ -326,19 +3659,37 @@ def main():
     
     # Clear cache if requested
     if args.clear_cache:
-        if os.path.exists(contact_manager.cache_file):
-            os.remove(contact_manager.cache_file)
-            contact_manager.fetched_contacts = set()
-        contact_manager.save_cache()
+        contact_manager.clear_cache()
         print("Cache cleared!")
     
     # Clear search progress if requested
     if args.clear_progress:
-        if os.path.exists(contact_manager.search_progress_file):
-            os.remove(contact_manager.search_progress_file)
-            contact_manager.search_progress = {}
+        contact_manager.clear_search_progress()
         print("Search progress cleared! Will start from beginning for all searches.")
     
+    if args.replay:
+        archive = PlaceArchive(args.archive_dir)
+        print(f"Replaying archived place pages from {archive.directory}")
+        replay_archive(archive, contact_manager, args.replay_overwrite)
+        return
+    
+    if args.refresh_days is not None:
+        session = ScrapeSession(args, contact_manager, search_stats)
+        places = contact_manager.stale_places(args.refresh_days, args.limit)
+        print(f"Refreshing {len(places)} place(s) last scraped more than {args.refresh_days:g} days ago")
+        if places:
+            run_refresh_worker(places, session)
+        session.selector_stats.save()
+        if session.governor.blocks:
+            print(f"Blocks detected: {session.governor.blocks}")
+        if session.archive:
+            print(f"Place pages archived: {session.archive.captured}")
+        return
+    
+    if args.probe and args.job_queue:
+        print("--probe runs the searches given here; ignoring --job-queue")
+        args.job_queue = None
+    
     # Set limit
     limit = args.limit
     print(f"Fetching limit set to: {limit} contacts")
@@ -360,353 +3711,127 @@ def main():
             # Read all lines into a list
                 search_list = file.readlines()
                 
-        if len(search_list) == 0:
+        if len(search_list) == 0 and not args.job_queue:
             print('Error occured: You must either pass the -s search argument, or add searches to input.txt')
             sys.exit()
         
     ###########
     # scraping
     ###########
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=False)
-        page = browser.new_page()
-
-        page.goto("https://www.google.com/maps", timeout=60000)
-        # wait is added for dev phase. can remove it in production
-        page.wait_for_timeout(5000)
-        
-        total_new_contacts = 0  # Track new contacts across all searches
-        
-        for search_for_index, search_for in enumerate(search_list):
-            search_query = search_for.strip()
-            print(f"-----\n{search_for_index} - {search_query}")
-            
-            # Check if we have previous progress for this search
-            last_position = contact_manager.get_last_position(search_query)
-            if last_position > 0:
-                print(f"Resuming from position {last_position} (skipping first {last_position} results)")
-            
-            page.locator('//input[@id="searchboxinput"]').fill(search_query)
-            add_random_delay(args.min_delay, args.max_delay)
-
-            page.keyboard.press("Enter")
-            add_random_delay(args.min_delay, args.max_delay)
-
-            # scrolling
-            page.hover('//a[contains(@href, "https://www.google.com/maps/place")]')
-
-            # this variable is used to detect if the bot
-            # scraped the same number of listings in the previous iteration
-            previously_counted = 0
-            remaining_limit = limit - total_new_contacts
-            
-            if remaining_limit <= 0:
-                print(f"Reached overall limit of {limit} contacts. Stopping.")
-                break
-                
-            print(f"Remaining contacts to fetch: {remaining_limit}")
-            
-            # Smart collection: only collect what we need, checking for duplicates in real-time
-            collected_listings = []
-            checked_names = set()  # Quick check for obvious duplicates during collection
-            total_seen = 0  # Track total listings encountered
-            duplicates_skipped_during_collection = 0
-            max_attempts = remaining_limit * 3  # Maximum listings to examine (3x the target)
-            consecutive_duplicates = 0  # Track consecutive duplicates found
-            
-            # Skip to last known position if resuming
-            current_position = last_position
-            
-            while len(collected_listings) < remaining_limit and total_seen < max_attempts:
-                page.mouse.wheel(0, 10000)
-                add_random_delay(1, 3)  # Shorter delay for scrolling
-
-                current_listings = page.locator(
-                    '//a[contains(@href, "https://www.google.com/maps/place")]'
-                ).all()
-                
-                # Check new listings for potential duplicates
-                for listing in current_listings[current_position:]:
-                    current_position += 1
-                    total_seen += 1
-                    
-                    # Safety check: stop if we've examined too many listings
-                    if total_seen >= max_attempts:
-                        print(f"\nReached maximum attempts ({max_attempts}). Stopping collection.")
-                        break
-                    
-                    if len(collected_listings) >= remaining_limit:
-                        break
-                        
-                    # Quick duplicate check using business name from aria-label
-                    try:
-                        business_name = listing.get_attribute('aria-label')
-                        if business_name:
-                            # Create a simple ID for quick duplicate detection
-                            simple_id = business_name.lower().strip().replace(" ", "_")
-                            
-                            # Check against both current session and cached data
-                            if simple_id not in checked_names:
-                                # If skip-duplicates is enabled, also check cache
-                                if args.skip_duplicates:
-                                    # Quick check if this might be a duplicate from cache
-                                    is_likely_duplicate = any(simple_id in cached_id for cached_id in contact_manager.fetched_contacts)
-                                    if is_likely_duplicate:
-                                        print(f"Skipping cached duplicate: {business_name[:50]}...")
-                                        duplicates_skipped_during_collection += 1
-                                        consecutive_duplicates += 1
-                                        
-                                        # If we've found too many consecutive duplicates, consider stopping
-                                        if consecutive_duplicates >= 20:
-                                            print(f"\nFound {consecutive_duplicates} consecutive duplicates. Area might be fully scraped.")
-                                            print("Consider trying a different search term or location.")
-                                        continue
-                                
-                                checked_names.add(simple_id)
-                                collected_listings.append(listing.locator("xpath=.."))
-                                consecutive_duplicates = 0  # Reset counter when we find a new listing
-                                efficiency = (len(collected_listings) / total_seen) * 100 if total_seen > 0 else 0
-                                print(f"Collected: {len(collected_listings)}/{remaining_limit} (Efficiency: {efficiency:.1f}%) - {business_name[:50]}...")
-                            else:
-                                duplicates_skipped_during_collection += 1
-                                consecutive_duplicates += 1
-                    except:
-                        # If we can't get the name, still collect it but with caution
-                        if len(collected_listings) < remaining_limit:
-                            collected_listings.append(listing.locator("xpath=.."))
-                
-                # Check if we've reached all available listings
-                if len(current_listings) == previously_counted:
-                    print(f"Arrived at all available listings. Collected: {len(collected_listings)}")
-                    break
-                else:
-                    previously_counted = len(current_listings)
-            
-            listings = collected_listings
-            collection_efficiency = (len(listings) / total_seen) * 100 if total_seen > 0 else 0
-            print(f"\n=== COLLECTION SUMMARY ===")
-            print(f"Total listings seen: {total_seen}")
-            print(f"Duplicates skipped during collection: {duplicates_skipped_during_collection}")
-            print(f"Unique listings collected: {len(listings)}")
-            print(f"Collection efficiency: {collection_efficiency:.1f}%")
-            
-            # Handle the "all duplicates" scenario
-            if len(listings) == 0:
-                print(f"⚠️  WARNING: No new contacts found!")
-                print(f"   - All {total_seen} listings examined were duplicates")
-                print(f"   - This area might be fully scraped already")
-                print(f"   - Try a different search term or location")
-                print(f"   - Or use --clear-cache to start fresh")
-                continue  # Skip to next search term
-            elif len(listings) < remaining_limit * 0.1:  # Less than 10% of target
-                print(f"⚠️  LOW YIELD: Only found {len(listings)} new contacts out of {remaining_limit} requested")
-                print(f"   - Consider expanding search area or trying different keywords")
-            
-            print(f"Now processing {len(listings)} listings for detailed data...")
-
-            business_list = BusinessList()
-            new_contacts_this_search = 0
-            skipped_duplicates = 0
-            skipped_no_phone = 0
-
-            # scraping
-            for listing_index, listing in enumerate(listings):
-                try:
-                    listing.click()
-                    add_random_delay(args.min_delay, args.max_delay)
-
-                    # Multiple selectors for better data extraction
-                    name_selectors = [
-                        '//h1[contains(@class, "DUwDvf")]',
-                        '//h1[@data-attrid="title"]',
-                        '//div[contains(@class, "lMbq3e")]//div[contains(@class, "fontHeadlineSmall")]',
-                        '//div[contains(@class, "x3AX1-LfntMc-header-title")]//span',
-                        '//h1[contains(@class, "fontHeadlineLarge")]',
-                        '//div[@role="main"]//h1',
-                        '//div[contains(@class, "SPZz6b")]//h1'
-                    ]
-                    
-                    address_xpath = '//button[@data-item-id="address"]//div[contains(@class, "fontBodyMedium")]'
-                    website_xpath = '//a[@data-item-id="authority"]//div[contains(@class, "fontBodyMedium")]'
-                    phone_number_xpath = '//button[contains(@data-item-id, "phone:tel:")]//div[contains(@class, "fontBodyMedium")]'
-                    review_count_xpath = '//button[@jsaction="pane.reviewChart.moreReviews"]//span'
-                    reviews_average_xpath = '//div[@jsaction="pane.reviewChart.moreReviews"]//div[@role="img"]'
-                    
-                    # Alternative selectors if primary ones fail
-                    alt_review_count_xpath = '//div[contains(@class, "F7nice")]//span[contains(@aria-label, "reviews")]'
-                    
-                    
-                    business = Business()
-                    
-                    # Set the search query for tracking
-                    business.search_query = search_query
-                   
-                    # Extract business name with multiple fallback options and validation
-                    business.name = None
-                    
-                    # Try each name selector until we find a valid name
-                    for selector in name_selectors:
-                        try:
-                            if page.locator(selector).count() > 0:
-                                extracted_name = page.locator(selector).first.inner_text().strip()
-                                
-                                # Validate the extracted name
-                                validation_result = is_valid_business_name(extracted_name)
-                                if validation_result:
-                                    # If validation returns a cleaned name, use it
-                                    if isinstance(validation_result, str):
-                                        business.name = fix_character_encoding(validation_result)
-                                    else:
-                                        business.name = fix_character_encoding(extracted_name)
-                                    break
-                        except:
-                            continue
-                    
-                    # If no valid name found from page selectors, try aria-label
-                    if not business.name:
-                        try:
-                            aria_label = listing.get_attribute('aria-label')
-                            if aria_label:
-                                validation_result = is_valid_business_name(aria_label)
-                                if validation_result:
-                                    # If validation returns a cleaned name, use it
-                                    if isinstance(validation_result, str):
-                                        business.name = fix_character_encoding(validation_result)
-                                    else:
-                                        business.name = fix_character_encoding(aria_label)
-                        except:
-                            pass
-                    
-                    # Final fallback
-                    if not business.name:
-                        business.name = "Name not found"
-                        print(f"⚠️ Could not extract valid name for listing {listing_index + 1}")
-                    
-                    # Extract address
-                    try:
-                        if page.locator(address_xpath).count() > 0:
-                            business.address = page.locator(address_xpath).first.inner_text().strip()
-                        else:
-                            business.address = ""
-                    except:
-                        business.address = ""
-                    
-                    # Extract website
-                    try:
-                        if page.locator(website_xpath).count() > 0:
-                            business.website = page.locator(website_xpath).first.inner_text().strip()
-                        else:
-                            business.website = ""
-                    except:
-                        business.website = ""
-                    
-                    # Extract and format phone number
-                    try:
-                        if page.locator(phone_number_xpath).count() > 0:
-                            raw_phone = page.locator(phone_number_xpath).first.inner_text().strip()
-                            business.phone_number = business.format_indian_phone(raw_phone)
-                        else:
-                            business.phone_number = ""
-                    except:
-                        business.phone_number = ""
-                    
-                    # Extract review count
-                    try:
-                        if page.locator(review_count_xpath).count() > 0:
-                            review_text = page.locator(review_count_xpath).first.inner_text().strip()
-                            # Extract number from text like "1,234 reviews"
-                            review_number = ''.join(filter(str.isdigit, review_text.split()[0]))
-                            business.reviews_count = int(review_number) if review_number else 0
-                        elif page.locator(alt_review_count_xpath).count() > 0:
-                            review_text = page.locator(alt_review_count_xpath).first.inner_text().strip()
-                            review_number = ''.join(filter(str.isdigit, review_text))
-                            business.reviews_count = int(review_number) if review_number else 0
-                        else:
-                            business.reviews_count = 0
-                    except:
-                        business.reviews_count = 0
-                        
-                    # Extract review average
-                    try:
-                        if page.locator(reviews_average_xpath).count() > 0:
-                            aria_label = page.locator(reviews_average_xpath).first.get_attribute('aria-label')
-                            if aria_label:
-                                # Extract rating from aria-label like "4.5 stars"
-                                rating_text = aria_label.split()[0]
-                                business.reviews_average = float(rating_text.replace(',', '.'))
-                            else:
-                                business.reviews_average = 0.0
-                        else:
-                            business.reviews_average = 0.0
-                    except:
-                        business.reviews_average = 0.0
-
-                    # Skip businesses without phone numbers
-                    if not business.phone_number or business.phone_number.strip() == "":
-                        print(f"Skipping {business.name} - No phone number available")
-                        skipped_no_phone += 1
-                        continue
-                    
-                    # Check for duplicates
-                    business_id = business.get_unique_id()
-                    
-                    if args.skip_duplicates and contact_manager.is_already_fetched(business_id):
-                        print(f"Skipping duplicate: {business.name}")
-                        skipped_duplicates += 1
-                        continue
-                    
-                    # Mark as fetched and add to list
-                    contact_manager.mark_as_fetched(business_id)
-                    business_list.business_list.append(business)
-                    new_contacts_this_search += 1
-                    total_new_contacts += 1
-                    
-                    print(f"Processed {listing_index + 1}/{len(listings)}: {business.name} - {business.phone_number}")
-                    
-                    # Check if we've reached our limit
-                    if total_new_contacts >= limit:
-                        print(f"Reached limit of {limit} contacts. Stopping.")
-                        break
-                        
-                except Exception as e:
-                    print(f'Error occurred while processing listing {listing_index + 1}: {e}')
-                    add_random_delay(1, 2)  # Brief delay on error
-                    # Continue to next listing instead of stopping
-            
-            #########
-            # output
-            #########
-            print(f"\nSearch '{search_query}' completed:")
-            print(f"  - Listings examined: {total_seen}")
-            print(f"  - Duplicates skipped during collection: {duplicates_skipped_during_collection}")
-            print(f"  - Duplicates skipped during processing: {skipped_duplicates}")
-            print(f"  - Skipped (no phone number): {skipped_no_phone}")
-            print(f"  - New contacts found: {new_contacts_this_search}")
-            print(f"  - Collection efficiency: {collection_efficiency:.1f}%")
-            print(f"  - Total new contacts so far: {total_new_contacts}")
-            
-            # Save to centralized CSV file
-            if len(business_list.business_list) > 0:
-                business_list.append_to_centralized_csv()
-            else:
-                print("No new contacts to save for this search.")
-            
-            # Save cache and progress after each search
-            contact_manager.save_cache()
-            contact_manager.update_search_position(search_query, current_position)
-            contact_manager.save_search_progress()
-            
-            # Check if we've reached our limit
-            if total_new_contacts >= limit:
-                print(f"\nReached overall limit of {limit} contacts. Stopping all searches.")
-                break
+    jobs = []
+    viewport = LAUNCH_PROFILES[args.profile]["viewport"] or {"width": 1024, "height": 768}
+    tile_planner = None
+    if args.region:
+        tile_planner = TilePlanner(args.tile_density, viewport["width"], viewport["height"])
+    for search_for in search_list:
+        search_query = search_for.strip()
+        if not search_query:
+            continue
+        if tile_planner:
+            try:
+                tiles = tile_planner.plan(args.region)
+            except ValueError as e:
+                print(f"Error occured: {e}")
+                sys.exit()
+            jobs.extend(SearchJob(search_query, tile) for tile in tiles)
+        else:
+            jobs.append(SearchJob(search_query))
+    
+    if tile_planner:
+        print(f"Planned {len(jobs)} tile jobs over region '{args.region}' (zoom {jobs[0].tile.zoom if jobs else '-'})")
+    
+    session = ScrapeSession(args, contact_manager, search_stats)
+    job_store = None
+    if args.job_queue:
+        # Shared queue: other processes and hosts may claim these jobs too
+        job_store = SQLiteJobStore(args.job_queue, args.queue_name)
+        requeue_before = None
+        if args.requeue_after_minutes is not None:
+            requeue_before = time.time() - args.requeue_after_minutes * 60
+        added = job_store.add(jobs, requeue_before)
+        print(f"Queued {added} new job(s) in '{args.queue_name}': {job_store.counts()}")
+        if args.enqueue_only:
+            return
+        job_queue = LeasedJobQueue(job_store, args.lease_seconds, args.max_job_attempts, session.heartbeat)
+    else:
+        job_queue = SearchJobQueue(jobs, args.max_job_attempts)
+    memory_monitor = MemoryMonitor().start()
+    workers = max(1, args.workers)
+    
+    if workers == 1:
+        run_scrape_worker(job_queue, session)
+    else:
+        print(f"Starting {workers} parallel workers")
+        threads = [
+            threading.Thread(target=run_scrape_worker, args=(job_queue, session), name=f"worker-{i + 1}")
+            for i in range(workers)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
 
-        print(f"\n=== FINAL SUMMARY ===")
-        print(f"Total new contacts fetched: {total_new_contacts}")
-        print(f"Total contacts in cache: {contact_manager.get_stats()}")
-        print(f"Cache file: {contact_manager.cache_file}")
-        
-        browser.close()
+    if session.probes:
+        print(f"\n=== PROBE RESULTS (best yield per minute first) ===")
+        for label, probe in sorted(session.probes, key=lambda entry: entry[1]["new_per_minute"], reverse=True):
+            print(f"{probe['new_per_minute']:>6.2f}/min  ~{probe['estimated_new']:>5.0f} new  ~{probe['estimated_minutes']:>5.1f} min  "
+                  f"({probe['new']}/{probe['cards']} new on page 1)  {label}")
+        print(f"Probes saved to {search_stats.stats_file}")
+    
+    print(f"\n=== FINAL SUMMARY ===")
+    print(f"Total new contacts fetched: {session.total_new_contacts}")
+    print(f"Total contacts in cache: {contact_manager.get_stats()}")
+    print(f"Cache file: {contact_manager.cache_file}")
+    
+    if session.cold_starts:
+        mode = "persistent" if args.persistent_profile else "fresh"
+        cold_start = sum(seconds for seconds, _ in session.cold_starts) / len(session.cold_starts)
+        startup_mb = sum(b for _, b in session.cold_starts) / len(session.cold_starts) / (1024 * 1024)
+        total_mb = session.bytes_transferred / (1024 * 1024) if session.transfer_measured else None
+        print(f"Cold start ({mode} profile): {cold_start:.1f}s to first results, {startup_mb:.1f} MB transferred")
+        if total_mb is not None:
+            print(f"Total transferred: {total_mb:.1f} MB")
+        search_stats.record_launch(mode, cold_start, startup_mb, total_mb)
+    
+    if session.recycles:
+        print(f"Browser recycles: {session.recycles}")
+    
+    if session.job_failures:
+        print(f"Failed job attempts: {session.job_failures}")
+        if not job_store and job_queue.failed:
+            print(f"Searches given up on: {', '.join(job_queue.failed)}")
+    
+    if session.retries_attempted:
+        recovery_rate = session.retries_recovered / session.retries_attempted * 100
+        print(f"Listing retries recovered: {session.retries_recovered}/{session.retries_attempted} ({recovery_rate:.0f}%)")
+    
+    if session.selector_stats.alerted:
+        print(f"🚨 Selector alerts this run: {', '.join(sorted(session.selector_stats.alerted))} (see {session.selector_stats.stats_file})")
+    
+    if session.deadline is not None:
+        used = (time.time() - session.started_at) / 60
+        budget = (session.deadline + DEADLINE_MARGIN_SECONDS - session.started_at) / 60
+        print(f"Time used: {used:.1f} of {budget:.1f} minutes")
+        if not job_store and job_queue.remaining():
+            print(f"Searches left for the next run: {job_queue.remaining()}")
+    
+    if job_store:
+        print(f"Job queue '{args.queue_name}': {job_store.counts()}")
+    
+    if session.archive:
+        print(f"Place pages archived: {session.archive.captured} (in {session.archive.directory})")
+    
+    if session.governor.blocks:
+        print(f"Blocks detected: {session.governor.blocks}")
+    print(f"Final delay multiplier: x{session.governor.scale:.2f}")
+    if session.governor.limiter and session.governor.limiter.waited_seconds:
+        print(f"Waited {session.governor.limiter.waited_seconds:.0f}s for the shared rate limit ({args.global_rate:g}/min)")
+    
+    peak_rss = memory_monitor.stop()
+    if peak_rss:
+        peak_mb = peak_rss / (1024 * 1024)
+        print(f"Peak memory (profile '{args.profile}', {workers} worker(s)): {peak_mb:.0f} MB")
+        search_stats.record_profile_peak(args.profile, workers, peak_mb)
 
 
 if __name__ == "__main__":